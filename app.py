@@ -7,9 +7,7 @@
 # ==========================================
 
 import streamlit as st
-import math
-import sys
-import os
+import time
 
 # ==========================================
 # 0. SYSTEM PATCH & INITIALIZATION
@@ -29,28 +27,29 @@ def init_session_state():
     if 'conn_type' not in st.session_state:
         st.session_state.conn_type = "Fin Plate"
     if 'res_dict' not in st.session_state:
-        st.session_state.res_dict = {}
-    # เพิ่มตัวแปรสำหรับเก็บผลออกแบบ Connection เพื่อส่งไป Report
-    if 'v_design' not in st.session_state:
-        st.session_state.v_design = {}
+        st.session_state.res_dict = None
 
 init_session_state()
 
+def _apply_section(picked):
+    """Apply ของโหมด batch: หน้าตัดที่เลือกจากช่องค้นหา (นอก form) ถูกใช้พร้อม input อื่น"""
+    st.session_state.sb_section_applied = picked
+
 # ==========================================
 # 1. IMPORT MODULES WITH ERROR HANDLING
 # ==========================================
 try:
     import steel_db                
-    import connection_design       
-    import report_generator
-    import tab1_analysis
-    import tab3_ltb
-    import tab5_baseplate
-    import tab_summary  # <--- Added New Module
+    import section_search
+    import beam_context
+    import import_budget
+    import shared_cache
+    import session_budget
 except ImportError as e:
     st.error(f"❌ CRITICAL ERROR: Modules missing: {e}")
     st.info("Please ensure all helper scripts (steel_db.py, tab_summary.py, etc.) are in the same directory.")
     st.stop()
+# Tab modules (และ pandas / matplotlib / plotly ที่ใช้) ถูก import โดยแต่ละหน้าใน app_pages/
 
 # ==========================================
 # 2. UI SETUP & CSS STYLING
@@ -170,473 +169,282 @@ with st.sidebar:
     st.caption("AISC 360-22 Standard Hybrid Engine")
     st.divider()
 
-    # --- Mode Selection ---
-    analysis_mode = st.radio(
-        "🛠️ Operation Mode", 
-        ["Find Capacity", "Check Design"],
-        help="Capacity: Finds max load. Check: Verifies user-defined loads."
+    batch_mode = st.toggle(
+        "🧺 Batch edits (Apply button)", key="sidebar_batch",
+        help="Hold sidebar edits and recompute once when you press Apply. Off = live update on every change."
     )
-    is_check_mode = "Check" in analysis_mode
-
-    # --- Design Method ---
-    method_opts = ["ASD (Allowable Stress)", "LRFD (Limit State)"]
-    st.session_state.design_method = st.selectbox(
-        "Design Method", 
-        method_opts, 
-        index=1 if "LRFD" in st.session_state.design_method else 0
+    if batch_mode:
+        st.caption("⏳ Edits below are held until **Apply** is pressed.")
+    st.toggle(
+        "⚡ High-density plots (WebGL)", key="plot_high_density",  # = plot_utils.STATE_KEY (ไม่ import plotly ที่นี่)
+        help="Sample curves densely and draw them with WebGL; points are decimated (keeping peaks and zone boundaries) before sending."
     )
-    is_lrfd = "LRFD" in st.session_state.design_method
 
-    # --- Material Properties ---
-    st.markdown("### 🧬 Material Properties")
-    grade_opts = {
-        "SS400 (Fy 2450)": 2450, 
-        "SM520 (Fy 3550)": 3550, 
-        "A36 (Fy 2500)": 2500,
-        "Custom Grade": 0
-    }
-    grade_choice = st.selectbox("Steel Grade", list(grade_opts.keys()))
+    # โหมด batch: ช่องค้นหาหน้าตัดอยู่นอก form (คำค้นกรองรายการทันที) แต่หน้าตัดที่เลือกถูกใช้ตอนกด Apply
+    if batch_mode:
+        st.markdown("##### 🔎 Section Search")
+        picked_section = section_search.section_picker("Size (JIS/SYS)", default="H-400x200x8x13", key="sb_section")
+        st.session_state.setdefault("sb_section_applied", picked_section)
+
+    # โหมด batch: รวบ input ทั้งหมดใน st.form -> rerun ครั้งเดียวตอนกด Apply
+    sidebar_inputs = st.form("sidebar_inputs", border=False) if batch_mode else st.container()
+    with sidebar_inputs:
+        # --- Mode Selection ---
+        analysis_mode = st.radio(
+            "🛠️ Operation Mode", 
+            ["Find Capacity", "Check Design"],
+            key="sb_mode",
+            help="Capacity: Finds max load. Check: Verifies user-defined loads."
+        )
+        is_check_mode = "Check" in analysis_mode
+
+        # --- Design Method ---
+        method_opts = ["ASD (Allowable Stress)", "LRFD (Limit State)"]
+        st.selectbox("Design Method", method_opts, key="design_method")
+        is_lrfd = "LRFD" in st.session_state.design_method
+
+        # --- Material Properties ---
+        st.markdown("### 🧬 Material Properties")
+        grade_opts = {
+            "SS400 (Fy 2450)": 2450, 
+            "SM520 (Fy 3550)": 3550, 
+            "A36 (Fy 2500)": 2500,
+            "Custom Grade": 0
+        }
+        grade_choice = st.selectbox("Steel Grade", list(grade_opts.keys()), key="sb_grade")
     
-    if grade_choice == "Custom Grade":
-        Fy = st.number_input("Custom Fy (kg/cm²)", 1000, 10000, 2450)
-    else:
-        Fy = grade_opts[grade_choice]
+        if grade_choice == "Custom Grade":
+            Fy = st.number_input("Custom Fy (kg/cm²)", 1000, 10000, 2450, key="sb_fy")
+        else:
+            Fy = grade_opts[grade_choice]
         
-    E_mod = 2.04e6  # Young's Modulus in ksc
-    
-    # --- Section Selection ---
-    st.divider()
-    st.subheader("📦 Section Selection")
-    input_type = st.radio("Source", ["📚 Standard Database", "✏️ Custom Input"], horizontal=True)
-    
-    if "Standard" in input_type:
-        try:
-            sec_list = steel_db.get_section_list()
-            sec_name = st.selectbox("Size (JIS/SYS)", sec_list, index=13) 
-            props = steel_db.get_properties(sec_name)
-            h, b, tw, tf = float(props['h']), float(props['b']), float(props['tw']), float(props['tf'])
-        except Exception as e:
-            st.error(f"Error loading database: {e}")
-            h, b, tw, tf = 400, 200, 8, 13
-            sec_name = "Default 400x200"
-    else:
-        h = st.number_input("Depth h (mm)", 100.0, 2000.0, 400.0)
-        b = st.number_input("Width b (mm)", 50.0, 600.0, 200.0)
-        tw = st.number_input("Web thickness tw (mm)", 3.0, 50.0, 8.0)
-        tf = st.number_input("Flange thickness tf (mm)", 3.0, 50.0, 13.0)
-        sec_name = f"Custom-H {int(h)}x{int(b)}"
-
-    # --- Advanced Property Calculations (Geometric) ---
-    # Conversion to cm
-    h_c, b_c, tw_c, tf_c = h/10, b/10, tw/10, tf/10
-    
-    Ag = 2*b_c*tf_c + (h_c - 2*tf_c)*tw_c
-    Ix = (b_c * h_c**3 - (b_c - tw_c) * (h_c - 2*tf_c)**3) / 12
-    Iy = (2 * tf_c * b_c**3 + (h_c - 2*tf_c) * tw_c**3) / 12
-    Zx = (b_c * tf_c * (h_c - tf_c)) + (tw_c * (h_c - 2*tf_c)**2 / 4) 
-    Sx = (2 * Ix) / h_c 
-    rx = math.sqrt(Ix/Ag)
-    ry = math.sqrt(Iy/Ag)
-    Aw = h_c * tw_c
-    
-    # Torsional Properties
-    J = (2 * b_c * tf_c**3 + (h_c - tf_c) * tw_c**3) / 3
-    h0 = h_c - tf_c
-    Cw = (Iy * h0**2) / 4
-    r_ts = math.sqrt(math.sqrt(Iy * Cw) / Sx)
-
-    # --- Geometry Parameters ---
-    st.divider()
-    st.subheader("📏 Geometry")
-    col_g1, col_g2 = st.columns(2)
-    with col_g1: 
-        user_span = st.number_input("Total Span (m)", 0.5, 30.0, 6.0, step=0.5)
-    with col_g2: 
-        Lb = st.number_input("Unbraced Length Lb (m)", 0.0, user_span, user_span, step=0.5)
-    
-    defl_denom = int(st.selectbox(
-        "Serviceability Deflection Limit", 
-        ["L/300", "L/360", "L/400", "L/500"], 
-        index=1
-    ).split("/")[1])
-
-    # -----------------------------------------------
-    # PRE-CALCULATE SHEAR CAPACITY (Sidebar Display)
-    # -----------------------------------------------
-    if is_lrfd:
-        phi_v = 1.00
-        V_n_pre = 0.60 * Fy * Aw
-        V_cap_disp = phi_v * V_n_pre
-        v_label = "ϕVn (LRFD)"
-    else:
-        omg_v = 1.50
-        V_n_pre = 0.60 * Fy * Aw
-        V_cap_disp = V_n_pre / omg_v
-        v_label = "Vn/Ω (ASD)"
-
-    # --- Connection Design Input Logic ---
-    st.divider()
-    st.subheader("🔩 Connection Settings")
-    
-    st.markdown(f"""
-    <div class="sidebar-info">
-        <div><b>Available Shear Capacity ({v_label}):</b> <br>
-        <span style="font-size:1.3em; color:#1e40af; font-family:'Roboto Mono';">{V_cap_disp:,.0f} kg</span></div>
-    </div>
-    """, unsafe_allow_html=True)
+        E_mod = 2.04e6  # Young's Modulus in ksc
     
-    link_conn = st.checkbox("🔗 Link with Beam Capacity", value=True, help="Automatically use a % of beam capacity for connection design.")
-    if link_conn:
-        conn_shear_pct = st.slider("% of Shear Capacity to Design For", 10, 100, 50, step=5)
-        v_support_design = V_cap_disp * (conn_shear_pct / 100.0)
-    else:
-        v_support_design = st.number_input("Manual Design Shear (kg)", value=float(int(V_cap_disp*0.5)), step=100.0)
-
-    # --- ECCENTRICITY REDUCTION CALCULATION ---
-    st.markdown("---")
-    st.write("📐 **Eccentric Load Adjustment**")
-    
-    ecc_e = st.number_input(
-        "Eccentricity 'e' (mm)", 
-        value=50, 
-        step=5, 
-        help="Distance from support face to bolt group centroid. Used to calculate torque and net force."
-    )
+        # --- Section Selection ---
+        st.divider()
+        st.subheader("📦 Section Selection")
+        input_type = st.radio("Source", ["📚 Standard Database", "✏️ Custom Input"], horizontal=True, key="sb_source")
+    
+        b_bot, tf_bot, r_root = None, None, 0.0
+        if "Standard" in input_type:
+            try:
+                if batch_mode:
+                    sec_name = st.session_state.sb_section_applied
+                    pending = f" → **{picked_section}** on Apply" if picked_section != sec_name else ""
+                    st.caption(f"Size: **{sec_name}**{pending} (search above)")
+                else:
+                    sec_name = section_search.section_picker("Size (JIS/SYS)", default="H-400x200x8x13", key="sb_section")
+                    st.session_state.sb_section_applied = sec_name
+                props = steel_db.get_properties(sec_name)
+                h, b, tw, tf = float(props['h']), float(props['b']), float(props['tw']), float(props['tf'])
+                r_root = float(props.get('r', 0.0))
+            except Exception as e:
+                st.error(f"Error loading database: {e}")
+                h, b, tw, tf = 400, 200, 8, 13
+                sec_name = "Default 400x200"
+        else:
+            shape_type = st.selectbox("Shape", ["Doubly Symmetric I", "Monosymmetric / Plate Girder"], key="sb_shape")
+            h = st.number_input("Depth h (mm)", 100.0, 3000.0, 400.0, key="sb_h")
+            tw = st.number_input("Web thickness tw (mm)", 3.0, 50.0, 8.0, key="sb_tw")
+            if "Mono" in shape_type:
+                c_tf1, c_tf2 = st.columns(2)
+                with c_tf1:
+                    b = st.number_input("Top flange b (mm)", 50.0, 1000.0, 250.0, key="sb_b_top")
+                    tf = st.number_input("Top flange tf (mm)", 3.0, 80.0, 16.0, key="sb_tf_top")
+                with c_tf2:
+                    b_bot = st.number_input("Bottom flange b (mm)", 50.0, 1000.0, 200.0, key="sb_b_bot")
+                    tf_bot = st.number_input("Bottom flange tf (mm)", 3.0, 80.0, 13.0, key="sb_tf_bot")
+                sec_name = f"Custom-PG {int(h)}x{int(b)}/{int(b_bot)}"
+            else:
+                b = st.number_input("Width b (mm)", 50.0, 1000.0, 200.0, key="sb_b")
+                tf = st.number_input("Flange thickness tf (mm)", 3.0, 80.0, 13.0, key="sb_tf")
+                sec_name = f"Custom-H {int(h)}x{int(b)}"
+            r_root = st.number_input("Root radius / fillet r (mm)", 0.0, 50.0, 0.0, key="sb_r", help="Rolled root radius or web-flange fillet weld leg.")
+
+        # Web area for the sidebar shear display (full properties: beam_context.compute_beam)
+        Aw = (h / 10) * (tw / 10)
+
+        # --- Geometry Parameters ---
+        st.divider()
+        st.subheader("📏 Geometry")
+        col_g1, col_g2 = st.columns(2)
+        with col_g1: 
+            user_span = st.number_input("Total Span (m)", 0.5, 30.0, 6.0, step=0.5, key="sb_span")
+        with col_g2: 
+            Lb = st.number_input("Unbraced Length Lb (m)", 0.0, user_span, user_span, step=0.5, key="sb_Lb")
+    
+        defl_denom = int(st.selectbox(
+            "Serviceability Deflection Limit", 
+            ["L/300", "L/360", "L/400", "L/500"], 
+            index=1,
+            key="sb_defl"
+        ).split("/")[1])
+
+        # -----------------------------------------------
+        # PRE-CALCULATE SHEAR CAPACITY (Sidebar Display)
+        # -----------------------------------------------
+        if is_lrfd:
+            phi_v = 1.00
+            V_n_pre = 0.60 * Fy * Aw
+            V_cap_disp = phi_v * V_n_pre
+            v_label = "ϕVn (LRFD)"
+        else:
+            omg_v = 1.50
+            V_n_pre = 0.60 * Fy * Aw
+            V_cap_disp = V_n_pre / omg_v
+            v_label = "Vn/Ω (ASD)"
+
+        # --- Connection Design Input Logic ---
+        st.divider()
+        st.subheader("🔩 Connection Settings")
     
-    # Mathematical Model: Converting shear at support to shear at bolt group via equivalent uniform load reduction
-    w_equiv_load = (2 * v_support_design) / (user_span if user_span > 0 else 1) 
-    v_reduction = w_equiv_load * (ecc_e / 1000.0)
-    v_at_bolt = v_support_design - v_reduction
-
-    # Sidebar Force Visualization
-    st.markdown(f"""
-    <div style="background:#f1f5f9; border:1px solid #cbd5e1; border-radius:8px; padding:12px; margin-top:5px;">
-        <div style="display:flex; justify-content:space-between; margin-bottom:5px;">
-            <span style="color:#64748b; font-size:0.85em;">Reaction @ Support:</span>
-            <span style="font-weight:700; color:#334155;">{v_support_design:,.0f} kg</span>
+        st.markdown(f"""
+        <div class="sidebar-info">
+            <div><b>Available Shear Capacity ({v_label}):</b> <br>
+            <span style="font-size:1.3em; color:#1e40af; font-family:'Roboto Mono';">{V_cap_disp:,.0f} kg</span></div>
         </div>
-        <div style="display:flex; justify-content:space-between; margin-bottom:5px; border-bottom:1px dashed #cbd5e1; padding-bottom:5px;">
-             <span style="color:#ef4444; font-size:0.85em;">- Net Reduc. (w·e):</span>
-             <span style="color:#ef4444; font-size:0.85em;">{v_reduction:,.0f} kg</span>
+        """, unsafe_allow_html=True)
+    
+        link_conn = st.checkbox("🔗 Link with Beam Capacity", value=True, key="sb_link", help="Automatically use a % of beam capacity for connection design.")
+        if link_conn:
+            conn_shear_pct = st.slider("% of Shear Capacity to Design For", 10, 100, 50, step=5, key="sb_link_pct")
+            v_support_design = V_cap_disp * (conn_shear_pct / 100.0)
+        else:
+            v_support_design = st.number_input("Manual Design Shear (kg)", value=float(int(V_cap_disp*0.5)), step=100.0, key="sb_v_manual")
+
+        # --- ECCENTRICITY REDUCTION CALCULATION ---
+        st.markdown("---")
+        st.write("📐 **Eccentric Load Adjustment**")
+    
+        ecc_e = st.number_input(
+            "Eccentricity 'e' (mm)", 
+            value=50, 
+            step=5, 
+            key="sb_ecc",
+            help="Distance from support face to bolt group centroid. Used to calculate torque and net force."
+        )
+    
+        # Mathematical Model: Converting shear at support to shear at bolt group via equivalent uniform load reduction
+        w_equiv_load = (2 * v_support_design) / (user_span if user_span > 0 else 1) 
+        v_reduction = w_equiv_load * (ecc_e / 1000.0)
+        v_at_bolt = v_support_design - v_reduction
+
+        # Sidebar Force Visualization
+        st.markdown(f"""
+        <div style="background:#f1f5f9; border:1px solid #cbd5e1; border-radius:8px; padding:12px; margin-top:5px;">
+            <div style="display:flex; justify-content:space-between; margin-bottom:5px;">
+                <span style="color:#64748b; font-size:0.85em;">Reaction @ Support:</span>
+                <span style="font-weight:700; color:#334155;">{v_support_design:,.0f} kg</span>
+            </div>
+            <div style="display:flex; justify-content:space-between; margin-bottom:5px; border-bottom:1px dashed #cbd5e1; padding-bottom:5px;">
+                 <span style="color:#ef4444; font-size:0.85em;">- Net Reduc. (w·e):</span>
+                 <span style="color:#ef4444; font-size:0.85em;">{v_reduction:,.0f} kg</span>
+            </div>
+            <div style="display:flex; justify-content:space-between; align-items:center; margin-top:5px;">
+                <span style="color:#1e3a8a; font-weight:bold;">Net V @ Bolts:</span>
+                <span style="background:#2563eb; color:white; padding:2px 8px; border-radius:4px; font-weight:bold; font-family:'Roboto Mono';">{v_at_bolt:,.0f} kg</span>
+            </div>
         </div>
-        <div style="display:flex; justify-content:space-between; align-items:center; margin-top:5px;">
-            <span style="color:#1e3a8a; font-weight:bold;">Net V @ Bolts:</span>
-            <span style="background:#2563eb; color:white; padding:2px 8px; border-radius:4px; font-weight:bold; font-family:'Roboto Mono';">{v_at_bolt:,.0f} kg</span>
+        """, unsafe_allow_html=True)
+    
+        use_reduced = st.checkbox("Apply Reduction to Design?", value=False, key="sb_use_reduced")
+        v_conn_final = v_at_bolt if use_reduced else v_support_design
+
+        # --- Loads (Check Mode Only) ---
+        w_load, p_load = 0.0, 0.0
+        if is_check_mode:
+            st.divider()
+            st.subheader("⬇️ Design Loads")
+            c_l1, c_l2 = st.columns(2)
+            with c_l1: w_load = st.number_input("Uniform w (kg/m)", 0.0, 50000.0, 1000.0, key="sb_w")
+            with c_l2: p_load = st.number_input("Point P (kg)", 0.0, 100000.0, 0.0, key="sb_p")
+
+        if batch_mode:
+            st.form_submit_button("✅ Apply changes", type="primary", use_container_width=True,
+                                  on_click=_apply_section, args=(picked_section,))
+
+    # --- Applied-input status (dirty indicator) ---
+    applied_inputs = {
+        'Mode': analysis_mode, 'Method': st.session_state.design_method, 'Fy': Fy,
+        'Section': sec_name, 'Dims': (h, b, tw, tf, b_bot, tf_bot, r_root),
+        'Span': user_span, 'Lb': Lb, 'Deflection': defl_denom,
+        'V conn': round(v_conn_final, 3), 'w': w_load, 'P': p_load,
+    }
+    prev_inputs = st.session_state.get('sidebar_applied')
+    if prev_inputs != applied_inputs:
+        changed = [k for k in applied_inputs if prev_inputs is None or prev_inputs.get(k) != applied_inputs[k]]
+        st.session_state.sidebar_applied = applied_inputs
+        st.session_state.sidebar_changed = changed if prev_inputs is not None else []
+        st.session_state.sidebar_applied_at = time.strftime("%H:%M:%S")
+    if batch_mode:
+        changed = st.session_state.get('sidebar_changed', [])
+        st.markdown(f"""
+        <div class="sidebar-info">
+            <b>🟢 Applied</b> at {st.session_state.get('sidebar_applied_at', '-')}<br>
+            <small>Last apply changed: {', '.join(changed) if changed else 'nothing'}</small>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    use_reduced = st.checkbox("Apply Reduction to Design?", value=False)
-    v_conn_final = v_at_bolt if use_reduced else v_support_design
-
-    # --- Loads (Check Mode Only) ---
-    w_load, p_load = 0.0, 0.0
-    if is_check_mode:
-        st.divider()
-        st.subheader("⬇️ Design Loads")
-        c_l1, c_l2 = st.columns(2)
-        with c_l1: w_load = st.number_input("Uniform w (kg/m)", 0.0, 50000.0, 1000.0)
-        with c_l2: p_load = st.number_input("Point P (kg)", 0.0, 100000.0, 0.0)
+        """, unsafe_allow_html=True)
 
 # ==========================================
-# 4. CORE ENGINEERING LOGIC (AISC 360)
+# 4. CORE ENGINEERING LOGIC (AISC 360) - CACHED
 # ==========================================
-# All calculations in kg and cm
-L_cm = user_span * 100
-Lb_cm = Lb * 100
-E = E_mod
-
-# --- 4.1 LTB LIMITS (AISC F2) ---
-# Lp = 1.76 * ry * sqrt(E/Fy)
-Lp_cm = 1.76 * ry * math.sqrt(E/Fy)
-
-# Lr calculation (Complex Formula)
-val_A = (J * 1.0) / (Sx * h0)
-val_B = 6.76 * ((0.7 * Fy) / E)**2
-Lr_cm = 1.95 * r_ts * (E / (0.7 * Fy)) * math.sqrt(val_A + math.sqrt(val_A**2 + val_B))
-
-# --- 4.2 NOMINAL MOMENT CAPACITY (Mn) ---
-Mp = Fy * Zx
-Cb = 1.0 # Conservative assumption for Cb
-
-if Lb_cm <= Lp_cm:
-    Mn = Mp
-    ltb_zone = "Zone 1 (Plastic)"
-elif Lb_cm <= Lr_cm:
-    # Inelastic LTB
-    term1 = (Mp - 0.7 * Fy * Sx)
-    term2 = ((Lb_cm - Lp_cm) / (Lr_cm - Lp_cm))
-    Mn = min(Cb * (Mp - term1 * term2), Mp)
-    ltb_zone = "Zone 2 (Inelastic)"
-else:
-    # Elastic LTB
-    slend = (Lb_cm / r_ts)
-    Fcr = (Cb * math.pi**2 * E) / (slend**2) * math.sqrt(1 + 0.078 * val_A * slend**2)
-    Mn = min(Fcr * Sx, Mp)
-    ltb_zone = "Zone 3 (Elastic)"
-
-# --- 4.3 FACTORED/ALLOWABLE CAPACITIES ---
-if is_lrfd:
-    phi_b = 0.90
-    V_cap = V_cap_disp 
-    M_cap = (phi_b * Mn) / 100 # kg-m
-    fact_w = 1.2 * w_load # Note: Using 1.2/1.6 simplified for tool
-    fact_p = 1.6 * p_load
-    method_str = "LRFD"
-else:
-    omg_b = 1.67
-    V_cap = V_cap_disp 
-    M_cap = (Mn / omg_b) / 100 # kg-m
-    fact_w = w_load
-    fact_p = p_load
-    method_str = "ASD"
-
-# --- 4.4 DEFLECTION LIMITS ---
-d_allow = L_cm / defl_denom
-
-# --- 4.5 DESIGN RATIO PROCESSING ---
-if is_check_mode:
-    # Interaction/Check Logic
-    v_act = (fact_w * user_span / 2) + (fact_p / 2)
-    m_act = (fact_w * user_span**2 / 8) + (fact_p * user_span / 4)
-    
-    # Service deflection (No load factors)
-    d_unif = (5 * (w_load/100) * (L_cm**4)) / (384 * E * Ix)
-    d_point = (p_load * (L_cm**3)) / (48 * E * Ix)
-    d_act = d_unif + d_point
-    
-    ratio_v = v_act / V_cap
-    ratio_m = m_act / M_cap
-    ratio_d = d_act / d_allow
-    gov_ratio = max(ratio_v, ratio_m, ratio_d)
-    
-    if gov_ratio == ratio_v: gov_cause = "Shear Strength"
-    elif gov_ratio == ratio_m: gov_cause = "Flexural Strength (LTB)"
-    else: gov_cause = "Deflection Serviceability"
-    w_safe = 0
-    
-else:
-    # Find Capacity Logic
-    # 1. Moment limit
-    w_safe_moment = (8 * M_cap) / (user_span**2 if user_span > 0 else 1)
-    
-    # 2. Shear limit
-    w_safe_shear = (2 * V_cap) / (user_span if user_span > 0 else 1)
-    
-    # 3. Deflection limit
-    w_serv_defl = (384 * E * Ix * d_allow) / (5 * (L_cm**4)) * 100
-    w_safe_defl = w_serv_defl * 1.4 if is_lrfd else w_serv_defl
-    
-    w_safe = min(w_safe_shear, w_safe_moment, w_safe_defl)
-    
-    # Back-calculations
-    v_act = (w_safe * user_span) / 2
-    m_act = (w_safe * user_span**2) / 8
-    
-    ratio_v = w_safe / w_safe_shear
-    ratio_m = w_safe / w_safe_moment
-    ratio_d = w_safe / w_safe_defl
-    
-    w_safe_service = w_safe / 1.4 if is_lrfd else w_safe
-    d_act = (5 * (w_safe_service/100) * (L_cm**4)) / (384 * E * Ix)
-    gov_ratio = 1.00 
-    
-    if w_safe == w_safe_shear: gov_cause = "Shear Control"
-    elif w_safe == w_safe_moment: gov_cause = "Flexural Control"
-    else: gov_cause = "Deflection Control"
+# All calculations in kg and cm (beam_engine.py); ผลลัพธ์ cache ด้วย input ชุดนี้
+# ทุกหน้าใช้ results_context ตัวเดียวกัน: สลับหน้าไม่ต้องคำนวณซ้ำ
+beam_inputs = {
+    'is_check_mode': is_check_mode, 'is_lrfd': is_lrfd, 'Fy': Fy, 'E': E_mod,
+    'sec_name': sec_name, 'h': h, 'b': b, 'tw': tw, 'tf': tf,
+    'b_bot': b_bot, 'tf_bot': tf_bot, 'r': r_root,
+    'user_span': user_span, 'Lb': Lb, 'defl_denom': defl_denom,
+    'w_load': w_load, 'p_load': p_load,
+}
+results_context = beam_context.compute_beam(beam_inputs)
 
 # ==========================================
-# 5. DATA PACKAGING FOR TABS
+# 5. DATA PACKAGING FOR PAGES
 # ==========================================
-# Complex Context for Analysis Modules
-results_context = {
-    'is_check_mode': is_check_mode,
-    'method_str': method_str,
-    'is_lrfd': is_lrfd,
-    'sec_name': sec_name,
-    'user_span': user_span,
-    'Lb': Lb,
-    'Lb_cm': Lb_cm,
-    'Fy': Fy,
-    'E': E,
-    'w_load': w_load,
-    'p_load': p_load,
-    'fact_w': fact_w,
-    'fact_p': fact_p,
-    'V_cap': V_cap,
-    'M_cap': M_cap,
-    'vn': V_cap,  # Map for Report
-    'mn': M_cap,  # Map for Report
-    'v_act': v_act,
-    'm_act': m_act,
-    'ratio_v': ratio_v,
-    'ratio_m': ratio_m,
-    'ratio_d': ratio_d,
-    'gov_ratio': gov_ratio,
-    'gov_cause': gov_cause,
-    'w_safe': w_safe,
-    'd_act': d_act,
-    'd_allow': d_allow,
-    'defl_act': d_act, # Map for Report
-    'defl_all': d_allow, # Map for Report
-    'defl_denom': defl_denom,
-    'Aw': Aw,
-    'Ix': Ix,
-    'Sx': Sx,
-    'Zx': Zx,
-    'Mp': Mp,
-    'Cb': Cb,
-    'r_ts': r_ts,
-    'val_A': val_A,
-    'Lp_cm': Lp_cm,
-    'Lr_cm': Lr_cm,
-    'ltb_zone': ltb_zone,
-    'Mn': Mn,
-    'ry': ry,
-    'J': J,
-    'h0': h0,
-    'h': h, # Adding raw dimensions
-    'b': b,
-    'tw': tw,
-    'tf': tf
+rc = results_context
+st.session_state.results_context = results_context
+st.session_state.page_inputs = {
+    'v_conn_final': v_conn_final,
+    'grade_choice': grade_choice,
 }
 
-# Simplified Session State for Cross-Tab communication
-st.session_state.res_dict = {
-    'w_safe': w_safe,
-    'cause': gov_cause, 
-    'v_cap': V_cap, 
-    'v_act': v_act,
-    'm_cap': M_cap, 
-    'm_act': m_act, 
-    'mn_raw': Mn,
-    'd_all': d_allow, 
-    'd_act': d_act,
-    'v_conn_design': v_conn_final, 
-    'ltb_info': {
-        'Lp': Lp_cm, 
-        'Lr': Lr_cm, 
-        'Lb': Lb_cm, 
-        'Zone': ltb_zone, 
-        'Cb': Cb
-    }
-}
+# Simplified Session State for Cross-Tab communication (compact slotted record)
+st.session_state.res_dict = beam_context.DesignSummary(rc, v_conn_final)
 st.session_state.cal_success = True
 
 # ==========================================
-# 6. TABBED UI RENDERING
+# 6. MULTIPAGE NAVIGATION
 # ==========================================
-# Defining 6 Tabs (Added Summary Check)
-tab1, tab_sum, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Analysis & Graphs",
-    "🏁 Summary Check",   # <--- New Tab Here
-    "🔩 Connection Detail", 
-    "🛡️ LTB Insight", 
-    "📝 Detailed Report",
-    "🧱 Base Plate"
-])
-
-# --- TAB 1: PRIMARY ANALYSIS ---
-with tab1:
-    tab1_analysis.render(results_context)
-
-# --- TAB NEW: SUMMARY CHECK ---
-with tab_sum:
-    # Calls the new module created
-    tab_summary.render(results_context)
-
-# --- TAB 2: SHEAR CONNECTION ---
-with tab2:
-    if st.session_state.cal_success:
-        st.info(f"⚡ **Force Vector Input:** {v_conn_final:,.0f} kg ")
-        
-        # User selection for connection type
-        c_type = st.selectbox(
-            "Connection Selection", 
-            ["Fin Plate", "End Plate", "Double Angle"], 
-            key='conn_type_selector_unique'
-        )
-        st.session_state.conn_type = c_type 
-        
-        section_data = {
-            "name": sec_name, 
-            "h": h, 
-            "b": b, 
-            "tw": tw, 
-            "tf": tf
-        }
-        
-        # Call External Design Module
-        connection_design.render_connection_tab(
-            V_design_from_tab1=v_conn_final,
-            default_bolt_size=20,
-            method=st.session_state.design_method,
-            is_lrfd=is_lrfd,
-            section_data=section_data,
-            conn_type=c_type,
-            default_bolt_grade="A325",
-            default_mat_grade=grade_choice
-        )
-        
-        # บันทึกสถานะคร่าวๆ ลง Session (เพื่อส่งให้ Tab 4)
-        st.session_state.v_design = {
-            'type': c_type,
-            'summary': f"Designed for Shear {v_conn_final:,.0f} kg ({method_str})",
-            'pass': True 
-        }
-
-    else:
-        st.warning("⚠️ Calculation pending. Please define section parameters.")
-
-# --- TAB 3: LTB VISUALIZER ---
-with tab3:
-    tab3_ltb.render(results_context)
-
-# --- TAB 4: CALCULATION REPORT ---
-with tab4:
-    if st.session_state.cal_success:
-        # 🟢 แก้ไข: ส่ง dict ข้อมูล 2 ตัวตามที่ report_generator.py ต้องการ
-        beam_data = results_context
-        conn_data = st.session_state.get('v_design', {})
-        
-        # สร้าง Dummy Data กัน Error กรณี Tab 2 ยังไม่ถูกรัน
-        if not conn_data:
-            conn_data = {
-                'type': st.session_state.conn_type,
-                'summary': f"Pending design for V={v_conn_final:,.0f} kg",
-                'pass': False
-            }
-
-        report_generator.render_report_tab(beam_data, conn_data)
-    else:
-        st.error("No data available for reporting.")
-
-# --- TAB 5: BASE PLATE DESIGN ---
-with tab5:
-    if st.session_state.cal_success:
-        st.markdown("### 🧱 Column Base Plate Design")
-        st.markdown("""
-        This module calculates the required thickness and dimensions for a base plate 
-        based on the reaction forces calculated from the beam analysis.
-        """)
-         
-        
-        # Calling Tab 5 Module
-        try:
-            tab5_baseplate.render(results_context, v_conn_final)
-        except Exception as e:
-            st.error(f"Error in Base Plate Module: {e}")
-            st.code(f"Debug: {results_context['h']} x {results_context['b']}")
-    else:
-        st.warning("Please complete the Beam Analysis in Tab 1 first.")
+# แต่ละหน้าอยู่ใน app_pages/ และรันเฉพาะหน้าที่เปิดอยู่
+PAGES = [
+    st.Page("app_pages/beam.py", title="Analysis & Graphs", icon="📊", default=True),
+    st.Page("app_pages/summary.py", title="Summary Check", icon="🏁"),
+    st.Page("app_pages/compare.py", title="Compare Sections", icon="⚖️"),
+    st.Page("app_pages/connection.py", title="Connection Detail", icon="🔩"),
+    st.Page("app_pages/ltb.py", title="LTB Insight", icon="🛡️"),
+    st.Page("app_pages/report.py", title="Detailed Report", icon="📝"),
+    st.Page("app_pages/baseplate.py", title="Base Plate", icon="🧱"),
+]
+st.navigation(PAGES, position="top").run()
 
 # ==========================================
 # 7. FOOTER & METADATA
 # ==========================================
 st.divider()
+with st.expander("⏱️ Import-time budget", expanded=False):
+    import_budget.render_budget_report()
+with st.expander("🗄️ Shared computation cache", expanded=False):
+    shared_cache.render_stats()
+# ไล่ผลลัพธ์เก่าที่ไม่ได้ใช้ เมื่อ session ใช้หน่วยความจำเกินงบ
+evicted = session_budget.enforce()
+with st.expander("🧠 Session memory", expanded=False):
+    if evicted:
+        st.caption(f"Evicted stale results: {', '.join(evicted)}")
+    session_budget.render_usage()
 col_f1, col_f2 = st.columns(2)
 with col_f1:
-    st.caption(f"Engine Status: Online | Method: {method_str} | Section: {sec_name}")
+    st.caption(f"Engine Status: Online | Method: {rc['method_str']} | Section: {sec_name}")
 with col_f2:
     st.markdown("<div style='text-align:right;'><small>© 2026 Structural Insight Hybrid - Professional Edition</small></div>", unsafe_allow_html=True)
 
@@ -0,0 +1,22 @@
+# app_pages/baseplate.py - 🧱 Base Plate
+import streamlit as st
+import import_budget
+
+results_context = st.session_state.results_context
+
+if st.session_state.cal_success:
+    st.markdown("### 🧱 Column Base Plate Design")
+    st.markdown("""
+    This module calculates the required thickness and dimensions for a base plate 
+    based on the reaction forces calculated from the beam analysis.
+    """)
+     
+    
+    # Calling Tab 5 Module
+    try:
+        import_budget.require("tab5_baseplate").render(results_context, st.session_state.page_inputs['v_conn_final'])
+    except Exception as e:
+        st.error(f"Error in Base Plate Module: {e}")
+        st.code(f"Debug: {results_context['h']} x {results_context['b']}")
+else:
+    st.warning("Please complete the Beam Analysis on the Analysis page first.")
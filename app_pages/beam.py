@@ -0,0 +1,5 @@
+# app_pages/beam.py - 📊 Analysis & Graphs
+import streamlit as st
+import import_budget
+
+import_budget.require("tab1_analysis").render(st.session_state.results_context)
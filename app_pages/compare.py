@@ -0,0 +1,5 @@
+# app_pages/compare.py - ⚖️ Compare Sections
+import streamlit as st
+import import_budget
+
+import_budget.require("tab_compare").render(st.session_state.results_context)
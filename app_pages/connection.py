@@ -0,0 +1,48 @@
+# app_pages/connection.py - 🔩 Connection Detail
+import streamlit as st
+import import_budget
+import session_budget
+
+results_context = st.session_state.results_context
+v_conn_final = st.session_state.page_inputs['v_conn_final']
+
+if st.session_state.cal_success:
+    st.info(f"⚡ **Force Vector Input:** {v_conn_final:,.0f} kg ")
+    
+    # User selection for connection type
+    c_type = st.selectbox(
+        "Connection Selection", 
+        ["Fin Plate", "End Plate", "Double Angle"], 
+        key='conn_type_selector_unique'
+    )
+    st.session_state.conn_type = c_type 
+    
+    section_data = {
+        "name": results_context['sec_name'], 
+        "h": results_context['h'], 
+        "b": results_context['b'], 
+        "tw": results_context['tw'], 
+        "tf": results_context['tf']
+    }
+    
+    # Call External Design Module
+    import_budget.require("connection_design").render_connection_tab(
+        V_design_from_tab1=v_conn_final,
+        default_bolt_size=20,
+        method=st.session_state.design_method,
+        is_lrfd=results_context['is_lrfd'],
+        section_data=section_data,
+        conn_type=c_type,
+        default_bolt_grade="A325",
+        default_mat_grade=st.session_state.page_inputs['grade_choice']
+    )
+    
+    # บันทึกสถานะคร่าวๆ ลง Session (เพื่อส่งให้ Tab 4)
+    session_budget.put('v_design', {
+        'type': c_type,
+        'summary': f"Designed for Shear {v_conn_final:,.0f} kg ({results_context['method_str']})",
+        'pass': True 
+    })
+
+else:
+    st.warning("⚠️ Calculation pending. Please define section parameters.")
@@ -0,0 +1,5 @@
+# app_pages/ltb.py - 🛡️ LTB Insight
+import streamlit as st
+import import_budget
+
+import_budget.require("tab3_ltb").render(st.session_state.results_context)
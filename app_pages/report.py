@@ -0,0 +1,23 @@
+# app_pages/report.py - 📝 Detailed Report
+import streamlit as st
+import import_budget
+import session_budget
+
+v_conn_final = st.session_state.page_inputs['v_conn_final']
+
+if st.session_state.cal_success:
+    # 🟢 แก้ไข: ส่ง dict ข้อมูล 2 ตัวตามที่ report_generator.py ต้องการ
+    beam_data = st.session_state.results_context
+    conn_data = session_budget.get('v_design', {})
+    
+    # สร้าง Dummy Data กัน Error กรณีหน้า Connection ยังไม่ถูกเปิด
+    if not conn_data:
+        conn_data = {
+            'type': st.session_state.conn_type,
+            'summary': f"Pending design for V={v_conn_final:,.0f} kg",
+            'pass': False
+        }
+
+    import_budget.require("report_generator").render_report_tab(beam_data, conn_data)
+else:
+    st.error("No data available for reporting.")
@@ -0,0 +1,5 @@
+# app_pages/summary.py - 🏁 Summary Check
+import streamlit as st
+import import_budget
+
+import_budget.require("tab_summary").render(st.session_state.results_context)
@@ -1,141 +1,171 @@
-def get_svg_drawing(params):
-    # --- ดึงข้อมูล ---
-    B, N = params['B'], params['N']
-    cb, ch = params['cb'], params['ch']
-    ctw, ctf = params['ctw'], params['ctf']
-    sx, sy = params['sx'], params['sy']
-    tp, grout_h = params['tp'], params['grout_h']
-    edge_x, edge_y = params['edge_x'], params['edge_y']
-    clr_x, clr_y = params['clr_x'], params['clr_y']
-    col_name, bolt_d = params['col_name'], params['bolt_d']
-    
-    cv_w, cv_h = 1350, 1850 
-    sc = 400 / max(N, B)  
-    px, py = 500, 380   
-    ax, ay = 500, 980  
-    bx, by = 500, 1500  
-
-    def tick(x, y): return f'<line x1="{x-6}" y1="{y+6}" x2="{x+6}" y2="{y-6}" stroke="black" stroke-width="1.5"/>'
+# baseplate_drawer.py
+# Shop drawing ของ Base Plate เป็น SVG แบบ 2 ชั้น
+# - STATIC: style, marker, พื้นหลัง, หัวข้อ section, กรอบ title block (สร้างครั้งเดียวตอน import)
+# - PARAMETRIC: geometry จาก params (พิกัดปัดทศนิยม 1 ตำแหน่ง, tick ของแต่ละแนวรวมเป็น path เดียว)
+# ผลลัพธ์ cache ด้วย hash ของ params: params เดิมไม่ต้องสร้าง SVG ใหม่ และได้ string เดิมทุกครั้ง
+import shared_cache
+import steel_db
 
-    return f"""
-    <svg width="{cv_w}" height="{cv_h}" viewBox="0 0 {cv_w} {cv_h}" xmlns="http://www.w3.org/2000/svg">
-        <rect width="100%" height="100%" fill="#ffffff"/>
+CV_W, CV_H = 1350, 1850
+PLAN_XY = (500, 380)
+SEC_A_XY = (500, 980)
+SEC_B_XY = (500, 1500)
+TITLE_XY = (900, 1400)
+BOLT_R = 10
 
-        <g transform="translate({px}, {py})">
-            <text x="0" y="{-N*sc/2 - 120}" text-anchor="middle" font-weight="bold" font-size="24">PLAN VIEW</text>
-            <rect x="{-B*sc/2}" y="{-N*sc/2}" width="{B*sc}" height="{N*sc}" fill="none" stroke="black" stroke-width="3"/>
-            
-            <g fill="#cbd5e1" stroke="black" stroke-width="1.5">
-                <rect x="{-cb/2*sc}" y="{-ch/2*sc}" width="{cb*sc}" height="{ctf*sc}"/> 
-                <rect x="{-cb/2*sc}" y="{(ch/2-ctf)*sc}" width="{cb*sc}" height="{ctf*sc}"/>
-                <rect x="{-ctw/2*sc}" y="{-ch/2*sc+ctf*sc}" width="{ctw*sc}" height="{(ch-2*ctf)*sc}"/>
-            </g>
+def _n(v):
+    """พิกัดปัดตามความละเอียดของแบบ (ตัด .0 ท้าย)"""
+    v = round(float(v), 1)
+    return str(int(v)) if v == int(v) else str(v)
 
-            <g fill="white" stroke="#2563eb" stroke-width="2.5">
-                <circle cx="{-sx/2*sc}" cy="{-sy/2*sc}" r="10"/><circle cx="{sx/2*sc}" cy="{-sy/2*sc}" r="10"/>
-                <circle cx="{-sx/2*sc}" cy="{sy/2*sc}" r="10"/><circle cx="{sx/2*sc}" cy="{sy/2*sc}" r="10"/>
-            </g>
+# ==========================================
+# 🧱 1. STATIC LAYER
+# ==========================================
+STATIC_HEAD = f"""<svg width="{CV_W}" height="{CV_H}" viewBox="0 0 {CV_W} {CV_H}" xmlns="http://www.w3.org/2000/svg">
+<style>
+.d{{font-family:Arial;font-size:14px;font-weight:bold}}.d13{{font-size:13px}}
+.m{{text-anchor:middle}}.e{{text-anchor:end}}.s{{text-anchor:start}}.g{{fill:green}}.r{{fill:red}}
+.ln{{stroke:black;stroke-width:1.5}}.tk{{fill:none;stroke:black;stroke-width:1.5}}
+.col{{fill:#cbd5e1;stroke:black}}.pl{{fill:white;stroke:black;stroke-width:2.5}}
+.gr{{fill:#f1f5f9;stroke:black;stroke-dasharray:2,2}}.ab{{fill:none;stroke:#2563eb;stroke-width:3}}
+.h{{font-weight:bold;text-anchor:middle}}.tb{{font-family:monospace;font-size:18px;font-weight:bold}}
+</style>
+<defs><marker id="arrow" markerWidth="10" markerHeight="10" refX="0" refY="3" orient="auto" markerUnits="strokeWidth"><path d="M0,0 L0,6 L9,3 z" fill="red"/></marker></defs>
+<rect width="100%" height="100%" fill="#ffffff"/>
+<text x="{SEC_A_XY[0]}" y="{SEC_A_XY[1] - 200}" class="h" font-size="22">SECTION A-A (FRONT VIEW)</text>
+<text x="{SEC_B_XY[0]}" y="{SEC_B_XY[1] - 220}" class="h" font-size="22">SECTION B-B (SIDE VIEW)</text>
+<g transform="translate({TITLE_XY[0]},{TITLE_XY[1]})">
+<rect width="360" height="400" fill="none" stroke="black" stroke-width="2"/>
+<text x="15" y="45" font-family="sans-serif" font-weight="bold" font-size="24">FINAL SHOP DRAWING</text>
+<line x1="0" y1="65" x2="360" y2="65" stroke="black" stroke-width="2"/>
+<rect x="0" y="320" width="360" height="80" fill="#1e293b"/>
+<text x="180" y="372" text-anchor="middle" fill="white" font-family="sans-serif" font-weight="bold" font-size="28">APPROVED</text>
+</g>
+"""
+STATIC_TAIL = "</svg>"
 
-            <g transform="translate(0, {N*sc/2 + 70})" font-family="Arial" font-size="14" font-weight="bold">
-                <line x1="{-B*sc/2}" y1="0" x2="{B*sc/2}" y2="0" stroke="black" stroke-width="1.5"/>
-                {tick(-B*sc/2,0)} {tick(-sx/2*sc,0)} {tick(-cb/2*sc,0)} {tick(cb/2*sc,0)} {tick(sx/2*sc,0)} {tick(B*sc/2,0)}
-                <text x="{-sx/2*sc - edge_x*sc/2}" y="25" text-anchor="middle" fill="green">{int(edge_x)}</text>
-                <text x="{-cb/2*sc - clr_x*sc/2}" y="25" text-anchor="middle" fill="red">{int(clr_x)}</text>
-                <text x="0" y="25" text-anchor="middle">{int(cb)}</text>
-                <text x="{cb/2*sc + clr_x*sc/2}" y="25" text-anchor="middle" fill="red">{int(clr_x)}</text>
-                <text x="{sx/2*sc + edge_x*sc/2}" y="25" text-anchor="middle" fill="green">{int(edge_x)}</text>
-            </g>
+# ==========================================
+# 📐 2. PARAMETRIC LAYER
+# ==========================================
+def _ticks(points):
+    """tick ทแยงทุกจุดใน path เดียว (แทน <line> ทีละจุด)"""
+    return '<path class="tk" d="' + "".join(f"M{_n(x - 6)},{_n(y + 6)}l12-12" for x, y in points) + '"/>'
 
-            <g transform="translate({-B*sc/2 - 70}, 0)" font-family="Arial" font-size="14" font-weight="bold">
-                <line x1="0" y1="{-N*sc/2}" x2="0" y2="{N*sc/2}" stroke="black" stroke-width="1.5"/>
-                {tick(0, -N*sc/2)} {tick(0, -sy/2*sc)} {tick(0, -ch/2*sc)} {tick(0, ch/2*sc)} {tick(0, sy/2*sc)} {tick(0, N*sc/2)}
-                <text x="-15" y="{-sy/2*sc - edge_y*sc/2}" text-anchor="end" fill="green">{int(edge_y)}</text>
-                <text x="-15" y="{-ch/2*sc - clr_y*sc/2 + ctf*sc/2}" text-anchor="end" fill="red">{int(clr_y)}</text>
-                <text x="-15" y="0" text-anchor="end">{int(ch)}</text>
-                <text x="-15" y="{ch/2*sc + clr_y*sc/2 - ctf*sc/2}" text-anchor="end" fill="red">{int(clr_y)}</text>
-                <text x="-15" y="{sy/2*sc + edge_y*sc/2}" text-anchor="end" fill="green">{int(edge_y)}</text>
-            </g>
-        </g>
+def _dim_chain(total, bolt, member, edge, clr, mid_label, sc, text_y):
+    """โซ่ระยะแนวนอน: edge | clear | member | clear | edge (ค่าใน mm, วาดด้วย scale sc)"""
+    xs = [-total / 2, -bolt / 2, -member / 2, member / 2, bolt / 2, total / 2]
+    ty = _n(text_y)
+    return "\n".join([
+        f'<line class="ln" x1="{_n(xs[0] * sc)}" y1="0" x2="{_n(xs[-1] * sc)}" y2="0"/>',
+        _ticks([(x * sc, 0) for x in xs]),
+        f'<text x="{_n(-bolt / 2 * sc - edge * sc / 2)}" y="{ty}" class="m g">{int(edge)}</text>',
+        f'<text x="{_n(-member / 2 * sc - clr * sc / 2)}" y="{ty}" class="m r">{int(clr)}</text>',
+        f'<text x="0" y="{ty}" class="m">{mid_label}</text>',
+        f'<text x="{_n(member / 2 * sc + clr * sc / 2)}" y="{ty}" class="m r">{int(clr)}</text>',
+        f'<text x="{_n(bolt / 2 * sc + edge * sc / 2)}" y="{ty}" class="m g">{int(edge)}</text>',
+    ])
 
-        <g transform="translate({ax}, {ay})">
-            <text x="0" y="-200" text-anchor="middle" font-weight="bold" font-size="22">SECTION A-A (FRONT VIEW)</text>
-            <rect x="{-B*sc/2}" y="0" width="{B*sc}" height="{tp*sc}" fill="white" stroke="black" stroke-width="2.5"/>
-            <rect x="{-B*sc/2}" y="{tp*sc}" width="{B*sc}" height="{grout_h*sc}" fill="#f1f5f9" stroke="black" stroke-dasharray="2,2"/>
-            <rect x="{-cb/2*sc}" y="-150" width="{cb*sc}" height="150" fill="#cbd5e1" stroke="black"/>
-            
-            <g stroke="#2563eb" stroke-width="3">
-                <line x1="{-sx/2*sc}" y1="-40" x2="{-sx/2*sc}" y2="200"/>
-                <line x1="{sx/2*sc}" y1="-40" x2="{sx/2*sc}" y2="200"/>
-            </g>
+def _thickness_dims(tp, grout_h, sc, labels):
+    """ระยะแนวตั้งด้านขวา: เสา / plate / grout"""
+    y_tp, y_gr = tp * sc, tp * sc + grout_h * sc
+    out = [
+        f'<line x1="0" y1="-150" x2="0" y2="{_n(y_gr)}" stroke="black" stroke-width="1.2"/>',
+        _ticks([(0, -150), (0, 0), (0, y_tp), (0, y_gr)]),
+    ]
+    if labels[0]:
+        out.append(f'<text x="15" y="-75" class="s">{labels[0]}</text>')
+    out.append(f'<text x="15" y="{_n(y_tp / 2 + 5)}" class="s" fill="#1e40af">{labels[1]}: {int(tp)}</text>')
+    out.append(f'<text x="15" y="{_n(tp * sc + grout_h * sc / 2 + 5)}" class="s" fill="#64748b">{labels[2]}: {int(grout_h)}</text>')
+    return "\n".join(out)
 
-            <g transform="translate(0, 160)" font-family="Arial" font-size="14" font-weight="bold">
-                <line x1="{-B*sc/2}" y1="0" x2="{B*sc/2}" y2="0" stroke="black" stroke-width="1.5"/>
-                {tick(-B*sc/2,0)} {tick(-sx/2*sc,0)} {tick(-cb/2*sc,0)} {tick(cb/2*sc,0)} {tick(sx/2*sc,0)} {tick(B*sc/2,0)}
-                <text x="{-sx/2*sc - edge_x*sc/2}" y="20" text-anchor="middle" fill="green">{int(edge_x)}</text>
-                <text x="{-cb/2*sc - clr_x*sc/2}" y="20" text-anchor="middle" fill="red">{int(clr_x)}</text>
-                <text x="0" y="20" text-anchor="middle">{int(cb)}</text>
-                <text x="{cb/2*sc + clr_x*sc/2}" y="20" text-anchor="middle" fill="red">{int(clr_x)}</text>
-                <text x="{sx/2*sc + edge_x*sc/2}" y="20" text-anchor="middle" fill="green">{int(edge_x)}</text>
-            </g>
+def _section(xy, total, member, bolt, tp, grout_h, sc, chain, side_labels):
+    """Section A-A / B-B: plate + grout + เสา + anchor bolt + ระยะ"""
+    x_b = bolt / 2 * sc
+    return "\n".join([
+        f'<g transform="translate({xy[0]},{xy[1]})">',
+        f'<rect class="pl" x="{_n(-total / 2 * sc)}" y="0" width="{_n(total * sc)}" height="{_n(tp * sc)}"/>',
+        f'<rect class="gr" x="{_n(-total / 2 * sc)}" y="{_n(tp * sc)}" width="{_n(total * sc)}" height="{_n(grout_h * sc)}"/>',
+        f'<rect class="col" x="{_n(-member / 2 * sc)}" y="-150" width="{_n(member * sc)}" height="150"/>',
+        f'<path class="ab" d="M{_n(-x_b)},-40V200M{_n(x_b)},-40V200"/>',
+        f'<g transform="translate(0,160)" class="d">', chain, '</g>',
+        f'<g transform="translate({_n(total / 2 * sc + 60)},0)" class="d d13">',
+        _thickness_dims(tp, grout_h, sc, side_labels), '</g>',
+        '</g>',
+    ])
 
-            <g transform="translate({B*sc/2 + 60}, 0)" font-family="Arial" font-size="13" font-weight="bold">
-                <line x1="0" y1="-150" x2="0" y2="{tp*sc + grout_h*sc}" stroke="black" stroke-width="1.2"/>
-                {tick(0,-150)} {tick(0,0)} {tick(0,tp*sc)} {tick(0,tp*sc + grout_h*sc)}
-                <text x="15" y="-75" text-anchor="start">COLUMN</text>
-                <text x="15" y="{tp*sc/2 + 5}" text-anchor="start" fill="#1e40af">tp: {int(tp)}</text>
-                <text x="15" y="{tp*sc + grout_h*sc/2 + 5}" text-anchor="start" fill="#64748b">GRT: {int(grout_h)}</text>
-            </g>
-        </g>
-
-        <g transform="translate({bx}, {by})">
-            <text x="0" y="-220" text-anchor="middle" font-weight="bold" font-size="22">SECTION B-B (SIDE VIEW)</text>
-            <rect x="{-N*sc/2}" y="0" width="{N*sc}" height="{tp*sc}" fill="white" stroke="black" stroke-width="2.5"/>
-            <rect x="{-N*sc/2}" y="{tp*sc}" width="{N*sc}" height="{grout_h*sc}" fill="#f1f5f9" stroke="black" stroke-dasharray="2,2"/>
-            <rect x="{-ch/2*sc}" y="-150" width="{ch*sc}" height="150" fill="#cbd5e1" stroke="black"/>
+def _parametric_layer(params):
+    B, N = params['B'], params['N']
+    cb, ch = params['cb'], params['ch']
+    ctw, ctf = params['ctw'], params['ctf']
+    sx, sy = params['sx'], params['sy']
+    tp, grout_h = params['tp'], params['grout_h']
+    edge_x, edge_y = params['edge_x'], params['edge_y']
+    clr_x, clr_y = params['clr_x'], params['clr_y']
+    col_name, bolt_d = params['col_name'], params['bolt_d']
+    sc = 400 / max(N, B)
 
-            <g stroke="#2563eb" stroke-width="3">
-                <line x1="{-sy/2*sc}" y1="-40" x2="{-sy/2*sc}" y2="200"/>
-                <line x1="{sy/2*sc}" y1="-40" x2="{sy/2*sc}" y2="200"/>
-            </g>
-            
-            <g transform="translate(0, 160)" font-family="Arial" font-size="14" font-weight="bold">
-                <line x1="{-N*sc/2}" y1="0" x2="{N*sc/2}" y2="0" stroke="black" stroke-width="1.5"/>
-                {tick(-N*sc/2,0)} {tick(-sy/2*sc,0)} {tick(-ch/2*sc,0)} {tick(ch/2*sc,0)} {tick(sy/2*sc,0)} {tick(N*sc/2,0)}
-                <text x="{-sy/2*sc - edge_y*sc/2}" y="20" text-anchor="middle" fill="green">{int(edge_y)}</text>
-                <text x="{-ch/2*sc - clr_y*sc/2}" y="20" text-anchor="middle" fill="red">{int(clr_y)}</text>
-                <text x="0" y="20" text-anchor="middle">DEPTH:{int(ch)}</text>
-                <text x="{ch/2*sc + clr_y*sc/2}" y="20" text-anchor="middle" fill="red">{int(clr_y)}</text>
-                <text x="{sy/2*sc + edge_y*sc/2}" y="20" text-anchor="middle" fill="green">{int(edge_y)}</text>
-            </g>
+    bolts = "".join(f'<circle cx="{_n(x * sx / 2 * sc)}" cy="{_n(y * sy / 2 * sc)}" r="{BOLT_R}"/>'
+                    for y in (-1, 1) for x in (-1, 1))
+    ys = [-N / 2, -sy / 2, -ch / 2, ch / 2, sy / 2, N / 2]
+    plan = "\n".join([
+        f'<g transform="translate({PLAN_XY[0]},{PLAN_XY[1]})">',
+        f'<text x="0" y="{_n(-N * sc / 2 - 120)}" class="h" font-size="24">PLAN VIEW</text>',
+        f'<rect x="{_n(-B * sc / 2)}" y="{_n(-N * sc / 2)}" width="{_n(B * sc)}" height="{_n(N * sc)}" fill="none" stroke="black" stroke-width="3"/>',
+        '<g fill="#cbd5e1" stroke="black" stroke-width="1.5">'
+        f'<rect x="{_n(-cb / 2 * sc)}" y="{_n(-ch / 2 * sc)}" width="{_n(cb * sc)}" height="{_n(ctf * sc)}"/>'
+        f'<rect x="{_n(-cb / 2 * sc)}" y="{_n((ch / 2 - ctf) * sc)}" width="{_n(cb * sc)}" height="{_n(ctf * sc)}"/>'
+        f'<rect x="{_n(-ctw / 2 * sc)}" y="{_n(-ch / 2 * sc + ctf * sc)}" width="{_n(ctw * sc)}" height="{_n((ch - 2 * ctf) * sc)}"/></g>',
+        f'<g fill="white" stroke="#2563eb" stroke-width="2.5">{bolts}</g>',
+        f'<g transform="translate(0,{_n(N * sc / 2 + 70)})" class="d">',
+        _dim_chain(B, sx, cb, edge_x, clr_x, int(cb), sc, 25), '</g>',
+        f'<g transform="translate({_n(-B * sc / 2 - 70)},0)" class="d">',
+        f'<line class="ln" x1="0" y1="{_n(ys[0] * sc)}" x2="0" y2="{_n(ys[-1] * sc)}"/>',
+        _ticks([(0, y * sc) for y in ys]),
+        f'<text x="-15" y="{_n(-sy / 2 * sc - edge_y * sc / 2)}" class="e g">{int(edge_y)}</text>',
+        f'<text x="-15" y="{_n(-ch / 2 * sc - clr_y * sc / 2 + ctf * sc / 2)}" class="e r">{int(clr_y)}</text>',
+        f'<text x="-15" y="0" class="e">{int(ch)}</text>',
+        f'<text x="-15" y="{_n(ch / 2 * sc + clr_y * sc / 2 - ctf * sc / 2)}" class="e r">{int(clr_y)}</text>',
+        f'<text x="-15" y="{_n(sy / 2 * sc + edge_y * sc / 2)}" class="e g">{int(edge_y)}</text>',
+        '</g>',
+        '</g>',
+    ])
+    sec_a = _section(SEC_A_XY, B, cb, sx, tp, grout_h, sc,
+                     _dim_chain(B, sx, cb, edge_x, clr_x, int(cb), sc, 20), ("COLUMN", "tp", "GRT"))
+    sec_b = _section(SEC_B_XY, N, ch, sy, tp, grout_h, sc,
+                     _dim_chain(N, sy, ch, edge_y, clr_y, f"DEPTH:{int(ch)}", sc, 20), (None, "PLATE", "GROUT"))
+    title = "\n".join([
+        f'<g transform="translate({TITLE_XY[0]},{TITLE_XY[1]})" class="tb">',
+        f'<text x="15" y="110">● COL: {col_name}</text>',
+        f'<text x="15" y="145">● PLATE: PL{int(tp)}x{int(B)}x{int(N)}</text>',
+        f'<text x="15" y="180">● BOLT: 4-M{bolt_d}</text>',
+        '</g>',
+    ])
+    leader = "\n".join([
+        f'<g transform="translate({SEC_A_XY[0]},{SEC_A_XY[1]})">',
+        f'<path d="M{_n(-cb / 4 * sc)},-80L-250,-80" fill="none" stroke="red" stroke-width="2" marker-end="url(#arrow)"/>',
+        f'<text x="-255" y="-75" text-anchor="end" fill="red" font-size="18" font-weight="bold">{col_name}</text>',
+        '</g>',
+    ])
+    return "\n".join([plan, sec_a, sec_b, title, leader])
 
-            <g transform="translate({N*sc/2 + 60}, 0)" font-family="Arial" font-size="13" font-weight="bold">
-                <line x1="0" y1="-150" x2="0" y2="{tp*sc + grout_h*sc}" stroke="black" stroke-width="1.2"/>
-                {tick(0,-150)} {tick(0,0)} {tick(0,tp*sc)} {tick(0,tp*sc + grout_h*sc)}
-                <text x="15" y="{tp*sc/2 + 5}" text-anchor="start" fill="#1e40af">PLATE: {int(tp)}</text>
-                <text x="15" y="{tp*sc + grout_h*sc/2 + 5}" text-anchor="start" fill="#64748b">GROUT: {int(grout_h)}</text>
-            </g>
-        </g>
-        
-        <g transform="translate(900, 1400)">
-            <rect width="360" height="400" fill="none" stroke="black" stroke-width="2"/>
-            <text x="15" y="45" font-family="sans-serif" font-weight="bold" font-size="24">FINAL SHOP DRAWING</text>
-            <line x1="0" y1="65" x2="360" y2="65" stroke="black" stroke-width="2"/>
-            <text x="15" y="110" font-family="monospace" font-size="18" font-weight="bold">● COL: {col_name}</text>
-            <text x="15" y="145" font-family="monospace" font-size="18" font-weight="bold">● PLATE: PL{int(tp)}x{int(B)}x{int(N)}</text>
-            <text x="15" y="180" font-family="monospace" font-size="18" font-weight="bold">● BOLT: 4-M{bolt_d}</text>
-            <rect x="0" y="320" width="360" height="80" fill="#1e293b"/>
-            <text x="180" y="372" text-anchor="middle" fill="white" font-family="sans-serif" font-weight="bold" font-size="28">APPROVED</text>
-        </g>
-        
-        <g transform="translate({ax}, {ay})">
-            <path d="M {-cb/4*sc} -80 L -250 -80" fill="none" stroke="red" stroke-width="2" marker-end="url(#arrow)"/>
-            <text x="-255" y="-75" text-anchor="end" fill="red" font-size="18" font-weight="bold">{col_name}</text>
-        </g>
+# ==========================================
+# 🖨️ 3. OUTPUT (cache ด้วย params)
+# ==========================================
+def drawing_params(col_name, clr_x, clr_y, tp, edge_x, edge_y, bolt_d, grout_h=50.0):
+    """params ของแบบจากขนาดเสา + ระยะ (ใช้ร่วมกันระหว่าง tab5 และ batch_export)"""
+    if col_name not in steel_db.SYS_H_BEAMS:  # get_properties จะ fallback เป็น H-400 (แบบผิดแต่ caption เป็นชื่อที่ขอ)
+        raise ValueError(f"Unknown column section '{col_name}' (not in steel_db.SYS_H_BEAMS)")
+    p = steel_db.SYS_H_BEAMS[col_name]
+    ch, cb, ctw, ctf = float(p['h']), float(p['b']), float(p['tw']), float(p['tf'])
+    sx, sy = cb + (2 * clr_x), ch - (2 * ctf) + (2 * clr_y)
+    B, N = sx + (2 * edge_x), sy + (2 * edge_y)
+    return {
+        'B': B, 'N': N, 'cb': cb, 'ch': ch, 'ctw': ctw, 'ctf': ctf,
+        'sx': sx, 'sy': sy, 'tp': tp, 'grout_h': grout_h,
+        'edge_x': edge_x, 'edge_y': edge_y, 'clr_x': clr_x, 'clr_y': clr_y,
+        'col_name': col_name, 'bolt_d': bolt_d
+    }
 
-        <defs>
-            <marker id="arrow" markerWidth="10" markerHeight="10" refX="0" refY="3" orient="auto" markerUnits="strokeWidth">
-                <path d="M0,0 L0,6 L9,3 z" fill="red" />
-            </marker>
-        </defs>
-    </svg>
-    """
+@shared_cache.memoize("baseplate_drawer.get_svg_drawing")
+def get_svg_drawing(params):
+    return STATIC_HEAD + _parametric_layer(params) + STATIC_TAIL
@@ -0,0 +1,236 @@
+# batch_export.py
+# Export shop drawing ทั้ง schedule (connection + base plate) เป็นไฟล์ SVG แบบ offline
+# - schedule = CSV / JSON ทีละแถว (1 แถว = 1 mark)
+# - geometry ซ้ำกันวาดครั้งเดียว (key = geometry hash) แล้วชี้ทุก mark ไปที่แบบเดียวกัน
+# - วาดแบบขนานด้วย ProcessPoolExecutor (throughput ตามจำนวน core)
+# - รวมแบบลงแผ่น (sheet) แบบ tile + index.json บอกว่า mark ไหนอยู่ไฟล์ / แผ่น / ช่องไหน
+#
+# ตัวอย่าง schedule (CSV):
+#   mark,kind,section,type,d,rows,cols,t,s_v,s_h,lv,leh,e1,setback,weld_size
+#   C1,connection,H-400x200x8x13,Fin Plate,20,4,1,10,70,0,35,35,40,10,6
+#   mark,kind,column,clr_x,clr_y,tp,edge_x,edge_y,bolt_d
+#   BP1,baseplate,H-300x150x6.5x9,50,60,25,50,50,20
+import csv
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import baseplate_drawer
+import drawing_utils as dw
+import shared_cache
+import steel_db
+
+KINDS = ("connection", "baseplate")
+VIEW_SIZE = 500          # px ต่อ view ของ connection (3 view ต่อแบบ)
+CAPTION_H = 40           # แถบชื่อ mark ใต้แต่ละ tile
+SHEET_GRID = {"connection": (1, 4), "baseplate": (3, 1)}  # (cols, rows) ต่อแผ่น
+
+# ค่า default ของ connection = ค่าเริ่มต้นใน connection_design UI
+CONNECTION_DEFAULTS = {
+    'type': "Fin Plate", 'd': 20, 'rows': 3, 'cols': 1, 't': 9.0, 's_v': 70.0, 's_h': 0.0,
+    'lv': 35.0, 'leh': 35.0, 'e1': 40.0, 'setback': 10.0, 'weld_size': 6.0,
+}
+BASEPLATE_DEFAULTS = {'clr_x': 50.0, 'clr_y': 60.0, 'tp': 25.0, 'edge_x': 50.0, 'edge_y': 50.0, 'bolt_d': 20}
+
+# คอลัมน์ชื่อ / id เก็บเป็น string เสมอ (mark "001" ต้องไม่กลายเป็น 1); report_export ใช้ iter_schedule ร่วมกัน
+TEXT_FIELDS = ("mark", "kind", "section", "column", "type", "grade", "bolt_grade", "plate_grade", "thread", "method", "mode")
+
+# ==========================================
+# 📥 1. SCHEDULE
+# ==========================================
+def _num(v):
+    if isinstance(v, str):
+        try:
+            f = float(v)
+        except ValueError:
+            return v
+        return int(f) if f.is_integer() and "." not in v else f
+    return v
+
+def _clean(row):
+    """แถวดิบ -> dict (ช่องว่างตัดทิ้ง, TEXT_FIELDS เป็น string, ที่เหลือแปลงเป็นตัวเลขถ้าได้)"""
+    return {k: str(v).strip() if k in TEXT_FIELDS else _num(v) for k, v in row.items() if v not in ("", None)}
+
+def iter_schedule(path):
+    """CSV หรือ JSON (list ของ dict) -> แถวทีละแถว (ค่าตัวเลขแปลงเป็น int / float); CSV อ่านแบบ stream"""
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            rows = json.load(f)
+        for r in rows:
+            yield _clean(r)
+        return
+    with open(path, newline="") as f:
+        for r in csv.DictReader(f):
+            yield _clean(r)
+
+def read_schedule(path):
+    """CSV หรือ JSON -> list ของแถว"""
+    return list(iter_schedule(path))
+
+def _catalog_name(row, field):
+    """ชื่อหน้าตัดต้องอยู่ใน catalog (steel_db.get_properties จะ fallback เป็น H-400 เงียบๆ)"""
+    name = row.get(field)
+    if name not in steel_db.SYS_H_BEAMS:
+        raise ValueError(f"Mark {row.get('mark', '?')}: unknown or missing {field} '{name}' (not in steel_db.SYS_H_BEAMS)")
+    return name
+
+def build_job(row):
+    """แถวของ schedule -> (geometry key, job) ; job คือ input ที่ worker ใช้วาด"""
+    kind = row.get('kind', 'connection')
+    if kind == "baseplate":
+        p = {**BASEPLATE_DEFAULTS, **row}
+        _catalog_name(p, 'column')
+        params = baseplate_drawer.drawing_params(p['column'], p['clr_x'], p['clr_y'], p['tp'],
+                                                 p['edge_x'], p['edge_y'], p['bolt_d'])
+        return shared_cache.make_key("baseplate", params), {'kind': kind, 'params': params}
+    if kind != "connection":
+        raise ValueError(f"Unknown kind '{kind}' for mark {row.get('mark')} (expected one of {KINDS})")
+
+    from connection_design import calculate_plate_geometry  # lazy: โมดูลนี้โหลด streamlit
+    p = {**CONNECTION_DEFAULTS, **row}
+    if "End" in p['type']:
+        p['cols'] = 2  # End plate = 2 แนว bolt เสมอ (เหมือน UI)
+    props = steel_db.SYS_H_BEAMS[_catalog_name(p, 'section')]
+    beam = {k: float(props[k]) for k in dw.BEAM_GEOM_KEYS}
+    inp = {k: p[k] for k in dw.INPUT_GEOM_KEYS}
+    plate = calculate_plate_geometry(p['type'], inp)
+    key = shared_cache.make_key("connection", dw.geometry_key(beam, plate, inp))
+    return key, {'kind': kind, 'beam': beam, 'plate': plate, 'inp': inp}
+
+# ==========================================
+# 🖨️ 2. RENDER (worker process)
+# ==========================================
+def _nest(svg, x, y, w, h):
+    """ย้าย SVG ทั้งไฟล์ไปวางเป็น tile (x, y, w, h) ในแผ่นใหญ่ (viewBox เดิมถูกเก็บไว้)"""
+    view_box = re.search(r'viewBox="([^"]+)"', svg).group(1)
+    return re.sub(r"^<svg[^>]*>", f'<svg x="{x}" y="{y}" width="{w}" height="{h}" viewBox="{view_box}">', svg.lstrip(), count=1)
+
+def render_job(job):
+    """job -> (svg, width, height) ; connection = 3 view เรียงแนวนอน"""
+    if job['kind'] == "baseplate":
+        svg = baseplate_drawer.get_svg_drawing(job['params'])
+        return svg, baseplate_drawer.CV_W, baseplate_drawer.CV_H
+    views = [dw.figure_to_svg(build(job['beam'], job['plate'], job['inp']), VIEW_SIZE) for build in dw.VIEWS.values()]
+    w, h = VIEW_SIZE * len(views), VIEW_SIZE
+    body = "\n".join(_nest(v, i * VIEW_SIZE, 0, VIEW_SIZE, VIEW_SIZE) for i, v in enumerate(views))
+    return f'<svg width="{w}" height="{h}" viewBox="0 0 {w} {h}" xmlns="http://www.w3.org/2000/svg">\n{body}\n</svg>', w, h
+
+# ==========================================
+# 🗂️ 3. SHEETS (tile หลายแบบต่อแผ่น)
+# ==========================================
+def _caption(marks, limit=8):
+    shown = html.escape(", ".join(marks[:limit]))
+    return f"{shown} (+{len(marks) - limit} more)" if len(marks) > limit else shown
+
+def tile_sheets(drawings, tile_w, tile_h, cols, rows):
+    """drawings = [(svg, caption)] -> [(sheet svg, [(index, tile)])] ; scale แบบให้พอดี tile"""
+    per_sheet = cols * rows
+    sheets = []
+    for start in range(0, len(drawings), per_sheet):
+        batch = drawings[start:start + per_sheet]
+        W, H = cols * tile_w, rows * (tile_h + CAPTION_H)
+        parts = [f'<svg width="{W}" height="{H}" viewBox="0 0 {W} {H}" xmlns="http://www.w3.org/2000/svg">',
+                 f'<rect width="{W}" height="{H}" fill="white"/>']
+        placed = []
+        for i, (svg, caption) in enumerate(batch):
+            c, r = i % cols, i // cols
+            x, y = c * tile_w, r * (tile_h + CAPTION_H)
+            parts.append(_nest(svg, x, y, tile_w, tile_h))
+            parts.append(f'<rect x="{x}" y="{y}" width="{tile_w}" height="{tile_h + CAPTION_H}" fill="none" stroke="black" stroke-width="2"/>')
+            parts.append(f'<text x="{x + 12}" y="{y + tile_h + CAPTION_H * 0.7}" font-family="monospace" font-size="20" font-weight="bold">{caption}</text>')
+            placed.append((start + i, i))
+        parts.append("</svg>")
+        sheets.append(("\n".join(parts), placed))
+    return sheets
+
+# ==========================================
+# 🚀 4. EXPORT
+# ==========================================
+def export_schedule(rows, out_dir, workers=None, progress=None):
+    """
+    วาดทุก geometry ที่ไม่ซ้ำกันแบบขนาน -> out_dir/drawings/*.svg, out_dir/sheets/*.svg, out_dir/index.json
+    workers=1 วาดใน process นี้ (ไม่เปิด pool)
+    """
+    groups = {}  # key -> {'job', 'marks'} (ลำดับตามที่เจอใน schedule)
+    seen = set()
+    for i, row in enumerate(rows):
+        mark = str(row.get('mark', f"#{i + 1}"))
+        if mark in seen:  # index['marks'] ชี้ mark -> ไฟล์: mark ซ้ำจะทับกันเงียบๆ
+            raise ValueError(f"Duplicate mark '{mark}' in schedule (row {i + 1})")
+        seen.add(mark)
+        key, job = build_job(row)
+        groups.setdefault(key, {'job': job, 'marks': []})['marks'].append(mark)
+    keys = list(groups)
+    jobs = [groups[k]['job'] for k in keys]
+
+    os.makedirs(os.path.join(out_dir, "drawings"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "sheets"), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        rendered = map(render_job, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        rendered = pool.map(render_job, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+
+    drawings = []
+    try:
+        for n, (key, (svg, w, h)) in enumerate(zip(keys, rendered), 1):
+            g = groups[key]
+            fname = f"{g['job']['kind']}_{key[:12]}.svg"
+            with open(os.path.join(out_dir, "drawings", fname), "w") as f:
+                f.write(svg)
+            drawings.append({'key': key, 'kind': g['job']['kind'], 'marks': g['marks'], 'file': f"drawings/{fname}",
+                             'width': w, 'height': h, 'svg': svg})
+            if progress:
+                progress(n, len(jobs))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    sheet_files = []
+    for kind in KINDS:
+        items = [d for d in drawings if d['kind'] == kind]
+        if not items:
+            continue
+        cols, rows_ = SHEET_GRID[kind]
+        captions = [(d['svg'], _caption(d['marks'])) for d in items]
+        for s, (sheet_svg, placed) in enumerate(tile_sheets(captions, items[0]['width'], items[0]['height'], cols, rows_), 1):
+            fname = f"sheets/{kind}_{s:03d}.svg"
+            with open(os.path.join(out_dir, fname), "w") as f:
+                f.write(sheet_svg)
+            sheet_files.append(fname)
+            for idx, tile in placed:
+                items[idx]['sheet'], items[idx]['tile'] = fname, tile
+
+    index = {
+        'n_marks': len(rows),
+        'n_drawings': len(drawings),
+        'sheets': sheet_files,
+        'drawings': [{k: v for k, v in d.items() if k != 'svg'} for d in drawings],
+        'marks': {m: d['file'] for d in drawings for m in d['marks']},
+    }
+    with open(os.path.join(out_dir, "index.json"), "w") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+# ==========================================
+# 🖥️ 5. COMMAND LINE
+# ==========================================
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser(description="Export shop drawings for a connection / base plate schedule.")
+    ap.add_argument("schedule", help="CSV or JSON schedule (one row per mark)")
+    ap.add_argument("out_dir")
+    ap.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    idx = export_schedule(read_schedule(args.schedule), args.out_dir, args.workers,
+                          progress=lambda n, total: print(f"\r{n}/{total} drawings", end="", flush=True))
+    print(f"\n{idx['n_marks']} marks -> {idx['n_drawings']} unique drawings on {len(idx['sheets'])} sheets "
+          f"({time.time() - t0:.1f} s)")
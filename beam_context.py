@@ -0,0 +1,109 @@
+# beam_context.py
+# ผลการคำนวณคานที่ทุกหน้า (pages) ใช้ร่วมกัน
+# cache ด้วย input ของ sidebar (shared_cache: ใช้ร่วมกันทุก session) สลับหน้าไปมาไม่ต้องคำนวณซ้ำ
+import section_properties
+import beam_engine
+import shared_cache
+
+
+@shared_cache.memoize("beam_context.compute_beam")
+def compute_beam(inputs):
+    """
+    inputs (dict): is_check_mode, is_lrfd, Fy, E, sec_name, h, b, tw, tf, b_bot, tf_bot, r,
+                   user_span, Lb, defl_denom, w_load, p_load
+    คืนค่า results_context (dict ที่ tab modules ใช้; แชร์ข้าม session ห้ามแก้ไข)
+    """
+    h, b, tw, tf = inputs['h'], inputs['b'], inputs['tw'], inputs['tf']
+    user_span, Lb, Fy, E = inputs['user_span'], inputs['Lb'], inputs['Fy'], inputs['E']
+    is_check_mode, is_lrfd = inputs['is_check_mode'], inputs['is_lrfd']
+    w_load, p_load = inputs['w_load'], inputs['p_load']
+
+    # Plate-assembly engine (fillets, monosymmetric PNA) cached by geometry hash
+    sec_props = section_properties.get_i_section(h, b, tw, tf, inputs['r'], inputs['b_bot'], inputs['tf_bot'])
+    Aw = (h / 10) * (tw / 10)
+
+    res = beam_engine.evaluate_one(
+        dict(sec_props, Aw=Aw), Fy, user_span, Lb, is_lrfd, inputs['defl_denom'],
+        w_load, p_load, check_mode=is_check_mode, E=E, Cb=beam_engine.CB_DEFAULT,
+    )
+
+    return {
+        'is_check_mode': is_check_mode,
+        'method_str': res['method_str'],
+        'is_lrfd': is_lrfd,
+        'sec_name': inputs['sec_name'],
+        'user_span': user_span,
+        'Lb': Lb,
+        'Lb_cm': Lb * 100,
+        'Fy': Fy,
+        'E': E,
+        'w_load': w_load,
+        'p_load': p_load,
+        'fact_w': res['fact_w'],
+        'fact_p': res['fact_p'],
+        'V_cap': res['V_cap'],
+        'M_cap': res['M_cap'],
+        'vn': res['V_cap'],  # Map for Report
+        'mn': res['M_cap'],  # Map for Report
+        'v_act': res['v_act'],
+        'm_act': res['m_act'],
+        'ratio_v': res['ratio_v'],
+        'ratio_m': res['ratio_m'],
+        'ratio_d': res['ratio_d'],
+        'gov_ratio': res['gov_ratio'],
+        'gov_cause': res['gov_cause'],
+        'w_safe': res['w_safe'],
+        'd_act': res['d_act'],
+        'd_allow': res['d_allow'],
+        'defl_act': res['d_act'],  # Map for Report
+        'defl_all': res['d_allow'],  # Map for Report
+        'defl_denom': inputs['defl_denom'],
+        'Aw': Aw,
+        'Ix': sec_props['Ix'],
+        'Sx': sec_props['Sx'],
+        'Zx': sec_props['Zx'],
+        'Mp': res['Mp'],
+        'Cb': beam_engine.CB_DEFAULT,
+        'r_ts': sec_props['r_ts'],
+        'val_A': res['val_A'],
+        'Lp_cm': res['Lp_cm'],
+        'Lr_cm': res['Lr_cm'],
+        'ltb_zone': res['ltb_zone'],
+        'Mn': res['Mn'],
+        'ry': sec_props['ry'],
+        'J': sec_props['J'],
+        'h0': sec_props['h0'],
+        'h': h,  # Adding raw dimensions
+        'b': b,
+        'tw': tw,
+        'tf': tf,
+    }
+
+
+class DesignSummary:
+    """
+    สรุปผลแบบ compact สำหรับเก็บใน session (แทน dict ซ้อน dict ต่อ session)
+    อ่านแบบ dict ได้เหมือน res_dict เดิม: summary['v_cap'], summary['ltb_info']['Zone']
+    """
+    __slots__ = ('w_safe', 'cause', 'v_cap', 'v_act', 'm_cap', 'm_act', 'mn_raw',
+                 'd_all', 'd_act', 'v_conn_design', 'Lp', 'Lr', 'Lb', 'Zone', 'Cb')
+
+    def __init__(self, rc, v_conn_design):
+        self.w_safe, self.cause = rc['w_safe'], rc['gov_cause']
+        self.v_cap, self.v_act = rc['V_cap'], rc['v_act']
+        self.m_cap, self.m_act, self.mn_raw = rc['M_cap'], rc['m_act'], rc['Mn']
+        self.d_all, self.d_act = rc['d_allow'], rc['d_act']
+        self.v_conn_design = v_conn_design
+        self.Lp, self.Lr, self.Lb = rc['Lp_cm'], rc['Lr_cm'], rc['Lb_cm']
+        self.Zone, self.Cb = rc['ltb_zone'], rc['Cb']
+
+    def __getitem__(self, key):
+        if key == 'ltb_info':
+            return {k: getattr(self, k) for k in ('Lp', 'Lr', 'Lb', 'Zone', 'Cb')}
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except AttributeError:
+            return default
@@ -0,0 +1,203 @@
+# beam_engine.py
+# Beam design engine (AISC 360 F2 / G2) แบบ vectorized
+# ใช้ร่วมกันทั้ง UI (ค่าเดียว) และ batch sweep (หลายล้านแถว ทีละ chunk)
+#
+# หน่วย: kg, cm (span / Lb รับเป็น m), moment capacity คืนเป็น kg-m เหมือน app.py
+import numpy as np
+
+import steel_db
+import section_properties
+
+E_STEEL = 2.04e6   # ksc
+CB_DEFAULT = 1.0   # conservative
+LRFD_W_FACTOR = 1.2
+LRFD_P_FACTOR = 1.6
+LRFD_DEFL_FACTOR = 1.4  # service -> factored (capacity mode)
+
+LTB_ZONES = ("Zone 1 (Plastic)", "Zone 2 (Inelastic)", "Zone 3 (Elastic)")
+CHECK_CAUSES = ("Shear Strength", "Flexural Strength (LTB)", "Deflection Serviceability")
+CAPACITY_CAUSES = ("Shear Control", "Flexural Control", "Deflection Control")
+
+# ==========================================
+# 🧮 1. CORE LOGIC (ARRAYS IN, ARRAYS OUT)
+# ==========================================
+def ltb_capacity(Fy, Zx, Sx, ry, J, h0, r_ts, Lb_cm, E=E_STEEL, Cb=CB_DEFAULT):
+    """Lp, Lr, Mn และโซน LTB (0/1/2 = Plastic/Inelastic/Elastic) ตาม AISC F2"""
+    Fy, Lb_cm = np.asarray(Fy, dtype=float), np.asarray(Lb_cm, dtype=float)
+    Lp_cm = 1.76 * ry * np.sqrt(E / Fy)
+    val_A = J / (Sx * h0)
+    val_B = 6.76 * ((0.7 * Fy) / E) ** 2
+    Lr_cm = 1.95 * r_ts * (E / (0.7 * Fy)) * np.sqrt(val_A + np.sqrt(val_A**2 + val_B))
+
+    Mp = Fy * Zx
+    # Inelastic LTB
+    frac = (Lb_cm - Lp_cm) / (Lr_cm - Lp_cm)
+    Mn_inel = np.minimum(Cb * (Mp - (Mp - 0.7 * Fy * Sx) * frac), Mp)
+    # Elastic LTB (Lb = 0 อยู่ในโซน 1 เสมอ จึงกันการหารศูนย์ไว้เฉยๆ)
+    slend = Lb_cm / r_ts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Fcr = (Cb * np.pi**2 * E) / slend**2 * np.sqrt(1 + 0.078 * val_A * slend**2)
+    Mn_el = np.minimum(Fcr * Sx, Mp)
+
+    zone = np.where(Lb_cm <= Lp_cm, 0, np.where(Lb_cm <= Lr_cm, 1, 2))
+    Mn = np.where(zone == 0, Mp, np.where(zone == 1, Mn_inel, Mn_el))
+    return {'Lp_cm': Lp_cm, 'Lr_cm': Lr_cm, 'val_A': val_A, 'Mp': Mp, 'Mn': Mn, 'zone': zone}
+
+def design_strength(Fy, Aw, Mn, is_lrfd):
+    """V_cap (kg) และ M_cap (kg-m): LRFD φv = 1.00, φb = 0.90 | ASD Ωv = 1.50, Ωb = 1.67"""
+    is_lrfd = np.asarray(is_lrfd, dtype=bool)
+    Vn = 0.60 * np.asarray(Fy, dtype=float) * Aw
+    V_cap = np.where(is_lrfd, 1.00 * Vn, Vn / 1.50)
+    M_cap = np.where(is_lrfd, 0.90 * Mn, Mn / 1.67) / 100
+    return V_cap, M_cap
+
+def evaluate(props, Fy, span_m, Lb_m, is_lrfd, defl_denom=360, w_load=0.0, p_load=0.0,
+             check_mode=True, E=E_STEEL, Cb=CB_DEFAULT):
+    """
+    ประเมินคานช่วงเดียว (simply supported) ทุกพารามิเตอร์ broadcast กันได้
+    props: dict จาก section_properties (cm units) + 'Aw' (cm²)
+    check_mode=True  -> ratio ของโหลดที่ให้ (w_load/p_load เป็น service load)
+    check_mode=False -> หา w_safe (โหลดแผ่สม่ำเสมอสูงสุด)
+    คืนค่า dict ของ array; gov = index ใน CHECK_CAUSES / CAPACITY_CAUSES
+    """
+    span_m = np.asarray(span_m, dtype=float)
+    is_lrfd = np.asarray(is_lrfd, dtype=bool)
+    L_cm = span_m * 100
+    Ix = props['Ix']
+
+    ltb = ltb_capacity(Fy, props['Zx'], props['Sx'], props['ry'], props['J'], props['h0'],
+                       props['r_ts'], np.asarray(Lb_m, dtype=float) * 100, E, Cb)
+    V_cap, M_cap = design_strength(Fy, props['Aw'], ltb['Mn'], is_lrfd)
+    d_allow = L_cm / defl_denom
+    span_div = np.where(span_m > 0, span_m, 1.0)
+
+    w_load, p_load = np.asarray(w_load, dtype=float), np.asarray(p_load, dtype=float)
+    fact_w = np.where(is_lrfd, LRFD_W_FACTOR * w_load, w_load)  # Note: Using 1.2/1.6 simplified for tool
+    fact_p = np.where(is_lrfd, LRFD_P_FACTOR * p_load, p_load)
+
+    if check_mode:
+        v_act = fact_w * span_m / 2 + fact_p / 2
+        m_act = fact_w * span_m**2 / 8 + fact_p * span_m / 4
+        # Service deflection (No load factors)
+        d_act = (5 * (w_load / 100) * L_cm**4) / (384 * E * Ix) + (p_load * L_cm**3) / (48 * E * Ix)
+        ratio_v, ratio_m, ratio_d = v_act / V_cap, m_act / M_cap, d_act / d_allow
+        stack = np.stack(np.broadcast_arrays(ratio_v, ratio_m, ratio_d))
+        gov = stack.argmax(0)  # เท่ากัน -> shear, moment, deflection ตามลำดับ
+        gov_ratio = stack.max(0)
+        w_safe = np.zeros_like(gov_ratio)
+    else:
+        w_safe_moment = 8 * M_cap / span_div**2
+        w_safe_shear = 2 * V_cap / span_div
+        w_serv_defl = (384 * E * Ix * d_allow) / (5 * L_cm**4) * 100
+        w_safe_defl = np.where(is_lrfd, w_serv_defl * LRFD_DEFL_FACTOR, w_serv_defl)
+
+        stack = np.stack(np.broadcast_arrays(w_safe_shear, w_safe_moment, w_safe_defl))
+        gov = stack.argmin(0)
+        w_safe = stack.min(0)
+        v_act = w_safe * span_m / 2
+        m_act = w_safe * span_m**2 / 8
+        ratio_v, ratio_m, ratio_d = w_safe / w_safe_shear, w_safe / w_safe_moment, w_safe / w_safe_defl
+        w_safe_service = np.where(is_lrfd, w_safe / LRFD_DEFL_FACTOR, w_safe)
+        d_act = (5 * (w_safe_service / 100) * L_cm**4) / (384 * E * Ix)
+        gov_ratio = np.ones_like(w_safe)
+
+    out = dict(ltb)
+    out.update({
+        'V_cap': V_cap, 'M_cap': M_cap, 'fact_w': fact_w, 'fact_p': fact_p,
+        'v_act': v_act, 'm_act': m_act, 'd_act': d_act, 'd_allow': d_allow,
+        'ratio_v': ratio_v, 'ratio_m': ratio_m, 'ratio_d': ratio_d,
+        'gov_ratio': gov_ratio, 'gov': gov, 'w_safe': w_safe,
+    })
+    return out
+
+def evaluate_one(props, Fy, span_m, Lb_m, is_lrfd, defl_denom=360, w_load=0.0, p_load=0.0,
+                 check_mode=True, E=E_STEEL, Cb=CB_DEFAULT):
+    """Scalar wrapper สำหรับ UI: คืนค่า float + label (ltb_zone, gov_cause, method_str)"""
+    res = evaluate(props, Fy, span_m, Lb_m, is_lrfd, defl_denom, w_load, p_load, check_mode, E, Cb)
+    out = {k: np.asarray(v).item() for k, v in res.items()}
+    out['ltb_zone'] = LTB_ZONES[out['zone']]
+    out['gov_cause'] = (CHECK_CAUSES if check_mode else CAPACITY_CAUSES)[out['gov']]
+    out['method_str'] = "LRFD" if is_lrfd else "ASD"
+    return out
+
+# ==========================================
+# 📚 2. CATALOG ARRAYS
+# ==========================================
+_CATALOG = None
+
+def catalog_arrays():
+    """ชื่อหน้าตัด + คุณสมบัติของทั้ง catalog เป็น array (คำนวณครั้งเดียว)"""
+    global _CATALOG
+    if _CATALOG is None:
+        names = list(steel_db.SYS_H_BEAMS.keys())
+        dims = {k: np.array([float(steel_db.SYS_H_BEAMS[n].get(k, 0.0)) for n in names])
+                for k in ("h", "b", "tw", "tf", "r")}
+        props = section_properties.i_section_properties(
+            dims['b'], dims['tf'], dims['h'] - 2 * dims['tf'], dims['tw'], r=dims['r'])
+        props['Aw'] = dims['h'] / 10 * dims['tw'] / 10
+        props.update(dims)
+        _CATALOG = (names, props)
+    return _CATALOG
+
+# ==========================================
+# 🌊 3. STREAMING PARAMETER SWEEP
+# ==========================================
+SWEEP_AXES = ("section", "grade", "method", "span", "lb_ratio", "load_pct")
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+def sweep_size(grades, spans, lb_ratios, load_pcts, methods=(True, False), sections=None):
+    names, _ = catalog_arrays()
+    n_sec = len(names) if sections is None else len(sections)
+    return n_sec * len(grades) * len(methods) * len(spans) * len(lb_ratios) * len(load_pcts)
+
+def iter_sweep(grades, spans, lb_ratios, load_pcts, methods=(True, False), sections=None,
+               defl_denom=360, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Sweep section × grade × method × span × Lb/L × load % แบบ generator
+    ทีละ chunk_rows แถว (หน่วยความจำสูงสุดขึ้นกับขนาด chunk ไม่ใช่ขนาด sweep)
+
+    load % = โหลดแผ่สม่ำเสมอที่ทำให้เกิดแรงเฉือน = load% ของ V_cap (แบบ report_analytics)
+    แล้วตรวจ moment / deflection ด้วยโหลดนั้น (check mode)
+    yield dict ของ column array (id เป็น int, ค่าเป็น float32)
+    """
+    names, cat = catalog_arrays()
+    sec_ids = np.arange(len(names)) if sections is None else np.array([names.index(s) for s in sections])
+    axes = [sec_ids, np.asarray(grades, dtype=float), np.asarray(methods, dtype=bool),
+            np.asarray(spans, dtype=float), np.asarray(lb_ratios, dtype=float),
+            np.asarray(load_pcts, dtype=float)]
+    shape = tuple(len(a) for a in axes)
+    total = int(np.prod(shape))
+
+    for start in range(0, total, chunk_rows):
+        flat = np.arange(start, min(start + chunk_rows, total))
+        i_sec, i_fy, i_m, i_L, i_lb, i_pct = np.unravel_index(flat, shape)
+        sec = axes[0][i_sec]
+        Fy, lrfd, span, lb_ratio, pct = axes[1][i_fy], axes[2][i_m], axes[3][i_L], axes[4][i_lb], axes[5][i_pct]
+        props = {k: v[sec] for k, v in cat.items()}
+
+        # แปลง load % -> service uniform load
+        ltb = ltb_capacity(Fy, props['Zx'], props['Sx'], props['ry'], props['J'], props['h0'],
+                           props['r_ts'], span * lb_ratio * 100)
+        V_cap, _ = design_strength(Fy, props['Aw'], ltb['Mn'], lrfd)
+        w_fact = 2 * (pct / 100) * V_cap / span
+        w_service = np.where(lrfd, w_fact / LRFD_W_FACTOR, w_fact)
+
+        res = evaluate(props, Fy, span, span * lb_ratio, lrfd, defl_denom, w_service, 0.0, True)
+        yield {
+            'section_id': sec.astype(np.int32),
+            'Fy': Fy.astype(np.float32),
+            'is_lrfd': lrfd.astype(np.int8),
+            'span_m': span.astype(np.float32),
+            'lb_ratio': lb_ratio.astype(np.float32),
+            'load_pct': pct.astype(np.float32),
+            'w_load': w_service.astype(np.float32),
+            'Mn': res['Mn'].astype(np.float32),
+            'M_cap': res['M_cap'].astype(np.float32),
+            'V_cap': res['V_cap'].astype(np.float32),
+            'ratio_v': res['ratio_v'].astype(np.float32),
+            'ratio_m': res['ratio_m'].astype(np.float32),
+            'ratio_d': res['ratio_d'].astype(np.float32),
+            'gov_ratio': res['gov_ratio'].astype(np.float32),
+            'gov': res['gov'].astype(np.int8),
+            'ltb_zone': res['zone'].astype(np.int8),
+        }
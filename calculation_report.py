@@ -1,321 +1,495 @@
-import math
+# calculation_report.py
+# Calculation note ของ connection (AISC 360-16) จาก trace ของ connection_design.connection_trace
+# - จัดรูปแบบอย่างเดียว ไม่คำนวณกำลังซ้ำ (ตัวเลขชุดเดียวกับตาราง Design Summary)
+# - แยกเป็น section: แต่ละ section อ่านเฉพาะ key ของ trace ที่ประกาศไว้ใน SECTIONS
+#   และ cache markdown ใน shared_cache ด้วยค่าชุดนั้น (input เดิม = ไม่สร้าง string ใหม่)
+import shared_cache
 
-def generate_report(V_load, T_load, beam, plate, bolts, cope, is_lrfd, material_grade, bolt_grade):
-    """
-    Generate Calculation Report - MAXIMUM SPACING EDITION
-    Standard: AISC 360-16
-    Layout: Aggressive line breaks for readability.
-    """
-    
-    # --- 1. SETUP CONSTANTS ---
-    method = "LRFD" if is_lrfd else "ASD"
-    
-    if is_lrfd:
-        phi_y, phi_r, phi_b, phi_w = 0.90, 0.75, 0.75, 0.75
-        cap_lab = "Design Strength (\\phi R_n)"
+# ==========================================
+# 🧩 1. HELPERS
+# ==========================================
+def _cap_label(v):
+    return "Design Strength (\\phi R_n)" if v['is_lrfd'] else "Allowable Strength (R_n/\\Omega)"
+
+def _check(v, Rn_kN, fac, cap, demand):
+    """Check block: capacity (φRn หรือ Rn/Ω) + ratio"""
+    if v['is_lrfd']:
+        eq = f"\\phi R_n = {fac:.2f} \\times {Rn_kN:.2f}"
     else:
-        om_y, om_r, om_b, om_w = 1.67, 2.00, 2.00, 2.00
-        cap_lab = "Allowable Strength (R_n/\\Omega)"
-
-    # --- 2. PRE-CALC GEOMETRY ---
-    d_bolt = bolts['d']
-    d_hole = d_bolt + 2.0 
-    rows = bolts['rows']
-    cols = bolts['cols']
-    n_bolts = rows * cols
-    
-    t_plt = plate['t']
-    Fy = plate['Fy']
-    Fu = plate['Fu']
-    h_plate = plate['h']
-    
-    # --- HELPER: CHECK BLOCK ---
-    def render_check(Rn_kN, mode, demand):
-        if is_lrfd:
-            fac = phi_y if mode == 'yield' else (phi_b if mode == 'bolt' else (phi_w if mode == 'weld' else phi_r))
-            cap = Rn_kN * fac
-            eq = f"\\phi R_n = {fac:.2f} \\times {Rn_kN:.2f}"
-        else:
-            om = om_y if mode == 'yield' else (om_b if mode == 'bolt' else (om_w if mode == 'weld' else om_r))
-            cap = Rn_kN / om
-            eq = f"R_n / \\Omega = {Rn_kN:.2f} / {om:.2f}"
-            
-        ratio = demand / cap if cap > 0 else 999
-        res = "✅ OK" if ratio <= 1.0 else "❌ FAIL"
-        
-        blk = []
-        blk.append(f"> **Check:**")
-        blk.append(f"> $$ {cap_lab} = {eq} = \\mathbf{{{cap:.2f} \\text{{ kN}}}} $$")
-        blk.append(">") # Empty line in quote
-        blk.append(f"> $$ \\text{{Ratio}} = \\frac{{{demand:.2f}}}{{{cap:.2f}}} = \\mathbf{{{ratio:.2f}}} \\quad [{res}] $$")
-        return "\n".join(blk)
+        eq = f"R_n / \\Omega = {Rn_kN:.2f} / {1 / fac:.2f}"
+
+    ratio = demand / cap if cap > 0 else 999
+    res = "✅ OK" if ratio <= 1.0 else "❌ FAIL"
+
+    blk = []
+    blk.append(f"> **Check:**")
+    blk.append(f"> $$ {_cap_label(v)} = {eq} = \\mathbf{{{cap:.2f} \\text{{ kN}}}} $$")
+    blk.append(">") # Empty line in quote
+    blk.append(f"> $$ \\text{{Ratio}} = \\frac{{{demand:.2f}}}{{{cap:.2f}}} = \\mathbf{{{ratio:.2f}}} \\quad [{res}] $$")
+    return "\n".join(blk)
 
+# ==========================================
+# 📄 2. SECTIONS (v = ค่าจาก trace เฉพาะ key ที่ประกาศ)
+# ==========================================
+def _header(v):
     lines = []
-    
-    # =================================================
-    # HEADER
-    # =================================================
-    lines.append(f"# 🏗️ CONNECTION REPORT ({method})")
+    lines.append(f"# 🏗️ CONNECTION REPORT ({v['method']})")
     lines.append("---")
     lines.append(f"**Input Data:**")
     lines.append(f"")
-    lines.append(f"- **Load ($V_u$):** {V_load:.2f} kN")
+    lines.append(f"- **Load ($V_u$):** {v['V']:.2f} kN")
     lines.append(f"")
-    lines.append(f"- **Plate:** {material_grade} ($t={t_plt}$ mm)")
+    if v['T'] > 0:
+        lines.append(f"- **Tension ($T_u$):** {v['T']:.2f} kN")
+        lines.append(f"")
+    lines.append(f"- **Plate:** {v['material_grade']} ($t={v['t']:g}$ mm)")
     lines.append(f"")
-    lines.append(f"- **Bolts:** {n_bolts} x M{d_bolt} (Grade {bolt_grade})")
-    lines.append("---")
-    lines.append("")
+    lines.append(f"- **Bolts:** {v['n_bolts']} x M{v['d']:g} (Grade {v['bolt_grade']})")
+    return "\n".join(lines)
 
-    # =================================================
-    # 1. BOLT SHEAR
-    # =================================================
-    lines.append("### 1. Bolt Shear Strength")
+def _bolt_shear(v):
+    lines = []
     lines.append("*Ref: AISC J3.6*")
     lines.append("")
-    
-    Ab = math.pi * d_bolt**2 / 4
-    Fnv = bolts['Fnv']
-    Rn_shear = (Fnv * Ab * n_bolts) / 1000.0
-    
+
     lines.append("**Formula:**")
     lines.append("$$ R_n = F_{nv} \\times A_b \\times N_{bolts} $$")
     lines.append("")
-    
+
     lines.append("**Substitution:**")
-    lines.append(f"$$ R_n = {Fnv} \\times {Ab:.1f} \\times {n_bolts} $$")
+    lines.append(f"$$ R_n = {v['Fnv']:g} \\times {v['Ab']:.1f} \\times {v['n_bolts']} $$")
     lines.append("")
-    
+
     lines.append("**Result:**")
-    lines.append(f"$$ R_n = {Rn_shear:.2f} \\text{{ kN}} $$")
-    lines.append("")
-    
-    lines.append(render_check(Rn_shear, 'bolt', V_load))
-    lines.append("---")
+    lines.append(f"$$ R_n = {v['shear_rn']:.2f} \\text{{ kN}} $$")
     lines.append("")
 
-    # =================================================
-    # 2. BOLT BEARING
-    # =================================================
-    lines.append("### 2. Bolt Bearing")
+    lines.append(_check(v, v['shear_rn'], v['phi_b'], v['shear_cap'], v['V']))
+    return "\n".join(lines)
+
+def _bearing(v):
+    lines = []
     lines.append("*Ref: AISC J3.10*")
     lines.append("")
 
-    lc_edge = plate['lv'] - (d_hole / 2.0)
-    lc_inner = bolts['s_v'] - d_hole
-    max_bear = 2.4 * d_bolt * t_plt * Fu
-    
-    # --- Edge ---
-    lines.append(f"**(a) Edge Bolts ($l_c = {lc_edge:.1f}$ mm):**")
-    lines.append("")
-    lines.append("$$ r_n = 1.2 l_c t F_u $$")
-    lines.append("")
-    
-    rn_edge_val = 1.2 * lc_edge * t_plt * Fu
-    lines.append(f"$$ = 1.2 ({lc_edge:.1f}) ({t_plt}) ({Fu}) $$")
-    lines.append("")
-    lines.append(f"$$ = {rn_edge_val/1000:.2f} \\text{{ kN}} $$")
-    lines.append("")
-    
-    rn_edge = min(rn_edge_val, max_bear)
-    lines.append(f"Limited to $2.4 d t F_u = {max_bear/1000:.2f}$ kN")
-    lines.append(f"$\\rightarrow \\mathbf{{r_{{n,edge}} = {rn_edge/1000:.2f} \\text{{ kN}}}}$")
-    lines.append("")
-    
-    # --- Inner ---
-    rn_inner = 0
-    if rows > 1:
-        lines.append(f"**(b) Inner Bolts ($l_c = {lc_inner:.1f}$ mm):**")
+    t_plt, Fu, phi_r = v['t'], v['Fu'], v['phi_r']
+    cases = [("(a) Edge Bolts", v['lc_edge'], "edge", v['rn_edge'])]
+    if v['rows'] > 1:
+        cases.append(("(b) Inner Bolts", v['lc_inner'], "in", v['rn_inner']))
+
+    for label, lc, sub, rn in cases:
+        lines.append(f"**{label} ($l_c = {lc:.1f}$ mm):**")
         lines.append("")
         lines.append("$$ r_n = 1.2 l_c t F_u $$")
         lines.append("")
-        
-        rn_inner_val = 1.2 * lc_inner * t_plt * Fu
-        lines.append(f"$$ = 1.2 ({lc_inner:.1f}) ({t_plt}) ({Fu}) $$")
+
+        lines.append(f"$$ = 1.2 ({lc:.1f}) ({t_plt:g}) ({Fu:g}) $$")
         lines.append("")
-        lines.append(f"$$ = {rn_inner_val/1000:.2f} \\text{{ kN}} $$")
+        lines.append(f"$$ = {1.2 * lc * t_plt * Fu / 1000:.2f} \\text{{ kN}} $$")
         lines.append("")
-        
-        rn_inner = min(rn_inner_val, max_bear)
-        lines.append(f"Limited to $2.4 d t F_u = {max_bear/1000:.2f}$ kN")
-        lines.append(f"$\\rightarrow \\mathbf{{r_{{n,in}} = {rn_inner/1000:.2f} \\text{{ kN}}}}$")
+
+        lines.append(f"Limited to $2.4 d t F_u = {v['bear_max_rn']:.2f}$ kN")
+        lines.append(f"$\\rightarrow \\mathbf{{r_{{n,{sub}}} = {rn / phi_r:.2f} \\text{{ kN}}}}$")
         lines.append("")
 
     # --- Total ---
-    Rn_bearing = ((rn_edge * cols) + (rn_inner * (rows - 1) * cols)) / 1000.0
     lines.append("**Total Nominal Strength:**")
     lines.append("")
-    lines.append(f"$$ R_n = \\Sigma r_n = {Rn_bearing:.2f} \\text{{ kN}} $$")
-    lines.append("")
-    
-    lines.append(render_check(Rn_bearing, 'rupture', V_load))
-    lines.append("---")
+    lines.append(f"$$ R_n = \\Sigma r_n = {v['bearing_rn']:.2f} \\text{{ kN}} $$")
     lines.append("")
 
-    # =================================================
-    # 3. YIELDING
-    # =================================================
-    lines.append("### 3. Plate Shear Yielding")
+    lines.append(_check(v, v['bearing_rn'], phi_r, v['bearing_cap'], v['V']))
+    return "\n".join(lines)
+
+def _yielding(v):
+    lines = []
     lines.append("*Ref: AISC J4.2(a)*")
     lines.append("")
-    
-    Ag = h_plate * t_plt
-    Rn_yield = 0.60 * Fy * Ag / 1000.0
-    
+
     lines.append("**Formula:**")
     lines.append("$$ R_n = 0.60 F_y A_g $$")
     lines.append("")
-    
+
     lines.append("**Substitution:**")
-    lines.append(f"$$ R_n = 0.60 ({Fy}) ({Ag:.0f}) $$")
+    lines.append(f"$$ R_n = 0.60 ({v['Fy']:g}) ({v['Agv']:.0f}) $$")
     lines.append("")
-    
+
     lines.append("**Result:**")
-    lines.append(f"$$ R_n = {Rn_yield:.2f} \\text{{ kN}} $$")
-    lines.append("")
-    
-    lines.append(render_check(Rn_yield, 'yield', V_load))
-    lines.append("---")
+    lines.append(f"$$ R_n = {v['yield_rn']:.2f} \\text{{ kN}} $$")
     lines.append("")
 
-    # =================================================
-    # 4. RUPTURE
-    # =================================================
-    lines.append("### 4. Plate Shear Rupture")
+    lines.append(_check(v, v['yield_rn'], v['phi_y'], v['yield_cap'], v['V']))
+    return "\n".join(lines)
+
+def _rupture(v):
+    lines = []
     lines.append("*Ref: AISC J4.2(b)*")
     lines.append("")
-    
-    Anv = (h_plate - (rows * d_hole)) * t_plt
-    Rn_rup = 0.60 * Fu * Anv / 1000.0
-    
+
     lines.append("**Formula:**")
     lines.append("$$ R_n = 0.60 F_u A_{nv} $$")
     lines.append("")
-    
+
     lines.append("**Substitution:**")
-    lines.append(f"$$ R_n = 0.60 ({Fu}) ({Anv:.0f}) $$")
+    lines.append(f"$$ R_n = 0.60 ({v['Fu']:g}) ({v['Anv']:.0f}) $$")
     lines.append("")
-    
+
     lines.append("**Result:**")
-    lines.append(f"$$ R_n = {Rn_rup:.2f} \\text{{ kN}} $$")
-    lines.append("")
-    
-    lines.append(render_check(Rn_rup, 'rupture', V_load))
-    lines.append("---")
+    lines.append(f"$$ R_n = {v['rupture_rn']:.2f} \\text{{ kN}} $$")
     lines.append("")
 
-    # =================================================
-    # 5. BLOCK SHEAR
-    # =================================================
-    lines.append("### 5. Block Shear")
+    lines.append(_check(v, v['rupture_rn'], v['phi_r'], v['rupture_cap'], v['V']))
+    return "\n".join(lines)
+
+def _block_shear(v):
+    lines = []
     lines.append("*Ref: AISC J4.3*")
     lines.append("")
 
-    # Geometry
-    L_gv = plate['lv'] + (rows - 1) * bolts['s_v']
-    Agv = L_gv * t_plt * cols
-    Anv_bs = (L_gv - (rows - 0.5) * d_hole) * t_plt * cols
-    Ant_bs = (plate['l_side'] - 0.5 * d_hole) * t_plt * cols
-    
+    Fy, Fu = v['Fy'], v['Fu']
+    Agv, Anv_bs, Ant_bs = v['Agv_bs'], v['Anv_bs'], v['Ant_bs']
+    term1, term2 = v['bs_rupture'] / 1000.0, v['bs_yield'] / 1000.0
+
     lines.append("**Areas:**")
     lines.append(f"- Shear Gross ($A_{{gv}}$): {Agv:.0f} mm²")
     lines.append(f"- Shear Net ($A_{{nv}}$): {Anv_bs:.0f} mm²")
     lines.append(f"- Tension Net ($A_{{nt}}$): {Ant_bs:.0f} mm²")
     lines.append("")
-    
-    term1 = (0.6 * Fu * Anv_bs) + (1.0 * Fu * Ant_bs)
-    term2 = (0.6 * Fy * Agv) + (1.0 * Fu * Ant_bs)
-    Rn_bs = min(term1, term2) / 1000.0
-    
+
     lines.append("**Term 1 (Rupture):**")
     lines.append("$$ 0.6 F_u A_{nv} + U_{bs} F_u A_{nt} $$")
     lines.append("")
-    lines.append(f"$$ = 0.6({Fu})({Anv_bs:.0f}) + 1.0({Fu})({Ant_bs:.0f}) $$")
+    lines.append(f"$$ = 0.6({Fu:g})({Anv_bs:.0f}) + 1.0({Fu:g})({Ant_bs:.0f}) $$")
     lines.append("")
-    lines.append(f"$$ = {term1/1000:.1f} \\text{{ kN}} $$")
+    lines.append(f"$$ = {term1:.1f} \\text{{ kN}} $$")
     lines.append("")
-    
+
     lines.append("**Term 2 (Yield):**")
     lines.append("$$ 0.6 F_y A_{gv} + U_{bs} F_u A_{nt} $$")
     lines.append("")
-    lines.append(f"$$ = 0.6({Fy})({Agv:.0f}) + 1.0({Fu})({Ant_bs:.0f}) $$")
+    lines.append(f"$$ = 0.6({Fy:g})({Agv:.0f}) + 1.0({Fu:g})({Ant_bs:.0f}) $$")
     lines.append("")
-    lines.append(f"$$ = {term2/1000:.1f} \\text{{ kN}} $$")
+    lines.append(f"$$ = {term2:.1f} \\text{{ kN}} $$")
     lines.append("")
-    
+
     lines.append("**Governing Value:**")
-    lines.append(f"$$ R_n = \\min({term1/1000:.1f}, {term2/1000:.1f}) $$")
+    lines.append(f"$$ R_n = \\min({term1:.1f}, {term2:.1f}) $$")
+    lines.append("")
+    lines.append(f"$$ = \\mathbf{{{v['block_rn']:.2f} \\text{{ kN}}}} $$")
     lines.append("")
-    lines.append(f"$$ = \\mathbf{{{Rn_bs:.2f} \\text{{ kN}}}} $$")
+
+    lines.append(_check(v, v['block_rn'], v['phi_r'], v['block_cap'], v['V']))
+    return "\n".join(lines)
+
+def _weld(v):
+    lines = []
+    lines.append("*Ref: AISC J2.4*")
     lines.append("")
-    
-    lines.append(render_check(Rn_bs, 'rupture', V_load))
+
+    lines.append("**Formula:**")
+    lines.append("$$ R_n = 0.60 F_{EXX} (0.707 w) L $$")
+    lines.append("")
+
+    lines.append("**Substitution:**")
+    lines.append(f"$$ R_n = 0.60 (480) (0.707 \\times {v['weld_size']:g}) ({v['L_weld']:g}) $$")
+    lines.append("")
+
+    lines.append("**Result:**")
+    lines.append(f"$$ R_n = {v['weld_rn']:.2f} \\text{{ kN}} $$")
+    lines.append("")
+
+    lines.append(_check(v, v['weld_rn'], v['phi_w'], v['weld_cap'], v['V']))
+    return "\n".join(lines)
+
+def _tension(v):
+    lines = []
+    lines.append("*Ref: AISC J3.6*")
+    lines.append("")
+
+    lines.append("**Formula:**")
+    lines.append("$$ R_n = F_{nt} \\times A_b \\times N_{bolts} $$")
+    lines.append("")
+
+    lines.append("**Substitution:**")
+    lines.append(f"$$ R_n = {v['Fnt']:g} \\times {v['Ab']:.1f} \\times {v['n_bolts']} $$")
+    lines.append("")
+
+    lines.append("**Result:**")
+    lines.append(f"$$ R_n = {v['tension_rn']:.2f} \\text{{ kN}} $$")
+    lines.append("")
+
+    lines.append(_check(v, v['tension_rn'], v['phi_b'], v['tension_cap'], v['T']))
+    return "\n".join(lines)
+
+def _interaction(v):
+    lines = []
+    lines.append("*Ref: AISC J3.7*")
+    lines.append("")
+
+    lines.append("**Formula:**")
+    lines.append("$$ \\left(\\frac{V}{R_{nv}}\\right)^2 + \\left(\\frac{T}{R_{nt}}\\right)^2 \\le 1.0 $$")
+    lines.append("")
+
+    inter = v['interaction']
+    res = "✅ OK" if inter <= 1.0 else "❌ FAIL"
+    lines.append("> **Check:**")
+    lines.append(f"> $$ \\left(\\frac{{{v['V']:.2f}}}{{{v['shear_cap']:.2f}}}\\right)^2 + "
+                 f"\\left(\\frac{{{v['T']:.2f}}}{{{v['tension_cap']:.2f}}}\\right)^2 = "
+                 f"\\mathbf{{{inter:.2f}}} \\quad [{res}] $$")
+    return "\n".join(lines)
+
+def _conclusion(v):
+    """รายการเดียวกับตาราง Design Summary"""
+    lines = []
+    for c in v['checks']:
+        r = c['ratio']
+        lines.append(f"- **{c['name'].split('. ', 1)[-1]}:** Ratio = {r:.2f} ({'✅' if r<=1 else '❌'})")
+        lines.append("") # Empty line between list items
+
     lines.append("---")
+    max_r = max(c['ratio'] for c in v['checks'])
+    res_txt = "PASSED" if max_r <= 1.0 else "FAILED"
+    lines.append(f"## Overall Status: {res_txt} (Max Ratio: {max_r:.2f})")
+    return "\n".join(lines)
+
+_LRFD = ('is_lrfd',)
+
+# (id, title, builder, trace keys ที่ใช้, check key ใน trace['checks'])
+SECTIONS = [
+    ('shear', "1. Bolt Shear Strength", _bolt_shear,
+     _LRFD + ('Fnv', 'Ab', 'n_bolts', 'shear_rn', 'phi_b', 'shear_cap', 'V'), 'shear_cap'),
+    ('bearing', "2. Bolt Bearing", _bearing,
+     _LRFD + ('t', 'Fu', 'rows', 'lc_edge', 'lc_inner', 'rn_edge', 'rn_inner', 'bear_max_rn',
+              'phi_r', 'bearing_rn', 'bearing_cap', 'V'), 'bearing_cap'),
+    ('yield', "3. Plate Shear Yielding", _yielding,
+     _LRFD + ('Fy', 'Agv', 'yield_rn', 'phi_y', 'yield_cap', 'V'), 'yield_cap'),
+    ('rupture', "4. Plate Shear Rupture", _rupture,
+     _LRFD + ('Fu', 'Anv', 'rupture_rn', 'phi_r', 'rupture_cap', 'V'), 'rupture_cap'),
+    ('block', "5. Block Shear", _block_shear,
+     _LRFD + ('Fy', 'Fu', 'Agv_bs', 'Anv_bs', 'Ant_bs', 'bs_rupture', 'bs_yield', 'block_rn',
+              'phi_r', 'block_cap', 'V'), 'block_cap'),
+    ('weld', "6. Weld Strength", _weld,
+     _LRFD + ('weld_size', 'L_weld', 'weld_rn', 'phi_w', 'weld_cap', 'V'), 'weld_cap'),
+    ('tension', "7. Bolt Tension", _tension,
+     _LRFD + ('Fnt', 'Ab', 'n_bolts', 'tension_rn', 'phi_b', 'tension_cap', 'T'), 'tension_cap'),
+    ('interaction', "8. Combined Shear + Tension Interaction", _interaction,
+     ('V', 'T', 'shear_cap', 'tension_cap', 'interaction'), 'interaction'),
+]
+_BUILDERS = {sid: fn for sid, _, fn, _, _ in SECTIONS}
+_BUILDERS.update(header=_header, conclusion=_conclusion)
+
+# ==========================================
+# 🗄️ 3. CACHED FRAGMENTS
+# ==========================================
+@shared_cache.memoize("calculation_report.section")
+def section_md(section_id, values):
+    """markdown ของ section เดียว (cache ด้วย id + ค่าที่ section นั้นอ่าน)"""
+    return _BUILDERS[section_id](values)
+
+def header_md(trace, material_grade, bolt_grade):
+    values = {k: trace[k] for k in ('method', 'V', 'T', 't', 'n_bolts', 'd')}
+    return section_md('header', dict(values, material_grade=material_grade, bolt_grade=bolt_grade))
+
+def conclusion_md(trace):
+    return section_md('conclusion', {'checks': trace['checks']})
+
+def report_sections(trace):
+    """
+    [(id, title, ratio, values)] ของ section ที่ใช้กับ trace นี้
+    (weld เฉพาะเมื่อมี weld, tension / interaction เฉพาะเมื่อ T > 0)
+    markdown สร้างทีหลังด้วย section_md(id, values) เมื่อจะแสดงจริง
+    """
+    ratios = {c['key']: c['ratio'] for c in trace['checks']}
+    out = []
+    for sid, title, _, keys, check_key in SECTIONS:
+        if sid == 'weld' and trace['weld_size'] <= 0:
+            continue
+        if check_key not in ratios:
+            continue
+        out.append((sid, title, ratios[check_key], {k: trace[k] for k in keys}))
+    return out
+
+def generate_report(trace, material_grade, bolt_grade):
+    """
+    Generate Calculation Report - MAXIMUM SPACING EDITION
+    Standard: AISC 360-16
+    Layout: Aggressive line breaks for readability.
+    คืน markdown ทั้งฉบับ (ประกอบจาก fragment ที่ cache ไว้)
+    """
+    parts = [header_md(trace, material_grade, bolt_grade), "---", ""]
+    for sid, title, _, values in report_sections(trace):
+        parts += [f"### {title}", section_md(sid, values), "---", ""]
+    parts += ["### 📝 Conclusion", "", conclusion_md(trace)]
+    return "\n".join(parts)
+
+# ==========================================
+# 🏗️ 4. BEAM CALCULATION SHEET
+# ==========================================
+@shared_cache.memoize("calculation_report.beam")
+def beam_report(rc):
+    """
+    Calculation sheet ของคาน (เนื้อหาเดียวกับ tab1) จาก results_context -> markdown
+    cache ด้วยค่าใน results_context (ผลคานเดิม = string เดิม)
+    """
+    is_lrfd = rc['is_lrfd']
+    Fy, E, Sx, Ix = rc['Fy'], rc['E'], rc['Sx'], rc['Ix']
+    Zx = rc.get('Zx', Sx)
+    user_span, Lb, Aw = rc['user_span'], rc['Lb'], rc['Aw']
+    V_cap, M_cap, d_allow = rc['V_cap'], rc['M_cap'], rc['d_allow']
+    Mn, Mp, Lp_cm, Lr_cm = rc['Mn'], rc['Mp'], rc['Lp_cm'], rc['Lr_cm']
+    ltb_zone, Cb, defl_denom = rc['ltb_zone'], rc.get('Cb', 1.0), rc['defl_denom']
+    factor_txt = "1.4" if is_lrfd else "1.0"
+    factor_val = 1.4 if is_lrfd else 1.0
+
+    lines = []
+    lines.append("#### 1. Design Parameters")
+    lines.append(f"$$ F_y = {Fy:,.0f} \\; ksc \\qquad E = {E:,.0f} \\; ksc \\qquad L = {user_span} \\; m $$")
     lines.append("")
+    lines.append(f"$$ S_x = {Sx:,.1f} \\; cm^3 \\qquad Z_x = {Zx:.1f} \\; cm^3 \\qquad I_x = {Ix:,.0f} \\; cm^4 $$")
+    lines.append("---")
 
-    # =================================================
-    # 6. WELD (IF ANY)
-    # =================================================
-    Rn_weld = 0
-    if plate.get('weld_size', 0) > 0:
-        lines.append("### 6. Weld Strength")
-        lines.append("*Ref: AISC J2.4*")
+    if rc['is_check_mode']:
+        # ========================================
+        # MODE A: CHECK DESIGN (Forward)
+        # ========================================
+        lines.append("> 📌 **Mode: Check Design** (Verify section capacity against input loads)")
+        lines.append("")
+        lines.append("#### 2. Load Analysis")
+        lines.append(f"$$ w_u = {factor_txt} \\times {rc['w_load']:,.0f} = {rc['fact_w']:,.0f} \\; kg/m $$")
+        lines.append("")
+        lines.append(f"$$ P_u = {factor_txt} \\times {rc['p_load']:,.0f} = {rc['fact_p']:,.0f} \\; kg $$")
+        lines.append("")
+        lines.append(f"$$ M_u = \\frac{{w_u L^2}}{{8}} + \\frac{{P_u L}}{{4}} = {rc['m_act']:,.0f} \\; kg \\cdot m $$")
+        lines.append("---")
+
+        lines.append("#### 3. Capacity Check")
+        lines.append("**3.1 Shear Capacity**")
+        lines.append("")
+        lines.append(f"$$ V_n = 0.6 F_y A_w = 0.6({Fy})({Aw:.2f}) = {0.6*Fy*Aw:,.0f} \\; kg $$")
+        lines.append("")
+        lines.append(f"$$ \\text{{Capacity }} V_{{cap}} = {V_cap:,.0f} \\; kg \\quad \\text{{(Ratio = {rc['ratio_v']:.2f})}} $$")
+        lines.append("")
+
+        lines.append("**3.2 Moment Capacity (LTB)**")
+        lines.append("")
+        lines.append(f"$$ L_b = {Lb} m, \\quad L_p = {Lp_cm/100:.2f} m, \\quad L_r = {Lr_cm/100:.2f} m $$")
         lines.append("")
-        
-        w = plate['weld_size']
-        L = h_plate * 2
-        Fexx = 480
-        Rn_weld = (0.6 * Fexx * 0.707 * w * L) / 1000.0
-        
-        lines.append("**Formula:**")
-        lines.append("$$ R_n = 0.60 F_{EXX} (0.707 w) L $$")
+        lines.append(f"Condition: **{ltb_zone}**")
         lines.append("")
-        
-        lines.append("**Substitution:**")
-        lines.append(f"$$ R_n = 0.60 ({Fexx}) (0.707 \\times {w}) ({L}) $$")
+        if "Zone 1" in ltb_zone: lines.append("$$ M_n = M_p = F_y Z_x $$")
+        elif "Zone 2" in ltb_zone: lines.append("$$ M_n = C_b [M_p - (M_p - 0.7 F_y S_x)(\\frac{L_b - L_p}{L_r - L_p})] $$")
+        else: lines.append("$$ M_n = F_{cr} S_x $$")
         lines.append("")
-        
-        lines.append("**Result:**")
-        lines.append(f"$$ R_n = {Rn_weld:.2f} \\text{{ kN}} $$")
+        lines.append(f"$$ M_n = {Mn/100:,.0f} \\; kg \\cdot m $$")
         lines.append("")
-        
-        lines.append(render_check(Rn_weld, 'weld', V_load))
+        lines.append(f"$$ \\text{{Capacity }} M_{{cap}} = {M_cap:,.0f} \\; kg \\cdot m \\quad \\text{{(Ratio = {rc['ratio_m']:.2f})}} $$")
         lines.append("---")
+
+        lines.append("#### 4. Deflection Check")
+        lines.append(f"$$ \\Delta_{{act}} = {rc['d_act']:.2f} \\; cm $$")
         lines.append("")
+        lines.append(f"$$ \\Delta_{{limit}} = L/{defl_denom} = {d_allow:.2f} \\; cm \\quad \\text{{(Ratio = {rc['ratio_d']:.2f})}} $$")
+        lines.append("---")
+        res_txt = "PASSED" if rc['gov_ratio'] <= 1.0 else "FAILED"
+        lines.append(f"## Overall Status: {res_txt} (Max Ratio: {rc['gov_ratio']:.2f}, {rc['gov_cause']})")
+        return "\n".join(lines)
 
-    # =================================================
-    # SUMMARY
-    # =================================================
-    lines.append("### 📝 Conclusion")
-    lines.append("")
-    
-    ratios = []
-    
-    def add_sum(name, Rn, mode):
-        if Rn == 0: return
-        if is_lrfd:
-            fac = phi_y if mode == 'yield' else (phi_b if mode == 'bolt' else (phi_w if mode == 'weld' else phi_r))
-            cap = Rn * fac
-        else:
-            om = om_y if mode == 'yield' else (om_b if mode == 'bolt' else (om_w if mode == 'weld' else om_r))
-            cap = Rn / om
-        
-        r = V_load / cap
-        ratios.append(r)
-        lines.append(f"- **{name}:** Ratio = {r:.2f} ({'✅' if r<=1 else '❌'})")
-        lines.append("") # Empty line between list items
+    # ========================================
+    # MODE B: FIND CAPACITY (Reverse)
+    # ========================================
+    lines.append("> 📌 **Mode: Find Capacity** (Determine maximum safe load)")
+    lines.append("")
+    lines.append("#### 2. Determine Section Capacity")
+    lines.append("**2.1 Shear Capacity ($V_n$)**")
+    lines.append("")
+    vn_val = 0.6 * Fy * Aw
+    lines.append("$$ V_n = 0.6 F_y A_w $$")
+    lines.append("")
+    lines.append(f"$$ V_n = 0.6 ({Fy}) ({Aw:.2f}) = {vn_val:,.0f} \\; kg $$")
+    lines.append("")
+    if is_lrfd:
+        lines.append(f"$$ V_{{design}} = \\phi V_n = 1.0 \\times {vn_val:,.0f} = \\mathbf{{{V_cap:,.0f}}} \\; kg $$")
+    else:
+        lines.append(f"$$ V_{{design}} = V_n / \\Omega = {vn_val:,.0f} / 1.5 = \\mathbf{{{V_cap:,.0f}}} \\; kg $$")
+    lines.append("")
 
-    add_sum("Bolt Shear", Rn_shear, 'bolt')
-    add_sum("Bolt Bearing", Rn_bearing, 'rupture')
-    add_sum("Plate Yield", Rn_yield, 'yield')
-    add_sum("Plate Rupture", Rn_rup, 'rupture')
-    add_sum("Block Shear", Rn_bs, 'rupture')
-    if Rn_weld > 0:
-        add_sum("Weld Strength", Rn_weld, 'weld')
+    lines.append("**2.2 Moment Capacity ($M_n$)**")
+    lines.append("")
+    lines.append("Check Lateral-Torsional Buckling (LTB):")
+    lines.append("")
+    lines.append(f"$$ L_b = {Lb} \\; m \\qquad L_p = {Lp_cm/100:.2f} m, \\; L_r = {Lr_cm/100:.2f} m $$")
+    lines.append("")
+    lines.append(f"$\\therefore$ Condition falls in **{ltb_zone}**")
+    lines.append("")
+    if "Zone 1" in ltb_zone:
+        lines.append("$$ M_n = M_p = F_y Z_x $$")
+        lines.append("")
+        lines.append(f"$$ M_n = {Fy} \\times {Zx:.1f} = {Mn:,.0f} \\; kg \\cdot cm $$")
+    elif "Zone 2" in ltb_zone:
+        frac = (Lb*100 - Lp_cm)/(Lr_cm - Lp_cm)
+        lines.append("$$ M_n = C_b [M_p - (M_p - 0.7 F_y S_x)(\\frac{L_b - L_p}{L_r - L_p})] $$")
+        lines.append("")
+        lines.append("Substituting:")
+        lines.append("")
+        lines.append(f"$$ M_n = {Cb} [{Mp:,.0f} - ({Mp:,.0f} - {0.7 * Fy * Sx:,.0f})({frac:.3f})] $$")
+        lines.append("")
+        lines.append(f"$$ M_n = {Mn:,.0f} \\; kg \\cdot cm $$")
+    else:
+        lines.append("$$ M_n = F_{cr} S_x $$")
+        lines.append("")
+        lines.append("$$ F_{cr} = \\frac{C_b \\pi^2 E}{(L_b/r_{ts})^2} \\sqrt{1 + 0.078 \\frac{J c}{S_x h_o} (L_b/r_{ts})^2} $$")
+        lines.append("")
+        lines.append(f"$$ M_n = {Mn:,.0f} \\; kg \\cdot cm $$")
+    lines.append("")
+    mn_kgm = Mn/100
+    if is_lrfd:
+        lines.append(f"$$ M_{{design}} = \\phi M_n = 0.90 \\times {mn_kgm:,.0f} = \\mathbf{{{M_cap:,.0f}}} \\; kg \\cdot m $$")
+    else:
+        lines.append(f"$$ M_{{design}} = M_n / \\Omega = {mn_kgm:,.0f} / 1.67 = \\mathbf{{{M_cap:,.0f}}} \\; kg \\cdot m $$")
+    lines.append("")
 
+    lines.append("**2.3 Allowable Deflection ($\\Delta_{allow}$)**")
+    lines.append("")
+    lines.append(f"$$ \\Delta_{{allow}} = L / {defl_denom} = {user_span*100:.0f} / {defl_denom} = \\mathbf{{{d_allow:.2f}}} \\; cm $$")
     lines.append("---")
-    max_r = max(ratios) if ratios else 0
-    res_txt = "PASSED" if max_r <= 1.0 else "FAILED"
-    lines.append(f"## Overall Status: {res_txt} (Max Ratio: {max_r:.2f})")
 
+    lines.append("#### 3. Calculate Safe Load")
+    lines.append("Reverse calculate $w$ (Uniform Load) from capacities:")
+    lines.append("")
+    w_m_val = (8 * M_cap) / (user_span**2)
+    w_v_val = (2 * V_cap) / user_span
+    l_cm = user_span * 100
+    w_d_serv = (384 * E * Ix * d_allow) / (5 * l_cm**4) * 100
+    w_d_ult = w_d_serv * factor_val
+
+    lines.append("**Case A: Moment Control**")
+    lines.append("")
+    lines.append("$$ M_{des} = \\frac{w L^2}{8} \\Rightarrow w = \\frac{8 M_{des}}{L^2} $$")
+    lines.append("")
+    lines.append(f"$$ w_1 = \\frac{{8 ({M_cap:,.0f})}}{{ {user_span}^2 }} = {w_m_val:,.0f} \\; kg/m $$")
+    lines.append("")
+    lines.append("**Case B: Shear Control**")
+    lines.append("")
+    lines.append("$$ V_{des} = \\frac{w L}{2} \\Rightarrow w = \\frac{2 V_{des}}{L} $$")
+    lines.append("")
+    lines.append(f"$$ w_2 = \\frac{{2 ({V_cap:,.0f})}}{{ {user_span} }} = {w_v_val:,.0f} \\; kg/m $$")
+    lines.append("")
+    lines.append("**Case C: Deflection Control (Service Limit)**")
+    lines.append("")
+    lines.append("$$ \\Delta_{all} = \\frac{5 w_{serv} L^4}{384 E I} \\Rightarrow w_{serv} = \\frac{384 E I \\Delta_{all}}{5 L^4} $$")
+    lines.append("")
+    lines.append(f"$$ w_{{serv}} = \\frac{{384 ({E:.0f}) ({Ix:.0f}) ({d_allow:.2f})}}{{5 ({l_cm:.0f})^4}} \\times 100 = {w_d_serv:,.0f} \\; kg/m $$")
+    lines.append("")
+    lines.append(f"Convert to Strength Level for comparison (x {factor_txt}):")
+    lines.append("")
+    lines.append(f"$$ w_3 = {w_d_serv:,.0f} \\times {factor_txt} = {w_d_ult:,.0f} \\; kg/m $$")
+    lines.append("---")
+
+    lines.append("#### 4. Conclusion")
+    min_w = min(w_m_val, w_v_val, w_d_ult)
+    lines.append(f"$$ w_{{safe(u)}} = \\min({w_m_val:,.0f}, {w_v_val:,.0f}, {w_d_ult:,.0f}) = \\mathbf{{{min_w:,.0f}}} \\; kg/m $$")
+    lines.append("")
+    lines.append(f"Convert back to Service Load (divide by {factor_txt}):")
+    lines.append("")
+    lines.append(f"### ✅ Max Safe Load = {min_w/factor_val:,.0f} kg/m")
     return "\n".join(lines)
@@ -1,22 +1,21 @@
 import streamlit as st
-import math
 import pandas as pd
+import numpy as np
 import drawing_utils as dw
+import strength_tables as tables
 import calculation_report as cr
+import shared_cache
+import session_budget
 
 # ==========================================
 # 🗄️ 0. DATABASES
 # ==========================================
 
-BOLT_DB = {
-    "Grade 8.8 (ISO)":   {"Fnv": 372, "Fnt": 620, "Fu": 800,  "Desc": "High Tensile Bolt (Common in TH)"},
-    "A325 (ASTM)":       {"Fnv": 372, "Fnt": 620, "Fu": 825,  "Desc": "Structural Bolt (US Standard)"},
-    "F10T (JIS)":        {"Fnv": 469, "Fnt": 780, "Fu": 1000, "Desc": "T.C. Bolt (JIS Standard)"},
-    "Grade 10.9 (ISO)":  {"Fnv": 469, "Fnt": 780, "Fu": 1000, "Desc": "Very High Tensile (Eq. A490)"},
-    "A490 (ASTM)":       {"Fnv": 469, "Fnt": 780, "Fu": 1035, "Desc": "Extra High Strength Bolt"},
-}
+BOLT_DB = tables.BOLT_DB  # shared registry (strength_tables.py)
 
 AISC_MIN_EDGE = {12: 20, 16: 22, 20: 34, 22: 38, 24: 42, 27: 48, 30: 52}
+MIN_PITCH_FACTOR = 2.67  # AISC J3.3: ระยะห่าง bolt ขั้นต่ำ = 2-2/3 d
+FEXX = 480  # E70xx (MPa)
 
 # ==========================================
 # 🧮 1. CORE LOGIC (FORCE UNIT: kN)
@@ -38,253 +37,265 @@ def calculate_plate_geometry(conn_type, user_inputs):
         
     return {'h': calc_h, 'w': calc_w, 'type': conn_type}
 
+def min_edge_distance(d):
+    return AISC_MIN_EDGE.get(int(d), d * 1.75)
+
+def min_bolt_spacing(d):
+    return MIN_PITCH_FACTOR * d
+
 def check_geometry_compliance(inputs):
     warnings = []
     d = inputs['d']
-    min_edge = AISC_MIN_EDGE.get(d, d * 1.75)
+    min_edge = min_edge_distance(d)
     
     if inputs['lv'] < min_edge or inputs['leh'] < min_edge:
         warnings.append(f"⚠️ Edge distance less than standard (Min {min_edge} mm)")
     
-    min_spacing = 2.67 * d
+    min_spacing = min_bolt_spacing(d)
     if inputs['s_v'] < min_spacing:
         warnings.append(f"⚠️ Bolt spacing (Pitch) too close (Min {min_spacing:.1f} mm)")
     
     return warnings
 
-def calculate_exact_capacity_kN(inputs, plate_geom, V_load_kN, T_load_kN, mat_grade, bolt_data):
+def connection_kernel(d, rows, cols, t, s_v, lv, leh, weld_size, plate_h,
+                      V_load_kN, T_load_kN, plate_id, bolt_id, thread_id, is_lrfd):
     """
-    Calculate Capacity in kN to match Report 100%
+    Vectorized limit-state kernel (kN). ทุก argument รับ scalar หรือ numpy array (broadcast)
+    ค่ากำลังวัสดุ/สลักเกลียวดึงจาก strength_tables ด้วย index (ไม่มีการเทียบ string)
+    คืน dict ของค่ากลางทั้งหมด (trace): *_rn = กำลัง nominal, *_cap = φRn หรือ Rn/Ω
     """
-    
-    # --- 1. Constants & Factors ---
-    method_raw = st.session_state.get('design_method', 'LRFD')
-    is_lrfd = "LRFD" in method_raw
-    
-    # Phi Factors (AISC 360-16)
-    if is_lrfd:
-        phi_y, phi_r, phi_w, phi_b = 0.90, 0.75, 0.75, 0.75
-    else:
-        # Convert ASD Omega to Phi equivalent for display consistency
-        phi_y, phi_r, phi_w, phi_b = 1/1.67, 1/2.00, 1/2.00, 1/2.00
-
-    if "SS400" in mat_grade: Fy, Fu = 245, 400    
-    elif "SM520" in mat_grade: Fy, Fu = 355, 520
-    else: Fy, Fu = 250, 400 # A36
-
-    # Geometry Vars
-    d = inputs['d']
-    d_hole = d + 2.0 
-    t = inputs['t']
-    rows, cols = inputs['rows'], inputs['cols']
+    m = tables.method_id(is_lrfd)
+    d = np.asarray(d)
+    d_i = tables.diameter_index(d)
+    rows, cols = np.asarray(rows), np.asarray(cols)
+    t = np.asarray(t, dtype=float)
+
+    Fy = tables.PLATE_FY[plate_id]
+    Fu = tables.PLATE_FU[plate_id]
+    d_hole = d + 2.0
     n_bolts = rows * cols
-    
-    check_list = [] 
+    r = {'Fy': Fy, 'Fu': Fu, 'd_hole': d_hole, 'n_bolts': n_bolts, 'Ab': tables.AB[d_i],
+         'phi_b': tables.PHI_B[m], 'phi_y': tables.PHI_Y[m], 'phi_r': tables.PHI_R[m], 'phi_w': tables.PHI_W[m]}
+
+    # 1. Bolt Shear
+    r['Fnv'] = tables.FNV[bolt_id, thread_id]
+    r['shear_rn'] = r['Fnv'] * r['Ab'] * n_bolts / 1000.0
+    r['shear_cap'] = tables.BOLT_SHEAR_KN[m, bolt_id, d_i, thread_id] * n_bolts
+
+    # 2. Bolt Bearing (Tearout)
+    r['lc_edge'] = lv - (d_hole / 2.0)
+    r['lc_inner'] = s_v - d_hole
+    bear_max = tables.BEARING_MAX_KN[m, plate_id, d_i] * t
+    r['bear_max_rn'] = 2.4 * d * t * Fu / 1000.0
+    r['rn_edge'] = np.minimum(tables.TEAROUT_KN[m, plate_id] * r['lc_edge'] * t, bear_max)
+    r['rn_inner'] = np.minimum(tables.TEAROUT_KN[m, plate_id] * r['lc_inner'] * t, bear_max)
+    r['bearing_cap'] = (r['rn_edge'] + np.where(rows >= 2, (rows - 1) * r['rn_inner'], 0.0)) * cols
+    r['bearing_rn'] = r['bearing_cap'] / r['phi_r']
 
-    # ----------------------------------------
-    # 1. Bolt Shear (Strength)
-    # ----------------------------------------
-    Ab = (math.pi * d**2) / 4
-    Fnv = bolt_data['Fnv']
-    
-    Rn_shear_N = Fnv * Ab * n_bolts 
-    Design_Shear_kN = (Rn_shear_N * phi_b) / 1000.0  # Convert N -> kN
-    
-    check_list.append({
-        "Check Item": "1. Bolt Shear",
-        "Capacity (kN)": Design_Shear_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Shear_kN >= V_load_kN else "FAIL"
-    })
-
-    # ----------------------------------------
-    # 2. Bolt Bearing (Teartout)
-    # ----------------------------------------
-    lc_edge = inputs['lv'] - (d_hole / 2.0)
-    lc_inner = inputs['s_v'] - d_hole
-    
-    rn_edge_N = min(1.2 * lc_edge * t * Fu, 2.4 * d * t * Fu)
-    rn_inner_N = min(1.2 * lc_inner * t * Fu, 2.4 * d * t * Fu)
-    
-    if rows >= 2:
-        Rn_bearing_total_N = (rn_edge_N + (rows - 1) * rn_inner_N) * cols
-    else:
-        Rn_bearing_total_N = rn_edge_N * cols
-        
-    Design_Bearing_kN = (Rn_bearing_total_N * phi_r) / 1000.0
-    
-    check_list.append({
-        "Check Item": "2. Bolt Bearing",
-        "Capacity (kN)": Design_Bearing_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Bearing_kN >= V_load_kN else "FAIL"
-    })
-
-    # ----------------------------------------
     # 3. Plate Shear Yielding
-    # ----------------------------------------
-    Agv = plate_geom['h'] * t
-    Rn_yield_N = 0.60 * Fy * Agv
-    Design_Yield_kN = (Rn_yield_N * phi_y) / 1000.0
-    
-    check_list.append({
-        "Check Item": "3. Plate Yielding",
-        "Capacity (kN)": Design_Yield_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Yield_kN >= V_load_kN else "FAIL"
-    })
+    r['Agv'] = plate_h * t
+    r['yield_rn'] = 0.60 * Fy * r['Agv'] / 1000.0
+    r['yield_cap'] = r['phi_y'] * r['yield_rn']
 
-    # ----------------------------------------
     # 4. Plate Shear Rupture
-    # ----------------------------------------
-    Anv = (plate_geom['h'] - (rows * d_hole)) * t
-    Rn_rup_N = 0.60 * Fu * Anv
-    Design_Rup_kN = (Rn_rup_N * phi_r) / 1000.0
-    
-    check_list.append({
-        "Check Item": "4. Plate Rupture",
-        "Capacity (kN)": Design_Rup_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Rup_kN >= V_load_kN else "FAIL"
-    })
-
-    # ----------------------------------------
-    # 5. Block Shear (AISC J4.3)
-    # ----------------------------------------
-    L_gv = inputs['lv'] + (rows - 1) * inputs['s_v'] 
-    Agv_bs = L_gv * t * cols
-    Anv_bs = (L_gv - (rows - 0.5) * d_hole) * t * cols
-    Ant_bs = (inputs['leh'] - 0.5 * d_hole) * t * cols
-    Ubs = 1.0 
-    
-    term1 = (0.6 * Fu * Anv_bs) + (Ubs * Fu * Ant_bs)
-    term2 = (0.6 * Fy * Agv_bs) + (Ubs * Fu * Ant_bs)
-    Rn_bs_N = min(term1, term2)
-    
-    Design_Block_kN = (Rn_bs_N * phi_r) / 1000.0
-    
-    check_list.append({
-        "Check Item": "5. Block Shear",
-        "Capacity (kN)": Design_Block_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Block_kN >= V_load_kN else "FAIL"
-    })
+    r['Anv'] = (plate_h - (rows * d_hole)) * t
+    r['rupture_rn'] = 0.60 * Fu * r['Anv'] / 1000.0
+    r['rupture_cap'] = r['phi_r'] * r['rupture_rn']
+
+    # 5. Block Shear (AISC J4.3, Ubs = 1.0)
+    r['L_gv'] = lv + (rows - 1) * s_v
+    r['Agv_bs'] = r['L_gv'] * t * cols
+    r['Anv_bs'] = (r['L_gv'] - (rows - 0.5) * d_hole) * t * cols
+    r['Ant_bs'] = (leh - 0.5 * d_hole) * t * cols
+    r['bs_rupture'] = (0.6 * Fu * r['Anv_bs']) + (1.0 * Fu * r['Ant_bs'])
+    r['bs_yield'] = (0.6 * Fy * r['Agv_bs']) + (1.0 * Fu * r['Ant_bs'])
+    r['block_rn'] = np.minimum(r['bs_rupture'], r['bs_yield']) / 1000.0
+    r['block_cap'] = r['phi_r'] * r['block_rn']
+
+    # 6. Weld Strength (E70xx, both sides)
+    r['L_weld'] = plate_h * 2
+    r['weld_rn'] = 0.60 * FEXX * (0.707 * weld_size) * r['L_weld'] / 1000.0
+    r['weld_cap'] = r['phi_w'] * r['weld_rn']
 
-    # ----------------------------------------
-    # 6. Weld Strength
-    # ----------------------------------------
-    w_sz = inputs['weld_size']
-    L_weld = plate_geom['h'] * 2 
-    Fexx = 480 # E70xx 
-    Rn_weld_N = 0.60 * Fexx * (0.707 * w_sz) * L_weld
-    Design_Weld_kN = (Rn_weld_N * phi_w) / 1000.0
-    
-    check_list.append({
-        "Check Item": "6. Weld Strength",
-        "Capacity (kN)": Design_Weld_kN,
-        "Demand (kN)": V_load_kN,
-        "Status": "PASS" if Design_Weld_kN >= V_load_kN else "FAIL"
+    # 7. Bolt Tension & Interaction
+    r['Fnt'] = tables.FNT[bolt_id]
+    r['tension_rn'] = r['Fnt'] * r['Ab'] * n_bolts / 1000.0
+    r['tension_cap'] = tables.BOLT_TENSION_KN[m, bolt_id, d_i] * n_bolts
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r['interaction'] = (V_load_kN / r['shear_cap'])**2 + (T_load_kN / r['tension_cap'])**2
+
+    def ratio(demand, cap):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(cap == 0, 999.0, demand / np.where(cap == 0, 1.0, cap))
+
+    ratios = [ratio(V_load_kN, r[k]) for k in
+              ('shear_cap', 'bearing_cap', 'yield_cap', 'rupture_cap', 'block_cap', 'weld_cap')]
+    has_t = np.asarray(T_load_kN) > 0
+    ratios.append(np.where(has_t, ratio(T_load_kN, r['tension_cap']), -np.inf))
+    ratios.append(np.where(has_t, r['interaction'], -np.inf))
+    r['ratio'] = np.maximum.reduce(np.broadcast_arrays(*ratios))
+    return r
+
+CHECK_ITEMS = [
+    ("1. Bolt Shear", 'shear_cap'),
+    ("2. Bolt Bearing", 'bearing_cap'),
+    ("3. Plate Yielding", 'yield_cap'),
+    ("4. Plate Rupture", 'rupture_cap'),
+    ("5. Block Shear", 'block_cap'),
+    ("6. Weld Strength", 'weld_cap'),
+]
+
+def connection_trace(inputs, plate_geom, V_load_kN, T_load_kN, plate_id, bolt_id, thread_id=0, is_lrfd=True):
+    """
+    ประเมิน kernel ครั้งเดียว -> trace (dict ของ float): input + ค่ากลางทุกตัว + รายการ check
+    ตารางสรุปและ calculation report อ่านจาก trace เดียวกันนี้ (ไม่คำนวณซ้ำ)
+    """
+    k = connection_kernel(
+        inputs['d'], inputs['rows'], inputs['cols'], inputs['t'], inputs['s_v'],
+        inputs['lv'], inputs['leh'], inputs['weld_size'], plate_geom['h'],
+        V_load_kN, T_load_kN, plate_id, bolt_id, thread_id, is_lrfd
+    )
+    trace = {key: float(v) for key, v in k.items()}
+    trace.update({
+        'd': float(inputs['d']), 'rows': int(inputs['rows']), 'cols': int(inputs['cols']),
+        't': float(inputs['t']), 's_v': float(inputs['s_v']), 'lv': float(inputs['lv']),
+        'leh': float(inputs['leh']), 'weld_size': float(inputs['weld_size']), 'plate_h': float(plate_geom['h']),
+        'n_bolts': int(k['n_bolts']), 'V': float(V_load_kN), 'T': float(T_load_kN),
+        'is_lrfd': is_lrfd, 'method': "LRFD" if is_lrfd else "ASD",
     })
 
-    # ----------------------------------------
-    # 7. Bolt Tension & Interaction
-    # ----------------------------------------
+    checks = []
+    for name, key in CHECK_ITEMS:
+        checks.append({'name': name, 'key': key, 'capacity': trace[key], 'demand': trace['V'], 'is_ratio': False})
     if T_load_kN > 0:
-        Fnt = bolt_data['Fnt']
-        Rn_ten_N = Fnt * Ab * n_bolts
-        Design_Ten_kN = (Rn_ten_N * phi_b) / 1000.0
-        
-        check_list.append({
-            "Check Item": "7. Bolt Tension",
-            "Capacity (kN)": Design_Ten_kN,
-            "Demand (kN)": T_load_kN,
-            "Status": "PASS" if Design_Ten_kN >= T_load_kN else "FAIL"
-        })
-        
-        r_v = V_load_kN / Design_Shear_kN
-        r_t = T_load_kN / Design_Ten_kN
-        inter_val = r_v**2 + r_t**2
-        
-        check_list.append({
-            "Check Item": "8. Interaction",
-            "Capacity (kN)": 1.00, 
-            "Demand (kN)": inter_val,
-            "Status": "PASS" if inter_val <= 1.0 else "FAIL",
-            "IsRatio": True
-        })
+        checks.append({'name': "7. Bolt Tension", 'key': 'tension_cap', 'capacity': trace['tension_cap'],
+                       'demand': trace['T'], 'is_ratio': False})
+        checks.append({'name': "8. Interaction", 'key': 'interaction', 'capacity': 1.00,
+                       'demand': trace['interaction'], 'is_ratio': True})
+    for c in checks:
+        if c['is_ratio']:
+            c['ratio'] = c['demand']
+        else:
+            c['ratio'] = 999.0 if c['capacity'] == 0 else c['demand'] / c['capacity']
+    trace['checks'] = checks
+    return trace
 
-    # --- Summary ---
-    df_res = pd.DataFrame(check_list)
-    
-    def get_ratio(row):
-        if row.get('IsRatio'): return row['Demand (kN)']
-        if row['Capacity (kN)'] == 0: return 999.0
-        return row['Demand (kN)'] / row['Capacity (kN)']
+def calculate_exact_capacity_kN(inputs, plate_geom, V_load_kN, T_load_kN, plate_id, bolt_id, thread_id=0, is_lrfd=True):
+    """
+    Calculate Capacity in kN to match Report 100%
+    (plate_id / bolt_id / thread_id = index ใน strength_tables; method ส่งเข้ามาตรงๆ ไม่อ่าน session_state)
+    คืน 'trace' ด้วย เพื่อให้ report ใช้ค่าชุดเดียวกับตาราง
+    """
+    trace = connection_trace(inputs, plate_geom, V_load_kN, T_load_kN, plate_id, bolt_id, thread_id, is_lrfd)
 
-    df_res['Ratio'] = df_res.apply(get_ratio, axis=1)
+    # --- Summary ---
+    df_res = pd.DataFrame([{
+        "Check Item": c['name'],
+        "Capacity (kN)": c['capacity'],
+        "Demand (kN)": c['demand'],
+        "Status": "PASS" if c['ratio'] <= 1.0 else "FAIL",
+        "IsRatio": c['is_ratio'],
+        "Ratio": c['ratio'],
+    } for c in trace['checks']])
     max_r = df_res['Ratio'].max()
-    
+
     return {
         'df': df_res,
         'ratio': max_r,
-        'status': "PASS" if max_r <= 1.0 else "FAIL"
+        'status': "PASS" if max_r <= 1.0 else "FAIL",
+        'trace': trace,
     }
 
 # ==========================================
 # ⚡ 2. SMART OPTIMIZER (Based on kN)
 # ==========================================
 def run_optimization(V_target_kN, T_target_kN, mat_grade, bolt_grade_name, conn_type, current_inputs, 
-                     fixed_bolt=None, strategy="Min Weight"):
-    
+                     fixed_bolt=None, strategy="Min Weight", is_lrfd=True):
+    return _optimize(V_target_kN, T_target_kN, mat_grade, bolt_grade_name, conn_type, current_inputs,
+                     fixed_bolt, strategy, is_lrfd)
+
+@shared_cache.memoize("connection_design.optimizer", copy=True)
+def _optimize(V_target_kN, T_target_kN, mat_grade, bolt_grade_name, conn_type, current_inputs,
+              fixed_bolt, strategy, is_lrfd):
+    """Pure optimizer (ทุก input ส่งเข้ามาตรงๆ) -> cache ข้าม session"""
     if fixed_bolt: candidate_bolts = [fixed_bolt]
     else: candidate_bolts = [16, 20, 24, 27, 30]
         
     candidate_rows = range(2, 7)
     candidate_thk = [6, 9, 10, 12, 16, 19, 20, 25] 
-    
+
+    # Resolve grades once, then evaluate the whole candidate grid in one kernel call
+    plate_id = tables.plate_grade_id(mat_grade)
+    bolt_id = tables.bolt_grade_id(bolt_grade_name)
+
+    D, R, T = np.meshgrid(candidate_bolts, list(candidate_rows), candidate_thk, indexing='ij')
+    D, R, T = D.ravel(), R.ravel(), T.ravel().astype(float)
+
+    # Candidate geometry, then Approx Check (Quick Filter) + geometry compliance
+    # (กฎเดียวกับ check_geometry_compliance: edge >= min_edge_distance, pitch >= min_bolt_spacing)
+    s_v, lv, leh = 3.0 * D, 1.5 * D, 1.5 * D
+    keep = (D**2 * R * 2.0 / 100) * 9.81 >= V_target_kN
+    min_edge = np.array([min_edge_distance(d) for d in D])
+    keep &= (lv >= min_edge) & (leh >= min_edge) & (s_v >= min_bolt_spacing(D))
+    D, R, T = D[keep], R[keep], T[keep]
+    s_v, lv, leh = s_v[keep], lv[keep], leh[keep]
+    if len(D) == 0: return None
+
+    weld = np.maximum(5, T - 2)
+    plate_h = (2 * lv) + ((R - 1) * s_v)
+    if "Fin" in conn_type:
+        plate_w = current_inputs['setback'] + current_inputs['e1'] + leh
+    elif "End" in conn_type:
+        plate_w = 2 * leh
+    else:
+        plate_w = current_inputs['e1'] + leh
+
+    k = connection_kernel(D, R, 1, T, s_v, lv, leh, weld, plate_h,
+                          V_target_kN, T_target_kN, plate_id, bolt_id, 0, is_lrfd)
+    ratio = k['ratio']
+    ok = (ratio <= 1.0) & (ratio >= 0.40)
+    if not np.any(ok): return None
+
+    weight = (plate_h * plate_w * T / 1e9) * 7850
+    score = weight if strategy == "Min Weight" else R * 100 + weight
+
     valid_designs = []
-    bolt_db_data = BOLT_DB[bolt_grade_name]
-    
-    for d in candidate_bolts:
-        for r in candidate_rows:
-            # Approx Check (Quick Filter)
-            if (d**2 * r * 2.0 / 100) * 9.81 < V_target_kN: continue
-
-            for t in candidate_thk:
-                temp_inputs = current_inputs.copy()
-                temp_inputs.update({
-                    'd': d, 'rows': r, 'cols': 1, 't': t,
-                    's_v': 3.0 * d, 'lv': 1.5 * d, 'leh': 1.5 * d, 's_h': 0,
-                    'weld_size': max(5, t-2)
-                })
-
-                geom = calculate_plate_geometry(conn_type, temp_inputs)
-                if check_geometry_compliance(temp_inputs): continue 
-
-                res = calculate_exact_capacity_kN(temp_inputs, geom, V_target_kN, T_target_kN, mat_grade, bolt_db_data)
-                
-                if res['status'] == "PASS" and res['ratio'] >= 0.40:
-                    vol_mm3 = geom['h'] * geom['w'] * t
-                    weight = (vol_mm3 / 1e9) * 7850 
-                    
-                    if strategy == "Min Weight": score = weight
-                    else: score = r * 100 + weight 
-                    
-                    valid_designs.append({
-                        'Bolt': d, 'Rows': r, 'Thk': t,
-                        'Weight': weight, 'Ratio': res['ratio'],
-                        'Score': score, 'Params': temp_inputs 
-                    })
+    for i in np.flatnonzero(ok):
+        temp_inputs = current_inputs.copy()
+        temp_inputs.update({
+            'd': int(D[i]), 'rows': int(R[i]), 'cols': 1, 't': int(T[i]),
+            's_v': float(s_v[i]), 'lv': float(lv[i]), 'leh': float(leh[i]), 's_h': 0,
+            'weld_size': int(weld[i])
+        })
+        valid_designs.append({
+            'Bolt': int(D[i]), 'Rows': int(R[i]), 'Thk': int(T[i]),
+            'Weight': float(weight[i]), 'Ratio': float(ratio[i]),
+            'Score': float(score[i]), 'Params': temp_inputs 
+        })
 
-    if not valid_designs: return None
     df = pd.DataFrame(valid_designs)
     df = df.sort_values(by=['Score', 'Ratio'], ascending=[True, False])
     return df.head(5) 
 
+# ผลลัพธ์ optimizer ที่เก็บใน session: record array (ไม่เก็บ DataFrame + dict ของ Params ต่อแถว)
+OPT_RESULT_DTYPE = np.dtype([
+    ('Bolt', 'i2'), ('Rows', 'i2'), ('Thk', 'f4'), ('Weight', 'f4'),
+    ('Ratio', 'f4'), ('Score', 'f4'), ('s_v', 'f4'), ('lv', 'f4'),
+])
+
+def compact_opt_results(df):
+    rec = np.empty(len(df), dtype=OPT_RESULT_DTYPE)
+    for col in ('Bolt', 'Rows', 'Thk', 'Weight', 'Ratio', 'Score'):
+        rec[col] = df[col].to_numpy()
+    rec['s_v'] = [p['s_v'] for p in df['Params']]
+    rec['lv'] = [p['lv'] for p in df['Params']]
+    return rec
+
 # ==========================================
 # 🖥️ 3. UI RENDERING
 # ==========================================
 
+@st.fragment
 def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd, section_data, conn_type, default_bolt_grade, default_mat_grade):
     
     # 🔴 FIX: Map input argument back to variable used in this file
@@ -293,7 +304,8 @@ def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd
     # CRITICAL: Convert Input kg to kN immediately for all calculations
     V_design_kN = V_design_kg * 9.81 / 1000.0
     
-    current_method = st.session_state.get('design_method', method)
+    # Fragment: การโต้ตอบในแท็บนี้ rerun เฉพาะแท็บนี้ (ใช้เฉพาะ input ที่ส่งเข้ามา)
+    current_method = method
     
     col_input, col_draw = st.columns([1, 1.8])
     
@@ -311,8 +323,7 @@ def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd
         
         row_mat = st.columns(2)
         bolt_grade_name = row_mat[0].selectbox("🔩 Bolt Grade", list(BOLT_DB.keys()), index=0)
-        selected_bolt = BOLT_DB[bolt_grade_name]
-        
+
         mat_options = ["SS400 (Fy 245)", "SM520 (Fy 355)", "A36 (Fy 250)"]
         sel_mat_grade = row_mat[1].selectbox("🛡️ Plate Grade", mat_options)
         
@@ -336,38 +347,35 @@ def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd
                         'cope': {'has_cope': False, 'dc': 0, 'c': 0}
                     }
                     results_df = run_optimization(V_design_kN, 0, sel_mat_grade, bolt_grade_name, conn_type, 
-                        defaults, fixed_bolt=curr_d if lock_bolt else None, strategy=opt_strategy)
+                        defaults, fixed_bolt=curr_d if lock_bolt else None, strategy=opt_strategy, is_lrfd=is_lrfd)
                     
                     if results_df is not None:
-                        st.session_state['opt_results'] = results_df
+                        session_budget.put('opt_results', compact_opt_results(results_df))
                         st.success(f"✅ Found {len(results_df)} valid designs!")
                     else: st.warning("❌ No valid design found.")
 
-            if 'opt_results' in st.session_state:
-                res_df = st.session_state['opt_results']
-                if not pd.api.types.is_numeric_dtype(res_df['Bolt']): 
-                    del st.session_state['opt_results']
-                    st.rerun()
-
+            res_rec = session_budget.get('opt_results')
+            if res_rec is not None and getattr(res_rec, 'dtype', None) != OPT_RESULT_DTYPE:
+                # ผลรูปแบบเก่า: ทิ้งแล้วทำต่อ (st.rerun(scope="fragment") ใช้ไม่ได้ใน full run เช่นตอนสลับหน้า)
+                session_budget.pop('opt_results')
+                res_rec = None
+            if res_rec is not None:
                 st.markdown("#### 🏆 Top Recommendations")
-                for index, row in res_df.iterrows():
+                for index, row in enumerate(res_rec):
                     desc = f"M{row['Bolt']:.0f} x {row['Rows']:.0f} rows (Plt {row['Thk']:.0f}mm)"
                     if st.button(f"👉 Apply: {desc} ({row['Ratio']:.2f})", key=f"btn_apply_{index}"):
-                        p = row['Params']
-                        st.session_state['auto_d'] = int(p['d'])
-                        st.session_state['auto_rows'] = int(p['rows'])
-                        st.session_state['auto_t'] = float(p['t'])
-                        st.session_state['auto_sv'] = float(p['s_v'])
-                        st.session_state['auto_lv'] = float(p['lv'])
-                        st.rerun()
+                        st.session_state['auto_d'] = int(row['Bolt'])
+                        st.session_state['auto_rows'] = int(row['Rows'])
+                        st.session_state['auto_t'] = float(row['Thk'])
+                        st.session_state['auto_sv'] = float(row['s_v'])
+                        st.session_state['auto_lv'] = float(row['lv'])
+                        st.rerun(scope="fragment")
 
         st.write("---")
         thread_cond = st.radio("Shear Plane:", ["Threads Included (N)", "Threads Excluded (X)"], horizontal=True)
-        final_Fnv = selected_bolt['Fnv'] 
-        if "Excluded" in thread_cond:
-            if "8.8" in bolt_grade_name or "A325" in bolt_grade_name: final_Fnv = 457
-            elif "10.9" in bolt_grade_name or "A490" in bolt_grade_name: final_Fnv = 579
-            else: final_Fnv = final_Fnv * 1.25
+        bolt_id = tables.bolt_grade_id(bolt_grade_name)
+        plate_id = tables.plate_grade_id(sel_mat_grade)
+        thread_id = tables.thread_id(thread_cond)
         
         in_tab1, in_tab2, in_tab3 = st.tabs(["📏 Geometry", "📐 Detailing", "⚙️ Advanced"])
 
@@ -430,13 +438,10 @@ def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd
         if geom_warnings:
             for w in geom_warnings: st.warning(w)
 
-        bolt_data_for_calc = selected_bolt.copy()
-        bolt_data_for_calc['Fnv'] = final_Fnv
-        
         # 🔥 USE kN Function 🔥
         check_res = calculate_exact_capacity_kN(
             user_inputs, plate_geom, V_design_kN, T_design_kN, 
-            sel_mat_grade, bolt_data_for_calc
+            plate_id, bolt_id, thread_id, is_lrfd
         )
         
         # --- Display Table in kN ---
@@ -466,43 +471,35 @@ def render_connection_tab(V_design_from_tab1, default_bolt_size, method, is_lrfd
              st.error(f"❌ DESIGN FAIL (Max Ratio: {check_res['ratio']:.2f})")
 
     with col_draw:
-        t1, t2, t3 = st.tabs(["🖼️ Front View", "📐 Side View", "🔝 Plan View"])
-        with t1: st.plotly_chart(dw.create_front_view(section_data, plate_geom, user_inputs), use_container_width=True)
-        with t2: st.plotly_chart(dw.create_side_view(section_data, plate_geom, user_inputs), use_container_width=True)
-        with t3: st.plotly_chart(dw.create_plan_view(section_data, plate_geom, user_inputs), use_container_width=True)
+        # สร้างเฉพาะ view ที่เลือก; Figure cache ด้วย geometry (เปลี่ยนเกรด / method ไม่วาดใหม่)
+        view = st.radio("View", list(dw.VIEWS), horizontal=True, key="conn_view", label_visibility="collapsed")
+        st.plotly_chart(dw.get_view(view, section_data, plate_geom, user_inputs), use_container_width=True)
 
     # Report Gen
     st.markdown("---")
     if st.button("📄 Generate Calculation Report (Verify Match)", type="primary", use_container_width=True):
-        
-        # USE THE EXACT SAME V_kN as displayed in table
-        V_kN_Report = V_design_kN 
-        T_kN_Report = T_design_kN
-        
-        is_sm520 = "SM520" in sel_mat_grade
-        Fy_plate = 355 if is_sm520 else 245
-        Fu_plate = 520 if is_sm520 else 400
-        
-        bolt_dict = {
-            'd': d_bolt, 'rows': rows, 'cols': cols, 's_v': s_v, 's_h': s_h,
-            'Fnv': final_Fnv, 'Fnt': selected_bolt['Fnt'], 'Fu':  selected_bolt['Fu']
-        }
-        beam_dict = { 'tw': section_data.get('tw', 6), 'Fy': section_data.get('Fy', 245), 'Fu': section_data.get('Fu', 400) }
-        plate_dict = {
-            't': t_plate, 'h': plate_geom['h'], 'w': plate_geom['w'],
-            'Fy': Fy_plate, 'Fu': Fu_plate, 'weld_size': weld_sz,
-            'e1': e1, 'lv': lv, 'l_side': leh
-        }
-        
+        st.session_state.conn_report_on = True
+
+    if st.session_state.get('conn_report_on'):
+        # trace เดียวกับตารางด้านบน: report จัดรูปแบบอย่างเดียว (ไม่คำนวณซ้ำ)
+        # header + conclusion แสดงทันที; รายละเอียดแต่ละ limit state สร้าง/render เมื่อเปิด expander
+        # (markdown แต่ละ section cache ใน shared_cache ด้วยค่าที่ section นั้นใช้)
+        trace = check_res['trace']
         try:
-            report_md = cr.generate_report(
-                V_load=V_kN_Report, T_load=T_kN_Report, beam=beam_dict, plate=plate_dict,
-                bolts=bolt_dict, cope=user_inputs['cope'], is_lrfd=is_lrfd,
-                material_grade=sel_mat_grade, bolt_grade=bolt_grade_name 
-            )
-            with st.container():
-                st.success("✅ Detailed Calculation Report Created!")
-                with st.expander("📜 View Full Calculation Note", expanded=True):
-                    st.markdown(report_md)
+            with st.container(border=True):
+                st.markdown(cr.header_md(trace, sel_mat_grade, bolt_grade_name))
+                st.markdown("### 📝 Conclusion")
+                st.markdown(cr.conclusion_md(trace))
+                st.caption("📜 Detailed derivation (open a check to render it)")
+                for sid, title, ratio, values in cr.report_sections(trace):
+                    icon = "✅" if ratio <= 1.0 else "❌"
+                    exp = st.expander(f"{title} — Ratio {ratio:.2f}", icon=icon, key=f"conn_report_{sid}", on_change="rerun")
+                    if exp.open:
+                        with exp:
+                            st.markdown(cr.section_md(sid, values))
+            # ทั้งฉบับประกอบเมื่อกดดาวน์โหลดเท่านั้น (callable)
+            st.download_button("⬇️ Download Calculation Note (.md)",
+                               lambda: cr.generate_report(trace, sel_mat_grade, bolt_grade_name),
+                               file_name="connection_report.md", mime="text/markdown")
         except Exception as e:
             st.error(f"❌ Error generating report: {e}")
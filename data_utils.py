@@ -1,5 +1,6 @@
 # data_utils.py
-# ฐานข้อมูลหน้าตัดเหล็กและวัสดุ
+# ฐานข้อมูลหน้าตัดเหล็ก
+# (กำลังของ bolt / plate อยู่ที่ strength_tables.BOLT_DB / PLATE_DB ที่เดียว)
 
 STEEL_DB = {
     "H 100x100x6x8":    {"h": 100, "b": 100, "tw": 6,   "tf": 8,   "Ix": 383,    "Zx": 76.5,  "w": 17.2},
@@ -18,9 +19,3 @@ STEEL_DB = {
     "H 500x200x10x16":  {"h": 500, "b": 200, "tw": 10,  "tf": 16,  "Ix": 47800,  "Zx": 1910,  "w": 89.6},
     "H 600x200x11x17":  {"h": 600, "b": 200, "tw": 11,  "tf": 17,  "Ix": 77600,  "Zx": 2590,  "w": 106},
 }
-
-BOLT_GRADES = {
-    "A325 (High Strength)": {"Fnv": 3720, "Ft": 6200, "Fu_bolt": 8400}, 
-    "Grade 8.8 (Standard)": {"Fnv": 3200, "Ft": 5600, "Fu_bolt": 8000},
-    "A490 (Premium)":        {"Fnv": 4960, "Ft": 7800, "Fu_bolt": 10500}
-}
@@ -0,0 +1,148 @@
+# design_atlas.py
+# Atlas ของกราฟออกแบบทั้ง catalog: Safe Load vs Span และ Deflection vs Span
+# - ทุก section × grade × method × Lb policy × span คำนวณใน beam_engine.evaluate ครั้งเดียว (broadcast)
+# - เก็บใน shared_cache (ต่อ process, ใช้ร่วมทุก session): rerun / เปลี่ยนหน้าตัดไม่ต้องคำนวณใหม่
+# - กราฟ overlay ทุกหน้าตัด; หน้าตัดที่ไม่ได้เลือกอยู่ใน legend (คลิกเปิด/ปิดใน browser ได้ทันที)
+import numpy as np
+import plotly.graph_objects as go
+
+import beam_engine
+import plot_utils
+import shared_cache
+
+GRADES = {"SS400": 2450.0, "SM520": 3550.0, "A36": 2500.0}  # Fy (ksc) เท่ากับ Steel Grade ใน sidebar
+METHODS = (True, False)                                       # LRFD, ASD
+LB_POLICIES = {"Lb = L": 1.0, "Lb = L/2": 0.5, "Lb = L/3": 1 / 3, "Lb = 0 (fully braced)": 0.0}
+SPANS = np.round(np.arange(1.0, 12.0 + 1e-9, 0.05), 2)        # m (ช่วงเดียวกับกราฟใน tab1 / tab_summary)
+NEIGHBOURS = 2  # หน้าตัดข้างเคียง (ต่อข้าง) ที่แสดงเป็นค่าเริ่มต้น
+
+# ==========================================
+# 🧮 1. ATLAS (vectorized, cache ต่อ process)
+# ==========================================
+@shared_cache.memoize("design_atlas.build")
+def build_atlas(defl_denom=360, E=beam_engine.E_STEEL):
+    """
+    Safe service load ของทุก [section, grade, method, Lb policy, span] ใน batch เดียว
+    + ค่าแอ่นตัวต่อโหลด 1 kg/m ของทุก [section, span] (Δ แปรผันตรงกับ w: คูณโหลดจริงทีหลัง)
+    """
+    names, cat = beam_engine.catalog_arrays()
+    props = {k: v[:, None, None, None, None] for k, v in cat.items()}
+    Fy = np.array(list(GRADES.values()))[None, :, None, None, None]
+    lrfd = np.array(METHODS)[None, None, :, None, None]
+    lb_ratio = np.array(list(LB_POLICIES.values()))[None, None, None, :, None]
+    span = SPANS[None, None, None, None, :]
+
+    res = beam_engine.evaluate(props, Fy, span, span * lb_ratio, lrfd, defl_denom, check_mode=False, E=E)
+    w_service = np.where(lrfd, res['w_safe'] / beam_engine.LRFD_DEFL_FACTOR, res['w_safe'])
+    L_cm = SPANS * 100
+    return {
+        'sections': names,
+        'weight': cat['weight'],
+        'w_safe': w_service.astype(np.float32),                   # [sec, grade, method, policy, span] kg/m
+        'gov': res['gov'].astype(np.int8),                        # index ใน CAPACITY_CAUSES
+        'Lp_m': res['Lp_cm'][:, :, 0, 0, 0] / 100,                # [sec, grade]
+        'Lr_m': res['Lr_cm'][:, :, 0, 0, 0] / 100,
+        'defl_per_w': (5 * 0.01 * L_cm**4) / (384 * E * cat['Ix'][:, None]),  # [sec, span] cm ต่อ 1 kg/m
+    }
+
+def nearest_grade(Fy):
+    """Fy (ksc) -> ชื่อเกรดใน atlas ที่ใกล้ที่สุด (Custom Grade ใช้เกรดใกล้เคียง)"""
+    return min(GRADES, key=lambda g: abs(GRADES[g] - Fy))
+
+def nearest_policy(user_span, Lb):
+    ratio = Lb / user_span if user_span > 0 else 1.0
+    return min(LB_POLICIES, key=lambda p: abs(LB_POLICIES[p] - ratio))
+
+def default_sections(sec_name):
+    """หน้าตัดปัจจุบัน + ข้างเคียงใน catalog (หน้าตัด custom -> ไม่มีค่าเริ่มต้น)"""
+    names, _ = beam_engine.catalog_arrays()
+    if sec_name not in names:
+        return []
+    i = names.index(sec_name)
+    return names[max(0, i - NEIGHBOURS):i + NEIGHBOURS + 1]
+
+# ==========================================
+# 📈 2. FIGURES
+# ==========================================
+def _label(atlas, i):
+    return f"{atlas['sections'][i]} ({atlas['weight'][i]:.1f} kg/m)"
+
+@shared_cache.memoize("design_atlas.safe_load_figure")
+def safe_load_figure(defl_denom, grade, is_lrfd, policy, shown, current=None, webgl=False):
+    """Safe Load vs Span ของทุกหน้าตัด (shown = แสดง, ที่เหลือ legendonly)"""
+    atlas = build_atlas(defl_denom)
+    g, m = list(GRADES).index(grade), METHODS.index(is_lrfd)
+    p = list(LB_POLICIES).index(policy)
+    ratio = LB_POLICIES[policy]
+
+    fig = go.Figure()
+    for i, name in enumerate(atlas['sections']):
+        # ขอบ zone LTB บนแกน span (Lb = ratio · L) -> เก็บไว้ตอน decimate
+        zones = (atlas['Lp_m'][i, g] / ratio, atlas['Lr_m'][i, g] / ratio) if ratio > 0 else ()
+        fig.add_trace(plot_utils.line(
+            SPANS, atlas['w_safe'][i, g, m, p], keep_x=zones, webgl=webgl, name=_label(atlas, i),
+            visible=True if name in shown else "legendonly",
+            line=dict(width=4 if name == current else 1.5),
+            hovertemplate=f"{name}<br>L = %{{x:.2f}} m<br>w = %{{y:,.0f}} kg/m<extra></extra>"))
+    fig.update_layout(height=480, margin=dict(l=10, r=10, t=40, b=10),
+                      title=f"Safe Service Load vs Span · {grade} · {'LRFD' if is_lrfd else 'ASD'} · {policy} · L/{defl_denom}",
+                      xaxis_title="Span (m)", yaxis=dict(title="Safe Service Load (kg/m)", type="log"))
+    return fig
+
+@shared_cache.memoize("design_atlas.deflection_figure")
+def deflection_figure(w_load, defl_denom, shown, current=None, E=beam_engine.E_STEEL, webgl=False):
+    """Deflection vs Span ที่โหลด w_load (kg/m) ของทุกหน้าตัด + เส้น Allowable L/denom"""
+    atlas = build_atlas(defl_denom, E)
+    allow = SPANS * 100 / defl_denom
+
+    fig = go.Figure()
+    fig.add_trace(plot_utils.line(SPANS, allow, webgl=webgl, name=f"Allowable Limit (L/{defl_denom:.0f})",
+                                  line=dict(color='green', dash='dash')))
+    for i, name in enumerate(atlas['sections']):
+        fig.add_trace(plot_utils.line(
+            SPANS, atlas['defl_per_w'][i] * w_load, webgl=webgl, name=_label(atlas, i),
+            visible=True if name in shown else "legendonly",
+            line=dict(width=4 if name == current else 1.5),
+            hovertemplate=f"{name}<br>L = %{{x:.2f}} m<br>Δ = %{{y:.2f}} cm<extra></extra>"))
+    fig.update_layout(height=480, margin=dict(l=10, r=10, t=40, b=10),
+                      title=f"Deflection vs Span (Load = {w_load:,.0f} kg/m)",
+                      xaxis=dict(title="Span (m)", range=[0, 12]),
+                      yaxis=dict(title="Deflection (cm)", range=[0, 2 * allow[-1]]))
+    return fig
+
+# ==========================================
+# 🖥️ 3. UI
+# ==========================================
+def _section_picker(data, key):
+    import streamlit as st
+
+    names, _ = beam_engine.catalog_arrays()
+    return tuple(st.multiselect("Sections shown (others: click in the legend)", names,
+                                default=default_sections(data.get('sec_name')), key=key))
+
+def render_safe_load(data):
+    """Atlas ของ Safe Load vs Span (ใช้ grade / method / Lb จาก sidebar เป็นค่าเริ่มต้น)"""
+    import streamlit as st
+
+    c1, c2, c3 = st.columns(3)
+    grades = list(GRADES)
+    grade = c1.selectbox("Grade", grades, index=grades.index(nearest_grade(data['Fy'])), key="atlas_grade")
+    method = c2.radio("Method", ["LRFD", "ASD"], index=0 if data['is_lrfd'] else 1, horizontal=True, key="atlas_method")
+    policies = list(LB_POLICIES)
+    policy = c3.selectbox("Lb policy", policies, index=policies.index(nearest_policy(data['user_span'], data['Lb'])),
+                          key="atlas_policy")
+    shown = _section_picker(data, "atlas_sections")
+    fig = safe_load_figure(int(data['defl_denom']), grade, method == "LRFD", policy, shown,
+                           data.get('sec_name'), plot_utils.high_density())
+    st.plotly_chart(fig, use_container_width=True)
+    if data['Fy'] not in GRADES.values():
+        st.caption(f"ℹ️ Custom Fy {data['Fy']:,.0f} ksc: the atlas uses the nearest standard grade.")
+
+def render_deflection(data, w_load):
+    """Atlas ของ Deflection vs Span ที่โหลดเดียวกับกราฟหลัก"""
+    import streamlit as st
+
+    shown = _section_picker(data, "atlas_defl_sections")
+    fig = deflection_figure(float(w_load), int(data['defl_denom']), shown, data.get('sec_name'),
+                            float(data.get('E', beam_engine.E_STEEL)), plot_utils.high_density())
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,5 +1,9 @@
+import html
+import re
+
 import plotly.graph_objects as go
 import numpy as np
+import shared_cache
 
 # =============================================================================
 # 🎨 STYLES & CONFIG (รูปแบบเดิม)
@@ -14,64 +18,140 @@ STYLE = {
     'DIM':         dict(color="#1D4ED8", family="Arial", size=11), # สีน้ำเงินแบบเดิม
 }
 
+NO_LINE = dict(width=0)
+HOLE = dict(fillcolor="white", line=dict(color="black", width=1))
+PRECISION = 1   # ทศนิยมของพิกัด (mm) ใน path
+KAPPA = 0.5523  # ควบคุม Bézier 4 ส่วนสำหรับวงกลม
+
+# Template ขนาดเล็กแทน template "plotly" (~9 KB ต่อรูป): แกนถูกซ่อนอยู่แล้ว ใช้แค่สี font
+TEMPLATE = dict(layout=dict(font=dict(color="#2a3f5f")))
+
+# =============================================================================
+# 🧱 CANVAS (รวม shape ตาม style: 1 path ต่อ style แทน add_shape ทีละชิ้น)
+# =============================================================================
+def _f(v):
+    """พิกัดปัดเป็นความละเอียดของแบบ (ตัด .0 ท้าย) ลดขนาด JSON"""
+    v = round(float(v), PRECISION)
+    return str(int(v)) if v == int(v) else str(v)
+
+class Canvas:
+    """
+    สะสม geometry แล้วสร้าง Figure ครั้งเดียว
+    - shape ที่ style เดียวกันรวมเป็น path shape เดียว (ลำดับ z = ลำดับที่ style ถูกใช้ครั้งแรก)
+    - วงกลม = Bézier path, annotation ใส่ layout ทีเดียว
+    """
+    def __init__(self):
+        self._groups = {}      # (fillcolor, line color, width, dash) -> [subpath, ...]
+        self.annotations = []
+        self.traces = []
+
+    def _add(self, subpath, fillcolor=None, line=None):
+        line = line or NO_LINE
+        key = (fillcolor, line.get('color'), line.get('width', 1), line.get('dash'))
+        self._groups.setdefault(key, []).append(subpath)
+
+    def rect(self, x0, y0, x1, y1, fillcolor=None, line=None):
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        self._add(f"M{_f(x0)},{_f(y0)}H{_f(x1)}V{_f(y1)}H{_f(x0)}Z", fillcolor, line)
+
+    def line(self, x0, y0, x1, y1, line):
+        self._add(f"M{_f(x0)},{_f(y0)}L{_f(x1)},{_f(y1)}", None, line)
+
+    def polygon(self, pts, fillcolor=None, line=None):
+        head, *rest = pts
+        self._add(f"M{_f(head[0])},{_f(head[1])}" + "".join(f"L{_f(x)},{_f(y)}" for x, y in rest) + "Z", fillcolor, line)
+
+    def circle(self, cx, cy, r, fillcolor=None, line=None):
+        k = KAPPA * r
+        pts = [(cx + r, cy), (cx + r, cy + k), (cx + k, cy + r), (cx, cy + r),
+               (cx - k, cy + r), (cx - r, cy + k), (cx - r, cy),
+               (cx - r, cy - k), (cx - k, cy - r), (cx, cy - r),
+               (cx + k, cy - r), (cx + r, cy - k), (cx + r, cy)]
+        xy = [f"{_f(x)},{_f(y)}" for x, y in pts]
+        self._add(f"M{xy[0]}C{' '.join(xy[1:4])}C{' '.join(xy[4:7])}C{' '.join(xy[7:10])}C{' '.join(xy[10:13])}Z", fillcolor, line)
+
+    def annotate(self, **kwargs):
+        self.annotations.append(kwargs)
+
+    def shapes(self):
+        out = []
+        for (fill, color, width, dash), subpaths in self._groups.items():
+            line = dict(width=width)
+            if color is not None:
+                line['color'] = color
+            if dash is not None:
+                line['dash'] = dash
+            out.append(dict(type="path", path="".join(subpaths), line=line,
+                            fillcolor=fill or "rgba(0,0,0,0)"))
+        return out
+
+    def to_figure(self, **layout):
+        return go.Figure(data=self.traces, layout=dict(
+            shapes=self.shapes(), annotations=self.annotations, template=TEMPLATE, **layout))
+
 # =============================================================================
 # 🛠️ HELPER FUNCTIONS (กลับไปใช้แบบมีหัวลูกศร)
 # =============================================================================
-def add_dim(fig, x0, y0, x1, y1, text, offset=30, type="h"):
+def add_dim(cv, x0, y0, x1, y1, text, offset=30, type="h"):
     """เขียน Dimension แบบมีหัวลูกศร (Arrow Style - แบบเดิมที่ต้องการ)"""
     c = STYLE['DIM']['color']
-    if type == "h": 
+    main, leg = dict(color=c, width=1), dict(color=c, width=0.5)
+    arrow = dict(axref="pixel", ayref="pixel", arrowhead=2, arrowsize=1, arrowcolor=c, text="")
+    if type == "h":
         y_pos = y0 + offset
         # เส้นหลัก
-        fig.add_shape(type="line", x0=x0, y0=y_pos, x1=x1, y1=y_pos, line=dict(color=c, width=1))
+        cv.line(x0, y_pos, x1, y_pos, main)
         # ขาหยั่ง
         dir = 1 if offset >= 0 else -1
-        fig.add_shape(type="line", x0=x0, y0=y0, x1=x0, y1=y_pos+(5*dir), line=dict(color=c, width=0.5))
-        fig.add_shape(type="line", x0=x1, y0=y1, x1=x1, y1=y_pos+(5*dir), line=dict(color=c, width=0.5))
+        cv.line(x0, y0, x0, y_pos+(5*dir), leg)
+        cv.line(x1, y1, x1, y_pos+(5*dir), leg)
         # หัวลูกศร
-        fig.add_annotation(x=x0, y=y_pos, ax=15, ay=0, axref="pixel", ayref="pixel", arrowhead=2, arrowsize=1, arrowcolor=c, text="")
-        fig.add_annotation(x=x1, y=y_pos, ax=-15, ay=0, axref="pixel", ayref="pixel", arrowhead=2, arrowsize=1, arrowcolor=c, text="")
+        cv.annotate(x=x0, y=y_pos, ax=15, ay=0, **arrow)
+        cv.annotate(x=x1, y=y_pos, ax=-15, ay=0, **arrow)
         # ข้อความ
-        fig.add_annotation(x=(x0+x1)/2, y=y_pos, text=f"<b>{text}</b>", showarrow=False, yshift=10*dir, font=dict(size=11, color=c))
+        cv.annotate(x=(x0+x1)/2, y=y_pos, text=f"<b>{text}</b>", showarrow=False, yshift=10*dir, font=dict(size=11, color=c))
     else: # Vertical
         x_pos = x0 + offset
         dir = 1 if offset >= 0 else -1
         # เส้นหลัก
-        fig.add_shape(type="line", x0=x_pos, y0=y0, x1=x_pos, y1=y1, line=dict(color=c, width=1))
+        cv.line(x_pos, y0, x_pos, y1, main)
         # ขาหยั่ง
-        fig.add_shape(type="line", x0=x0, y0=y0, x1=x_pos+(5*dir), y1=y0, line=dict(color=c, width=0.5))
-        fig.add_shape(type="line", x0=x1, y0=y1, x1=x_pos+(5*dir), y1=y1, line=dict(color=c, width=0.5))
+        cv.line(x0, y0, x_pos+(5*dir), y0, leg)
+        cv.line(x1, y1, x_pos+(5*dir), y1, leg)
         # หัวลูกศร
-        fig.add_annotation(x=x_pos, y=y0, ax=0, ay=15, axref="pixel", ayref="pixel", arrowhead=2, arrowsize=1, arrowcolor=c, text="")
-        fig.add_annotation(x=x_pos, y=y1, ax=0, ay=-15, axref="pixel", ayref="pixel", arrowhead=2, arrowsize=1, arrowcolor=c, text="")
+        cv.annotate(x=x_pos, y=y0, ax=0, ay=15, **arrow)
+        cv.annotate(x=x_pos, y=y1, ax=0, ay=-15, **arrow)
         # ข้อความ
-        fig.add_annotation(x=x_pos, y=(y0+y1)/2, text=f"<b>{text}</b>", showarrow=False, xshift=15*dir, textangle=-90, font=dict(size=11, color=c))
+        cv.annotate(x=x_pos, y=(y0+y1)/2, text=f"<b>{text}</b>", showarrow=False, xshift=15*dir, textangle=-90, font=dict(size=11, color=c))
 
-def add_leader(fig, x, y, text, ax=40, ay=-40, align="left"):
-    fig.add_annotation(x=x, y=y, ax=ax, ay=ay, axref="pixel", ayref="pixel", text=f"<b>{text}</b>", showarrow=True, arrowhead=2, arrowsize=1, font=dict(size=11), align=align, bgcolor="rgba(255,255,255,0.8)")
+def add_leader(cv, x, y, text, ax=40, ay=-40, align="left"):
+    cv.annotate(x=x, y=y, ax=ax, ay=ay, axref="pixel", ayref="pixel", text=f"<b>{text}</b>", showarrow=True, arrowhead=2, arrowsize=1, font=dict(size=11), align=align, bgcolor="rgba(255,255,255,0.8)")
 
-def draw_h_beam_section(fig, x_cen, y_cen, h, b, tf, tw, style, orientation="I"):
+def draw_h_beam_section(cv, x_cen, y_cen, h, b, tf, tw, style, orientation="I"):
+    fill, line = style['fillcolor'], style['line']
     if orientation == "I":
-        fig.add_shape(type="path", path=f"M {x_cen-tw/2} {y_cen-h/2+tf} L {x_cen-tw/2} {y_cen+h/2-tf} L {x_cen+tw/2} {y_cen+h/2-tf} L {x_cen+tw/2} {y_cen-h/2+tf} Z", fillcolor=style['fillcolor'], line=dict(width=0))
-        fig.add_shape(type="rect", x0=x_cen-b/2, y0=y_cen+h/2-tf, x1=x_cen+b/2, y1=y_cen+h/2, fillcolor=style['fillcolor'], line=style['line'])
-        fig.add_shape(type="rect", x0=x_cen-b/2, y0=y_cen-h/2, x1=x_cen+b/2, y1=y_cen-h/2+tf, fillcolor=style['fillcolor'], line=style['line'])
-        fig.add_shape(type="line", x0=x_cen-tw/2, y0=y_cen-h/2+tf, x1=x_cen-tw/2, y1=y_cen+h/2-tf, line=style['line'])
-        fig.add_shape(type="line", x0=x_cen+tw/2, y0=y_cen-h/2+tf, x1=x_cen+tw/2, y1=y_cen+h/2-tf, line=style['line'])
-    else: 
-        fig.add_shape(type="rect", x0=x_cen-h/2, y0=y_cen-b/2, x1=x_cen-h/2+tf, y1=y_cen+b/2, fillcolor=style['fillcolor'], line=style['line'])
-        fig.add_shape(type="rect", x0=x_cen+h/2-tf, y0=y_cen-b/2, x1=x_cen+h/2, y1=y_cen+b/2, fillcolor=style['fillcolor'], line=style['line'])
-        fig.add_shape(type="rect", x0=x_cen-h/2+tf, y0=y_cen-tw/2, x1=x_cen+h/2-tf, y1=y_cen+tw/2, fillcolor=style['fillcolor'], line=dict(width=0))
-        fig.add_shape(type="line", x0=x_cen-h/2+tf, y0=y_cen-tw/2, x1=x_cen+h/2-tf, y1=y_cen-tw/2, line=style['line'])
-        fig.add_shape(type="line", x0=x_cen-h/2+tf, y0=y_cen+tw/2, x1=x_cen+h/2-tf, y1=y_cen+tw/2, line=style['line'])
-
-def force_range(fig, limit):
-    fig.update_layout(xaxis=dict(range=[-limit, limit], visible=False, scaleanchor="y", scaleratio=1, fixedrange=True), yaxis=dict(range=[-limit, limit], visible=False, fixedrange=True), height=500, margin=dict(l=20, r=20, t=50, b=20), plot_bgcolor="white", showlegend=False)
+        cv.rect(x_cen-tw/2, y_cen-h/2+tf, x_cen+tw/2, y_cen+h/2-tf, fill)
+        cv.rect(x_cen-b/2, y_cen+h/2-tf, x_cen+b/2, y_cen+h/2, fill, line)
+        cv.rect(x_cen-b/2, y_cen-h/2, x_cen+b/2, y_cen-h/2+tf, fill, line)
+        cv.line(x_cen-tw/2, y_cen-h/2+tf, x_cen-tw/2, y_cen+h/2-tf, line)
+        cv.line(x_cen+tw/2, y_cen-h/2+tf, x_cen+tw/2, y_cen+h/2-tf, line)
+    else:
+        cv.rect(x_cen-h/2, y_cen-b/2, x_cen-h/2+tf, y_cen+b/2, fill, line)
+        cv.rect(x_cen+h/2-tf, y_cen-b/2, x_cen+h/2, y_cen+b/2, fill, line)
+        cv.rect(x_cen-h/2+tf, y_cen-tw/2, x_cen+h/2-tf, y_cen+tw/2, fill)
+        cv.line(x_cen-h/2+tf, y_cen-tw/2, x_cen+h/2-tf, y_cen-tw/2, line)
+        cv.line(x_cen-h/2+tf, y_cen+tw/2, x_cen+h/2-tf, y_cen+tw/2, line)
+
+def view_layout(limit, title):
+    """layout ของทุก view (กำหนดครั้งเดียวตอนสร้าง Figure)"""
+    return dict(xaxis=dict(range=[-limit, limit], visible=False, scaleanchor="y", scaleratio=1, fixedrange=True), yaxis=dict(range=[-limit, limit], visible=False, fixedrange=True), height=500, margin=dict(l=20, r=20, t=50, b=20), plot_bgcolor="white", showlegend=False, title_text=title)
 
 # =============================================================================
 # 3. FRONT VIEW (ELEVATION) - ใส่ระยะครบ
 # =============================================================================
 def create_front_view(beam, plate, inp):
-    fig = go.Figure()
+    cv = Canvas()
     ctype = plate.get('type', 'Fin Plate')
     h_b = beam['h']
     h_pl, w_pl = plate['h'], plate['w']
@@ -81,207 +161,308 @@ def create_front_view(beam, plate, inp):
     sb = inp['setback']
 
     # Context elements (Cleaner style)
-    fig.add_shape(type="line", x0=0, y0=-h_b/2-50, x1=0, y1=h_b/2+50, line=dict(color="black", width=2)) # Col CL
-    
+    cv.line(0, -h_b/2-50, 0, h_b/2+50, dict(color="black", width=2)) # Col CL
+
     if "End" in ctype:
         # --- END PLATE ---
         draw_w = max(beam['b'], w_pl)
         y_top, y_bot = h_pl/2, -h_pl/2
-        fig.add_shape(type="rect", x0=-draw_w/2, y0=y_bot, x1=draw_w/2, y1=y_top, fillcolor=STYLE['PLATE']['fillcolor'], line=STYLE['PLATE']['line'])
-        
+        cv.rect(-draw_w/2, y_bot, draw_w/2, y_top, **STYLE['PLATE'])
+
         g = sh # Gauge
         start_y = y_top - lv
         for s in [-1, 1]:
             bx = s*g/2
             for r in range(rows):
-                by = start_y - (r*sv)
-                fig.add_shape(type="circle", x0=bx-d/2, y0=by-d/2, x1=bx+d/2, y1=by+d/2, fillcolor="white", line=dict(color="black", width=1))
-        
-        add_leader(fig, -draw_w/2, y_top, "End Plate", ax=-40, ay=-40)
+                cv.circle(bx, start_y - (r*sv), d/2, **HOLE)
+
+        add_leader(cv, -draw_w/2, y_top, "End Plate", ax=-40, ay=-40)
         # Dimensions (Full set)
         dim_x = draw_w/2 + 20
-        add_dim(fig, dim_x, y_top, dim_x, y_top-lv, f"lv={lv}", 20, "v") # Top edge
+        add_dim(cv, dim_x, y_top, dim_x, y_top-lv, f"lv={lv}", 20, "v") # Top edge
         if rows > 1:
-            add_dim(fig, dim_x, y_top-lv, dim_x, y_top-lv-((rows-1)*sv), f"{rows-1}@{sv}", 20, "v") # Pitch
-        add_dim(fig, dim_x+30, y_top, dim_x+30, y_bot, f"H={h_pl}", 20, "v") # Total Height
-        add_dim(fig, -g/2, y_bot-30, g/2, y_bot-30, f"Gauge={g}", -20, "h") # Gauge
+            add_dim(cv, dim_x, y_top-lv, dim_x, y_top-lv-((rows-1)*sv), f"{rows-1}@{sv}", 20, "v") # Pitch
+        add_dim(cv, dim_x+30, y_top, dim_x+30, y_bot, f"H={h_pl}", 20, "v") # Total Height
+        add_dim(cv, -g/2, y_bot-30, g/2, y_bot-30, f"Gauge={g}", -20, "h") # Gauge
         draw_h_final = h_pl
 
     else:
         # --- FIN / ANGLE ---
         # Beam ghost
-        fig.add_shape(type="rect", x0=sb, y0=-h_b/2, x1=w_pl+100, y1=h_b/2, fillcolor=STYLE['STEEL_FACE']['fillcolor'], line=dict(color="gray", width=1, dash="dot"))
-        
+        cv.rect(sb, -h_b/2, w_pl+100, h_b/2, STYLE['STEEL_FACE']['fillcolor'], dict(color="gray", width=1, dash="dot"))
+
         y_top, y_bot = h_pl/2, -h_pl/2
         style = STYLE['ANGLE'] if "Double" in ctype else STYLE['PLATE']
-        fig.add_shape(type="rect", x0=0, y0=y_bot, x1=w_pl, y1=y_top, fillcolor=style['fillcolor'], line=style['line'])
+        cv.rect(0, y_bot, w_pl, y_top, **style)
 
         # Calculate bolt starting position relative to Plate Right Edge
         # Plate Width = Setback + e1 + BoltGroup + leh
         # First bolt X (from col center) = Setback + e1
         first_bolt_x = sb + inp['e1']
         start_y = y_top - lv
-        
-        bolt_count = 0
+
         for c in range(cols):
             cx = first_bolt_x + (c * sh)
             for r in range(rows):
-                cy = start_y - (r * sv)
-                fig.add_shape(type="circle", x0=cx-d/2, y0=cy-d/2, x1=cx+d/2, y1=cy+d/2, fillcolor="white", line=dict(color="black", width=1))
-                bolt_count += 1
-        
+                cv.circle(cx, start_y - (r * sv), d/2, **HOLE)
+
         lbl = "2L-Angle" if "Double" in ctype else "Fin Plate"
-        add_leader(fig, w_pl, y_top, lbl, ax=40, ay=-40)
-        
+        add_leader(cv, w_pl, y_top, lbl, ax=40, ay=-40)
+
         # Dimensions (Full set)
         # Vertical
         dim_x_v = w_pl + 20
-        add_dim(fig, dim_x_v, y_top, dim_x_v, y_top-lv, f"lv={lv}", 20, "v") # Top edge
+        add_dim(cv, dim_x_v, y_top, dim_x_v, y_top-lv, f"lv={lv}", 20, "v") # Top edge
         if rows > 1:
-            add_dim(fig, dim_x_v, y_top-lv, dim_x_v, y_top-lv-((rows-1)*sv), f"{rows-1}@{sv}", 20, "v") # Pitch
-        add_dim(fig, dim_x_v+30, y_top, dim_x_v+30, y_bot, f"H={h_pl}", 20, "v") # Total Height
-        
+            add_dim(cv, dim_x_v, y_top-lv, dim_x_v, y_top-lv-((rows-1)*sv), f"{rows-1}@{sv}", 20, "v") # Pitch
+        add_dim(cv, dim_x_v+30, y_top, dim_x_v+30, y_bot, f"H={h_pl}", 20, "v") # Total Height
+
         # Horizontal
         last_bolt_x = first_bolt_x + ((cols-1)*sh)
         dim_y_h = y_bot - 20
-        add_dim(fig, last_bolt_x, dim_y_h, w_pl, dim_y_h, f"leh={leh}", -20, "h") # Edge Horiz
+        add_dim(cv, last_bolt_x, dim_y_h, w_pl, dim_y_h, f"leh={leh}", -20, "h") # Edge Horiz
         if cols > 1:
-             add_dim(fig, first_bolt_x, dim_y_h, last_bolt_x, dim_y_h, f"{cols-1}@{sh}", -20, "h") # Spacing Horiz
-        add_dim(fig, 0, dim_y_h-30, w_pl, dim_y_h-30, f"W={w_pl}", -20, "h") # Total Width
+             add_dim(cv, first_bolt_x, dim_y_h, last_bolt_x, dim_y_h, f"{cols-1}@{sh}", -20, "h") # Spacing Horiz
+        add_dim(cv, 0, dim_y_h-30, w_pl, dim_y_h-30, f"W={w_pl}", -20, "h") # Total Width
 
         draw_h_final = h_pl
 
     limit = max(h_b, draw_h_final) + 100
-    force_range(fig, limit/2)
-    fig.update_layout(title_text=f"<b>ELEVATION VIEW</b> : {ctype}")
-    return fig
+    return cv.to_figure(**view_layout(limit/2, f"<b>ELEVATION VIEW</b> : {ctype}"))
 
 # =============================================================================
 # 4. SIDE VIEW (SECTION)
 # =============================================================================
 def create_side_view(beam, plate, inp):
-    fig = go.Figure()
+    cv = Canvas()
     ctype = plate.get('type', 'Fin Plate')
     h, b, tf, tw = beam['h'], beam['b'], beam['tf'], beam['tw']
     hp, tp = plate['h'], inp['t']
     rows, sv, lv = inp['rows'], inp['s_v'], inp['lv']
     d = inp['d']
+    bolt = STYLE['BOLT']['fillcolor']
 
     # Column (Background)
     col_w, col_h = b + 50, h + 150
-    fig.add_shape(type="rect", x0=-col_w/2, y0=-col_h/2, x1=col_w/2, y1=col_h/2, fillcolor=STYLE['STEEL_FACE']['fillcolor'], line=dict(color="black", width=2))
-    fig.add_trace(go.Scatter(x=[-col_w/2, col_w/2, col_w/2, -col_w/2], y=[-col_h/2, -col_h/2, col_h/2, col_h/2], mode='lines', line=dict(width=0), hoverinfo='skip', fillpattern=dict(shape="/", size=10, solidity=0.2, fgcolor="#D1D5DB"), fill='toself'))
+    cv.rect(-col_w/2, -col_h/2, col_w/2, col_h/2, STYLE['STEEL_FACE']['fillcolor'], dict(color="black", width=2))
+    cv.traces.append(go.Scatter(x=[-col_w/2, col_w/2, col_w/2, -col_w/2], y=[-col_h/2, -col_h/2, col_h/2, col_h/2], mode='lines', line=dict(width=0), hoverinfo='skip', fillpattern=dict(shape="/", size=10, solidity=0.2, fgcolor="#D1D5DB"), fill='toself'))
 
     if "End" in ctype:
         # End Plate Side
-        fig.add_shape(type="rect", x0=0, y0=-hp/2, x1=tp, y1=hp/2, fillcolor=STYLE['PLATE']['fillcolor'], line=STYLE['PLATE']['line'])
+        cv.rect(0, -hp/2, tp, hp/2, **STYLE['PLATE'])
         L=250
-        fig.add_shape(type="rect", x0=tp, y0=-h/2, x1=tp+L, y1=h/2, fillcolor=STYLE['STEEL_FACE']['fillcolor'], line=dict(width=0))
-        fig.add_shape(type="line", x0=tp, y0=h/2, x1=tp+L, y1=h/2, line=dict(color="black", width=2))
-        fig.add_shape(type="line", x0=tp, y0=-h/2, x1=tp+L, y1=-h/2, line=dict(color="black", width=2))
+        cv.rect(tp, -h/2, tp+L, h/2, STYLE['STEEL_FACE']['fillcolor'])
+        cv.line(tp, h/2, tp+L, h/2, dict(color="black", width=2))
+        cv.line(tp, -h/2, tp+L, -h/2, dict(color="black", width=2))
         start_y = hp/2 - lv
         for r in range(rows):
             y = start_y - (r*sv)
-            fig.add_shape(type="rect", x0=-20, y0=y-d/2, x1=tp+15, y1=y+d/2, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-            fig.add_shape(type="rect", x0=tp, y0=y-d, x1=tp+10, y1=y+d, fillcolor="black", line=dict(width=0))
-        add_leader(fig, tp, hp/2, "End Plate", ax=40, ay=-40)
+            cv.rect(-20, y-d/2, tp+15, y+d/2, bolt)
+            cv.rect(tp, y-d, tp+10, y+d, "black")
+        add_leader(cv, tp, hp/2, "End Plate", ax=40, ay=-40)
 
     elif "Double" in ctype:
         # Double Angle Side
-        draw_h_beam_section(fig, 0, 0, h, b, tf, tw, STYLE['STEEL_CUT'], "I")
-        fig.add_shape(type="rect", x0=-tw/2-tp, y0=-hp/2, x1=-tw/2, y1=hp/2, fillcolor=STYLE['ANGLE']['fillcolor'], line=STYLE['ANGLE']['line'])
-        fig.add_shape(type="rect", x0=tw/2, y0=-hp/2, x1=tw/2+tp, y1=hp/2, fillcolor=STYLE['ANGLE']['fillcolor'], line=STYLE['ANGLE']['line'])
+        draw_h_beam_section(cv, 0, 0, h, b, tf, tw, STYLE['STEEL_CUT'], "I")
+        cv.rect(-tw/2-tp, -hp/2, -tw/2, hp/2, **STYLE['ANGLE'])
+        cv.rect(tw/2, -hp/2, tw/2+tp, hp/2, **STYLE['ANGLE'])
         start_y = hp/2 - lv
         for r in range(rows):
             y = start_y - (r*sv)
-            fig.add_shape(type="rect", x0=-tw/2-tp-15, y0=y-d/2, x1=tw/2+tp+15, y1=y+d/2, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-        add_leader(fig, tw/2+tp, 0, "2L-Angle", ax=40, ay=-40)
+            cv.rect(-tw/2-tp-15, y-d/2, tw/2+tp+15, y+d/2, bolt)
+        add_leader(cv, tw/2+tp, 0, "2L-Angle", ax=40, ay=-40)
 
     else:
         # Fin Plate Side
-        draw_h_beam_section(fig, 0, 0, h, b, tf, tw, STYLE['STEEL_CUT'], "I")
-        fig.add_shape(type="rect", x0=tw/2, y0=-hp/2, x1=tw/2+tp, y1=hp/2, fillcolor=STYLE['PLATE']['fillcolor'], line=STYLE['PLATE']['line'])
+        draw_h_beam_section(cv, 0, 0, h, b, tf, tw, STYLE['STEEL_CUT'], "I")
+        cv.rect(tw/2, -hp/2, tw/2+tp, hp/2, **STYLE['PLATE'])
         y_start = hp/2 - lv
         for r in range(rows):
             y = y_start - (r * sv)
-            fig.add_shape(type="line", x0=-col_w/2, y0=y, x1=col_w/2, y1=y, line=STYLE['CL'])
-            fig.add_shape(type="rect", x0=-tw/2-15, y0=y-d/2, x1=tw/2+tp+15, y1=y+d/2, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-            fig.add_shape(type="rect", x0=tw/2+tp, y0=y-d, x1=tw/2+tp+10, y1=y+d, fillcolor="black", line=dict(width=0))
-            fig.add_shape(type="rect", x0=-tw/2-12, y0=y-d, x1=-tw/2, y1=y+d, fillcolor="black", line=dict(width=0))
-        add_dim(fig, -b/2-30, h/2, -b/2-30, -h/2, f"Beam H={h}", 30, "v") # Added Beam Depth
-        add_leader(fig, tw/2+tp, 0, "Fin Plate", ax=40, ay=-30)
+            cv.line(-col_w/2, y, col_w/2, y, STYLE['CL'])
+            cv.rect(-tw/2-15, y-d/2, tw/2+tp+15, y+d/2, bolt)
+            cv.rect(tw/2+tp, y-d, tw/2+tp+10, y+d, "black")
+            cv.rect(-tw/2-12, y-d, -tw/2, y+d, "black")
+        add_dim(cv, -b/2-30, h/2, -b/2-30, -h/2, f"Beam H={h}", 30, "v") # Added Beam Depth
+        add_leader(cv, tw/2+tp, 0, "Fin Plate", ax=40, ay=-30)
 
     limit = max(h, hp) + 100
-    force_range(fig, limit/2)
-    fig.update_layout(title_text=f"<b>SECTION A-A</b> : {ctype}")
-    return fig
+    return cv.to_figure(**view_layout(limit/2, f"<b>SECTION A-A</b> : {ctype}"))
 
 # =============================================================================
 # 5. PLAN VIEW (TOP)
 # =============================================================================
 def create_plan_view(beam, plate, inp):
-    fig = go.Figure()
+    cv = Canvas()
     ctype = plate.get('type', 'Fin Plate')
     h, b, tf, tw = beam['h'], beam['b'], beam['tf'], beam['tw']
     wp, tp = plate['w'], inp['t']
     d = inp['d']
     sb = inp['setback']
-    
+    bolt = STYLE['BOLT']['fillcolor']
+
     # Column Section
     col_h, col_b = max(300, b+50), max(300, b+50)
-    draw_h_beam_section(fig, -col_h/2, 0, col_h, col_b, 16, 12, STYLE['STEEL_CUT'], "H")
+    draw_h_beam_section(cv, -col_h/2, 0, col_h, col_b, 16, 12, STYLE['STEEL_CUT'], "H")
 
     if "End" in ctype:
         # End Plate Plan
-        fig.add_shape(type="rect", x0=0, y0=-wp/2, x1=tp, y1=wp/2, fillcolor=STYLE['PLATE']['fillcolor'], line=STYLE['PLATE']['line'])
-        fig.add_shape(type="rect", x0=tp, y0=-b/2, x1=tp+250, y1=b/2, fillcolor=STYLE['STEEL_FACE']['fillcolor'], line=STYLE['STEEL_FACE']['line'])
-        fig.add_shape(type="line", x0=tp, y0=0, x1=tp+250, y1=0, line=STYLE['CL'])
+        cv.rect(0, -wp/2, tp, wp/2, **STYLE['PLATE'])
+        cv.rect(tp, -b/2, tp+250, b/2, **STYLE['STEEL_FACE'])
+        cv.line(tp, 0, tp+250, 0, STYLE['CL'])
         g = inp['s_h']
         for s in [-1, 1]:
             y_b = s*g/2
-            fig.add_shape(type="rect", x0=-20, y0=y_b-d/2, x1=tp+15, y1=y_b+d/2, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-            fig.add_shape(type="rect", x0=tp, y0=y_b-d, x1=tp+10, y1=y_b+d, fillcolor="black", line=dict(width=0))
-        add_leader(fig, tp, wp/2, "End Plate", ax=40, ay=-40)
-        add_dim(fig, 0, -wp/2-30, tp, -wp/2-30, f"t={tp}", -20, "h")
+            cv.rect(-20, y_b-d/2, tp+15, y_b+d/2, bolt)
+            cv.rect(tp, y_b-d, tp+10, y_b+d, "black")
+        add_leader(cv, tp, wp/2, "End Plate", ax=40, ay=-40)
+        add_dim(cv, 0, -wp/2-30, tp, -wp/2-30, f"t={tp}", -20, "h")
 
     elif "Double" in ctype:
         # Double Angle Plan
         beam_len = wp + 60
-        fig.add_shape(type="rect", x0=sb, y0=-tw/2, x1=beam_len, y1=tw/2, fillcolor=STYLE['STEEL_CUT']['fillcolor'], line=STYLE['STEEL_CUT']['line'])
+        cv.rect(sb, -tw/2, beam_len, tw/2, **STYLE['STEEL_CUT'])
         leg_L = 100
         for s in [-1, 1]:
             y_in = s*tw/2
             y_out = s*(tw/2+tp)
-            fig.add_shape(type="rect", x0=sb, y0=y_in, x1=sb+wp, y1=y_out, fillcolor=STYLE['ANGLE']['fillcolor'], line=STYLE['ANGLE']['line'])
-            fig.add_shape(type="rect", x0=sb, y0=y_in, x1=sb+tp, y1=y_in+(s*leg_L), fillcolor=STYLE['ANGLE']['fillcolor'], line=STYLE['ANGLE']['line'])
+            cv.rect(sb, y_in, sb+wp, y_out, **STYLE['ANGLE'])
+            cv.rect(sb, y_in, sb+tp, y_in+(s*leg_L), **STYLE['ANGLE'])
         bx = sb + inp['e1']
         full_t = tw + 2*tp
-        fig.add_shape(type="rect", x0=bx-d/2, y0=-full_t/2-15, x1=bx+d/2, y1=full_t/2+15, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-        add_leader(fig, sb, tw/2+tp, "2L-Angle", ax=40, ay=-40)
-        add_dim(fig, 0, 0, sb, 0, f"Gap={sb}", -30, "h") # Added Setback
-        add_dim(fig, sb, full_t/2+30, bx, full_t/2+30, f"e1={inp['e1']}", 20, "h") # Added e1
+        cv.rect(bx-d/2, -full_t/2-15, bx+d/2, full_t/2+15, bolt)
+        add_leader(cv, sb, tw/2+tp, "2L-Angle", ax=40, ay=-40)
+        add_dim(cv, 0, 0, sb, 0, f"Gap={sb}", -30, "h") # Added Setback
+        add_dim(cv, sb, full_t/2+30, bx, full_t/2+30, f"e1={inp['e1']}", 20, "h") # Added e1
 
     else:
         # Fin Plate Plan
-        fig.add_shape(type="rect", x0=0, y0=-tp/2, x1=wp, y1=tp/2, fillcolor=STYLE['PLATE']['fillcolor'], line=STYLE['PLATE']['line'])
+        cv.rect(0, -tp/2, wp, tp/2, **STYLE['PLATE'])
         beam_len = wp + 60
-        fig.add_shape(type="rect", x0=sb, y0=tp/2, x1=beam_len, y1=tp/2+tw, fillcolor=STYLE['STEEL_CUT']['fillcolor'], line=STYLE['STEEL_CUT']['line'])
+        cv.rect(sb, tp/2, beam_len, tp/2+tw, **STYLE['STEEL_CUT'])
         bolt_x = sb + inp['e1']
         y_head_out = -tp/2 - 8
         y_nut_out = tp/2 + tw + 10
-        fig.add_shape(type="rect", x0=bolt_x-d/2, y0=y_head_out, x1=bolt_x+d/2, y1=y_nut_out, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(width=0))
-        fig.add_shape(type="rect", x0=bolt_x-d, y0=y_head_out-6, x1=bolt_x+d, y1=y_head_out, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(color="black", width=1))
-        fig.add_shape(type="rect", x0=bolt_x-d, y0=y_nut_out, x1=bolt_x+d, y1=y_nut_out+10, fillcolor=STYLE['BOLT']['fillcolor'], line=dict(color="black", width=1))
+        cv.rect(bolt_x-d/2, y_head_out, bolt_x+d/2, y_nut_out, bolt)
+        cv.rect(bolt_x-d, y_head_out-6, bolt_x+d, y_head_out, **STYLE['BOLT'])
+        cv.rect(bolt_x-d, y_nut_out, bolt_x+d, y_nut_out+10, **STYLE['BOLT'])
         ws = inp.get('weld_size', 5)
-        fig.add_shape(type="path", path=f"M 0 {-tp/2} L {ws} {-tp/2} L 0 {-tp/2-ws} Z", fillcolor="black", line_width=0)
-        fig.add_shape(type="path", path=f"M 0 {tp/2} L {ws} {tp/2} L 0 {tp/2+ws} Z", fillcolor="black", line_width=0)
-        add_leader(fig, 0, -tp/2-ws, f"Weld {ws}mm", ax=-40, ay=-30, align="right")
-        
+        cv.polygon([(0, -tp/2), (ws, -tp/2), (0, -tp/2-ws)], "black")
+        cv.polygon([(0, tp/2), (ws, tp/2), (0, tp/2+ws)], "black")
+        add_leader(cv, 0, -tp/2-ws, f"Weld {ws}mm", ax=-40, ay=-30, align="right")
+
         # Dimensions (Setback & e1)
-        add_dim(fig, 0, 0, sb, 0, f"Gap={sb}", -30, "h") 
-        add_dim(fig, sb, tp/2+tw+30, bolt_x, tp/2+tw+30, f"e1={inp['e1']}", 20, "h")
-        add_leader(fig, wp, 0, "Fin Plate", ax=40, ay=-30)
+        add_dim(cv, 0, 0, sb, 0, f"Gap={sb}", -30, "h")
+        add_dim(cv, sb, tp/2+tw+30, bolt_x, tp/2+tw+30, f"e1={inp['e1']}", 20, "h")
+        add_leader(cv, wp, 0, "Fin Plate", ax=40, ay=-30)
+
+    return cv.to_figure(**view_layout(250, f"<b>PLAN VIEW</b> : {ctype}"))
+
+# =============================================================================
+# 6. CACHED VIEWS (สร้างเฉพาะ view ที่เปิดอยู่, cache ด้วย geometry เท่านั้น)
+# =============================================================================
+VIEWS = {
+    "🖼️ Front View": create_front_view,
+    "📐 Side View": create_side_view,
+    "🔝 Plan View": create_plan_view,
+}
+BEAM_GEOM_KEYS = ('h', 'b', 'tf', 'tw')
+INPUT_GEOM_KEYS = ('d', 'rows', 'cols', 's_v', 's_h', 't', 'weld_size', 'lv', 'leh', 'e1', 'setback')
+
+def geometry_key(beam, plate, inp):
+    """เฉพาะค่าที่มีผลต่อรูป (เกรด bolt / วัสดุ / method / แรง ไม่อยู่ใน key)"""
+    return (tuple(beam[k] for k in BEAM_GEOM_KEYS), plate.get('type', 'Fin Plate'), plate['h'], plate['w'],
+            tuple(inp.get(k) for k in INPUT_GEOM_KEYS))
+
+@shared_cache.memoize("drawing_utils.get_view",
+                      key_fn=lambda view, beam, plate, inp: (view, geometry_key(beam, plate, inp)))
+def get_view(view, beam, plate, inp):
+    """Figure ของ view เดียว (แชร์ข้าม rerun / session ห้ามแก้ไข)"""
+    return VIEWS[view](beam, plate, inp)
+
+# =============================================================================
+# 7. SVG EXPORT (ไม่ต้องใช้ kaleido / browser: แปลง shape + annotation ของ view เป็น SVG ตรงๆ)
+# =============================================================================
+SVG_DASH = {"dot": "2,3", "dash": "6,4", "dashdot": "6,3,2,3"}
+_PATH_TOKEN = re.compile(r"[MLHVCZ]|-?\d+(?:\.\d+)?(?:e-?\d+)?")
+
+def _svg_text(text):
+    """ตัด <b> ของ Plotly -> (ข้อความ, bold)"""
+    bold = "<b>" in text
+    return html.escape(re.sub(r"</?b>", "", text)), bold
+
+def figure_to_svg(fig, size=500):
+    """view ของ drawing_utils -> SVG string ขนาด size x size px (ใช้กับ batch export)"""
+    lay = fig.layout
+    m = lay.margin
+    (x0, x1), (y0, y1) = lay.xaxis.range, lay.yaxis.range
+    w, h = size - m.l - m.r, size - m.t - m.b
+    s = min(w / (x1 - x0), h / (y1 - y0))
+    cx, cy = m.l + w / 2, m.t + h / 2
+    X = lambda x: cx + (x - (x0 + x1) / 2) * s
+    Y = lambda y: cy - (y - (y0 + y1) / 2) * s
+    font_color = "#2a3f5f"
+
+    out = [f'<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg" font-family="Arial">',
+           '<defs><marker id="dw-ah" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" markerHeight="6" orient="auto-start-reverse">'
+           '<path d="M0,0L10,5L0,10Z" fill="context-stroke"/></marker>'
+           '<pattern id="dw-hatch" width="10" height="10" patternUnits="userSpaceOnUse">'
+           '<path d="M0,10L10,0" stroke="#D1D5DB" stroke-width="1"/></pattern></defs>',
+           f'<rect width="{size}" height="{size}" fill="{lay.plot_bgcolor or "white"}"/>']
+
+    for tr in fig.data:
+        if getattr(tr, 'fill', None) == 'toself':
+            pts = " ".join(f"{_f(X(x))},{_f(Y(y))}" for x, y in zip(tr.x, tr.y))
+            fill = "url(#dw-hatch)" if tr.fillpattern and tr.fillpattern.shape else (tr.fillcolor or "none")
+            out.append(f'<polygon points="{pts}" fill="{fill}"/>')
+
+    for shp in lay.shapes:
+        d, cmd, xy = [], None, []
+        for tok in _PATH_TOKEN.findall(shp.path):
+            if tok.isalpha():
+                cmd = tok
+                d.append(tok)
+                continue
+            xy.append(float(tok))
+            if cmd == "H":
+                d.append(_f(X(xy.pop())))
+            elif cmd == "V":
+                d.append(_f(Y(xy.pop())))
+            elif len(xy) == 2:
+                d.append(f"{_f(X(xy[0]))},{_f(Y(xy[1]))}")
+                xy = []
+        ln = shp.line
+        stroke = f' stroke="{ln.color}" stroke-width="{ln.width}"' if ln.width and ln.color else ' stroke="none"'
+        if ln.dash in SVG_DASH:
+            stroke += f' stroke-dasharray="{SVG_DASH[ln.dash]}"'
+        fill = shp.fillcolor if shp.fillcolor and shp.fillcolor != "rgba(0,0,0,0)" else "none"
+        out.append(f'<path d="{" ".join(d)}" fill="{fill}"{stroke}/>')
+
+    for a in lay.annotations:
+        px, py = X(a.x), Y(a.y)
+        size_pt = (a.font.size if a.font and a.font.size else 12)
+        color = (a.font.color if a.font and a.font.color else font_color)
+        text, bold = _svg_text(a.text or "")
+        weight = ' font-weight="bold"' if bold else ""
+        if a.showarrow is False:
+            tx, ty = px + (a.xshift or 0), py - (a.yshift or 0)
+            rot = f' transform="rotate({a.textangle} {_f(tx)} {_f(ty)})"' if a.textangle else ""
+            out.append(f'<text x="{_f(tx)}" y="{_f(ty)}" font-size="{size_pt}" fill="{color}" text-anchor="middle" '
+                       f'dominant-baseline="central"{weight}{rot}>{text}</text>')
+            continue
+        tx, ty = px + (a.ax or 0), py + (a.ay or 0)
+        arrow_c = a.arrowcolor or "#444"
+        out.append(f'<line x1="{_f(tx)}" y1="{_f(ty)}" x2="{_f(px)}" y2="{_f(py)}" stroke="{arrow_c}" marker-end="url(#dw-ah)"/>')
+        if text:
+            bw = 0.62 * size_pt * len(text) + 6
+            if a.bgcolor:
+                out.append(f'<rect x="{_f(tx - bw / 2)}" y="{_f(ty - size_pt * 0.7)}" width="{_f(bw)}" height="{_f(size_pt * 1.4)}" fill="{a.bgcolor}"/>')
+            out.append(f'<text x="{_f(tx)}" y="{_f(ty)}" font-size="{size_pt}" fill="{color}" text-anchor="middle" '
+                       f'dominant-baseline="central"{weight}>{text}</text>')
 
-    force_range(fig, 250)
-    fig.update_layout(title_text=f"<b>PLAN VIEW</b> : {ctype}")
-    return fig
+    if lay.title and lay.title.text:
+        text, bold = _svg_text(lay.title.text)
+        weight = ' font-weight="bold"' if bold else ""
+        out.append(f'<text x="{size / 2}" y="{_f(m.t / 2)}" font-size="17" fill="{font_color}" text-anchor="middle"{weight}>{text}</text>')
+    out.append("</svg>")
+    return "\n".join(out)
@@ -0,0 +1,50 @@
+# figure_cache.py
+# วาดกราฟ matplotlib แบบ object-oriented (matplotlib.figure.Figure ไม่ผ่าน pyplot)
+# - style ใช้ผ่าน style.context (ไม่แก้ rcParams ของทั้ง process)
+# - figure ถูก clear ทันทีหลัง render (ไม่ค้างใน pyplot registry)
+# - PNG/SVG bytes cache ใน shared_cache ด้วย hash ของ input: rerun ที่ input เดิมไม่ต้องวาดใหม่
+import io
+import threading
+
+import shared_cache
+
+NAMESPACE = "figure_cache"
+DEFAULT_DPI = 200  # เท่ากับ st.pyplot
+
+# style.context แก้ rcParams ชั่วคราว (global): วาดทีละรูปเพื่อไม่ให้ style ข้าม session ปนกัน
+_RENDER_LOCK = threading.Lock()
+
+
+def render(draw_fn, key, figsize=(10, 6), style="default", fmt="png", dpi=DEFAULT_DPI):
+    """
+    draw_fn(fig) วาดลงบน Figure ที่สร้างให้ -> คืน bytes (png/svg)
+    key = ค่าที่กำหนดหน้าตารูปทั้งหมด (tuple/dict ของ input) ใช้เป็น cache key
+    """
+    cache_key = shared_cache.make_key(NAMESPACE, key, figsize, style, fmt, dpi)
+    found, data = shared_cache.get(NAMESPACE, cache_key)
+    if found:
+        return data
+
+    from matplotlib import style as mpl_style
+    from matplotlib.figure import Figure
+
+    with _RENDER_LOCK, mpl_style.context(style):
+        fig = Figure(figsize=figsize)
+        try:
+            draw_fn(fig)
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight")
+            data = buf.getvalue()
+        finally:
+            fig.clear()
+    shared_cache.put(NAMESPACE, cache_key, data)
+    return data
+
+
+def show(draw_fn, key, **kwargs):
+    """render() แล้วแสดงด้วย st.image (SVG ส่งเป็น markup string)"""
+    import streamlit as st
+
+    data = render(draw_fn, key, **kwargs)
+    st.image(data.decode("utf-8") if kwargs.get("fmt") == "svg" else data, width="stretch")
+    return data
@@ -0,0 +1,113 @@
+# import_budget.py
+# Lazy module loader + รายงานเวลา import (import-time budget)
+# - app.py โหลด tab module ผ่าน load() เมื่อ view นั้นถูกเปิดครั้งแรกเท่านั้น
+# - เวลา import ครั้งแรกของแต่ละ module ถูกบันทึกไว้เทียบกับ budget
+# - `python import_budget.py` วัด cold import ของทุก module ใน process ใหม่ (ใช้ใน CI ได้)
+import importlib
+import os
+import sys
+import time
+
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 250))
+
+# budget ต่อ module (ms) ของ cold import; module ที่ไม่อยู่ในนี้ใช้ DEFAULT_BUDGET_MS
+# ตั้งจาก median ที่วัดได้ + headroom ~1.5x (ต่ำกว่านั้น CLI จะ fail แบบสุ่มตาม noise ของเครื่อง)
+BUDGETS_MS = {
+    "steel_db": 20,
+    "section_search": 50,
+    "section_properties": 150,
+    "beam_engine": 150,
+    "connection_design": 750,  # cold import วัดได้ ~430-610 ms (median ~490) -> budget ≈ 1.5x median
+    "report_generator": 300,
+    "report_analytics": 300,
+}
+
+# โมดูลของแอป (ลำดับตามที่ถูกโหลด)
+APP_MODULES = (
+    "steel_db", "section_search", "section_properties", "beam_engine", "beam_context", "plot_utils", "design_atlas",
+    "tab1_analysis", "tab_summary", "tab_compare", "connection_design", "tab3_ltb",
+    "report_generator", "report_analytics", "tab5_baseplate",
+)
+
+IMPORT_TIMES = {}  # module -> ms (import ครั้งแรกใน process นี้)
+
+
+def budget_ms(name):
+    return BUDGETS_MS.get(name, DEFAULT_BUDGET_MS)
+
+
+def load(name):
+    """import module ตอนใช้งานจริง (ครั้งแรกจับเวลา, ครั้งต่อไปคืนจาก sys.modules)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = (time.perf_counter() - t0) * 1000
+    return module
+
+
+def require(name):
+    """load() สำหรับหน้าใน app_pages/: module หายให้แจ้ง error แล้วหยุดหน้านั้น"""
+    import streamlit as st
+
+    try:
+        return load(name)
+    except ImportError as e:
+        st.error(f"❌ CRITICAL ERROR: Modules missing: {e}")
+        st.info("Please ensure all helper scripts (steel_db.py, tab_summary.py, etc.) are in the same directory.")
+        st.stop()
+
+
+def budget_rows(times=None):
+    """[(module, ms, budget, ok)] เรียงจากช้าสุด"""
+    times = IMPORT_TIMES if times is None else times
+    rows = [(name, ms, budget_ms(name), ms <= budget_ms(name)) for name, ms in times.items()]
+    return sorted(rows, key=lambda r: -r[1])
+
+
+def render_budget_report():
+    """ตารางเวลา import ของ module ที่ถูกโหลดแล้วใน server process นี้"""
+    import streamlit as st
+
+    rows = budget_rows()
+    if not rows:
+        st.caption("No lazy modules loaded yet.")
+        return
+    lines = ["| Module | Import (ms) | Budget (ms) | |", "|---|---:|---:|---|"]
+    for name, ms, budget, ok in rows:
+        lines.append(f"| `{name}` | {ms:,.0f} | {budget:,.0f} | {'✅' if ok else '⚠️'} |")
+    st.markdown("\n".join(lines))
+    st.caption("First import per server process; later reruns reuse the loaded module.")
+
+
+def measure_cold(name):
+    """เวลา import ของ module ใน interpreter ใหม่ (ไม่นับเวลาเริ่ม Python / streamlit)"""
+    import subprocess
+
+    code = (
+        "import time, streamlit; t = time.perf_counter(); "
+        f"import {name}; print((time.perf_counter() - t) * 1000)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else f"import {name} failed")
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    import argparse
+    import statistics
+
+    ap = argparse.ArgumentParser(description="Cold-import time of every app module against its budget.")
+    ap.add_argument("--repeat", type=int, default=3, help="cold imports per module; the median is compared (default: 3)")
+    args = ap.parse_args()
+
+    cold = {name: statistics.median(measure_cold(name) for _ in range(max(1, args.repeat))) for name in APP_MODULES}
+    over = 0
+    print(f"{'module':<22}{'ms':>8}{'budget':>9}")
+    for name, ms, budget, ok in budget_rows(cold):
+        over += not ok
+        print(f"{name:<22}{ms:>8.0f}{budget:>9.0f}  {'ok' if ok else 'OVER'}")
+    sys.exit(1 if over else 0)
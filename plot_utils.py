@@ -0,0 +1,76 @@
+# plot_utils.py
+# กราฟเส้นความหนาแน่นสูง (High-density mode)
+# - sample ถี่ขึ้น (vectorized) แต่ลดจุดก่อนส่งไป browser ด้วย decimate() ที่รักษารูปทรง:
+#   เก็บ min/max ของทุก bucket + จุดปลาย + จุดสองฝั่งของขอบ zone (Lp, Lr, กลาง span) -> จุดยอดและรอยต่อไม่หาย
+# - trace เป็น go.Scattergl (WebGL) แทน SVG: วาดหลายพันเส้นแล้วยัง zoom / hover ได้ลื่น
+# - เปิด/ปิดที่ sidebar (session_state['plot_high_density']); ปิด = กราฟแบบเดิม 100 จุด SVG
+import numpy as np
+import plotly.graph_objects as go
+
+STATE_KEY = "plot_high_density"
+DEFAULT_SAMPLES = 100    # จำนวนจุดเดิมของทุกกราฟ
+DENSE_SAMPLES = 4000     # จำนวนจุดที่ sample ในโหมด high-density (ก่อน decimate)
+MAX_POINTS = 400         # จุดสูงสุดต่อเส้นที่ส่งไป browser
+
+
+def high_density():
+    """โหมด high-density เปิดอยู่หรือไม่ (toggle ใน sidebar)"""
+    import streamlit as st
+    return bool(st.session_state.get(STATE_KEY, False))
+
+
+def samples(default=DEFAULT_SAMPLES):
+    """จำนวนจุด sample ของเส้น: ถี่ในโหมด high-density, ค่าเดิมในโหมดปกติ"""
+    return DENSE_SAMPLES if high_density() else default
+
+
+def decimate(x, y, max_points=MAX_POINTS, keep_x=()):
+    """
+    ลดจุดของเส้น (x เรียงจากน้อยไปมาก) ให้เหลือไม่เกิน max_points แบบรักษารูปทรง
+    - จุดบังคับ: จุดแรก / จุดสุดท้าย, จุดสองฝั่งของทุกค่าใน keep_x (ขอบ zone / จุดที่กราฟกระโดด)
+      และทุกช่อง NaN (NaN ตัวแรกของช่อง + จุดก่อน/หลังช่อง) -> ช่องว่างของเส้นไม่หายแม้สั้นกว่า bucket
+    - จุดที่เหลือ: แบ่งเป็น bucket ตาม index แล้วเก็บจุด min และ max ของแต่ละ bucket
+    max_points เป็นเพดานจริง ยกเว้นกรณีจุดบังคับอย่างเดียวก็เกินแล้ว (คืนจุดบังคับทั้งหมด)
+    คืน (x, y) เป็น numpy array; เส้นที่สั้นกว่า max_points คืนค่าเดิม
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points:
+        return x, y
+
+    nan = np.isnan(y)
+    forced = [[0, n - 1]]
+    if len(keep_x):
+        right = np.clip(np.searchsorted(x, np.asarray(keep_x, dtype=float)), 1, n - 1)
+        forced += [right - 1, right]
+    if nan.any():
+        step = np.diff(nan.astype(np.int8))
+        starts = np.flatnonzero(step == 1) + 1          # NaN ตัวแรกของแต่ละช่อง
+        ends = np.flatnonzero(step == -1)               # NaN ตัวสุดท้ายของแต่ละช่อง
+        forced += [starts, starts - 1, ends + 1, [0] if nan[0] else []]
+    forced = np.unique(np.clip(np.concatenate(forced).astype(int), 0, n - 1))
+
+    idx = [forced]
+    n_buckets = (max_points - len(forced)) // 2
+    if n_buckets > 0:
+        size = -(-n // n_buckets)  # ceil
+        n_buckets = -(-n // size)  # bucket สุดท้ายอาจว่างเมื่อปัด size ขึ้น
+        pad = n_buckets * size - n
+        lo = np.pad(np.where(nan, np.inf, y), (0, pad), constant_values=np.inf).reshape(n_buckets, size)
+        hi = np.pad(np.where(nan, -np.inf, y), (0, pad), constant_values=-np.inf).reshape(n_buckets, size)
+        start = np.arange(n_buckets) * size
+        idx += [start + lo.argmin(axis=1), start + hi.argmax(axis=1)]
+
+    idx = np.unique(np.clip(np.concatenate(idx), 0, n - 1))
+    return x[idx], y[idx]
+
+
+def line(x, y, keep_x=(), max_points=MAX_POINTS, webgl=None, **kwargs):
+    """
+    trace ของเส้น 1 เส้น: decimate แล้วคืน go.Scattergl (high-density) หรือ go.Scatter (ปกติ)
+    kwargs ส่งต่อให้ trace ตรงๆ (name, line, fill, mode ...)
+    """
+    if webgl is None:
+        webgl = high_density()
+    x, y = decimate(x, y, max_points, keep_x)
+    return (go.Scattergl if webgl else go.Scatter)(x=x, y=y, **kwargs)
@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import math
+import table_view
+import shared_cache
+import figure_cache
 
 # --- Module Integrity Check ---
 try:
@@ -18,22 +19,15 @@ FU_PLATE = 4000
 FV_BOLT = 2100  
 FV_WELD = 1470  
 
-def render_analytics_section(load_pct, bolt_dia, load_case, factor):
+@shared_cache.memoize("report_analytics.table")
+def build_analytics_table(load_pct, bolt_dia):
     """
-    Renders the Structural Analytics Dashboard.
-    - Version 32.0: 
-        1. Table shows Nominal Capacity (e.g. 47,040 kg) explicitly.
-        2. Graph section is FULLY RESTORED.
+    Catalog sweep (server-side, shared cache per input): returns the full results table.
+    Rendering only ever ships the visible page (see table_view.py).
     """
-    
-    st.markdown("## 🏗️ Structural Optimization Dashboard")
-    st.divider()
+    import pandas as pd  # lazy
 
     all_sections = get_standard_sections()
-    if not all_sections:
-        st.warning("⚠️ No sections found.")
-        return
-
     data_list = []
     
     # --- 1. CALCULATION CORE ---
@@ -128,18 +122,34 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
             "Governing": final_info.get('Mode')
         })
 
-    if not data_list: return
-    df = pd.DataFrame(data_list)
+    return pd.DataFrame(data_list)
+
+def render_analytics_section(load_pct, bolt_dia, load_case, factor):
+    """
+    Renders the Structural Analytics Dashboard.
+    - Version 33.0: 
+        1. Table shows Nominal Capacity (e.g. 47,040 kg) explicitly.
+        2. Graph section is FULLY RESTORED.
+        3. Results stay server-side; table is paged / sorted / filtered on the server.
+    """
+    
+    st.markdown("## 🏗️ Structural Optimization Dashboard")
+    st.divider()
+
+    df = build_analytics_table(load_pct, bolt_dia)
+    if df.empty:
+        st.warning("⚠️ No sections found.")
+        return
 
     # --- 2. TABLE DISPLAY ---
     st.subheader("📋 Specification Table (Nominal Capacity)")
-    st.dataframe(
+    page_df = table_view.render_paged_table(
         df[[
             "Section", "V_Nominal", "V_Target", 
             "Bolt Spec", "Plate Size", "Weld Spec", 
             "Governing", "D/C Ratio"
         ]],
-        use_container_width=True,
+        key="analytics_table",
         column_config={
             "Section": st.column_config.TextColumn("Section", width="small"),
             "V_Nominal": st.column_config.NumberColumn("Shear Capacity (Vn)", format="%.0f kg", help="Nominal Web Shear (0.6*Fy*Aw)"),
@@ -150,8 +160,6 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
             "Governing": st.column_config.TextColumn("Crit. Mode", width="medium"),
             "D/C Ratio": st.column_config.ProgressColumn("Ratio", format="%.2f", min_value=0, max_value=1.5),
         },
-        height=500,
-        hide_index=True
     )
 
     # --- 3. GRAPH RENDERING (RESTORED) ---
@@ -160,7 +168,8 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
     
     col_sel, _ = st.columns([1, 2])
     with col_sel:
-        selected_name = st.selectbox("Select Section:", df['Section'].unique())
+        page_names = page_df['Section'].tolist() or df['Section'].head(1).tolist()
+        selected_name = st.selectbox("Select Section (current page):", page_names)
 
     row = df[df['Section'] == selected_name].iloc[0]
     
@@ -169,6 +178,15 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
     L_start = row['L_Start']
     L_end = row['L_End']
     
+    # Chart cache ตาม input ของกราฟ (เลือก section เดิมซ้ำไม่ต้องวาดใหม่)
+    figure_cache.show(lambda fig: draw_limit_chart(fig, V_graph, L_start, L_end),
+                      ("limit_chart", V_graph, L_start, L_end), figsize=(10, 6), style="bmh")
+    
+    st.success(f"✅ Displaying Nominal Capacity for {selected_name}: {row['V_Nominal']:,.0f} kg")
+
+
+def draw_limit_chart(fig, V_graph, L_start, L_end):
+    """Safe-load envelope (shear / moment / deflection) ลงบน Figure ที่ส่งเข้ามา"""
     # Calculate Plotting Curves
     M_derived = (L_start * V_graph) / 4 if L_start > 0 else 0
     K_derived = L_end * 8 * M_derived if M_derived > 0 else 0
@@ -182,8 +200,7 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
     w_safe = np.minimum(np.minimum(ws, wm), wd)
 
     # PLOT
-    plt.style.use('bmh')
-    fig, ax = plt.subplots(figsize=(10, 6))
+    ax = fig.subplots()
     
     ax.plot(spans, ws, color='#9B59B6', linestyle=':', linewidth=1.5, label='Shear Limit (Web)')
     ax.plot(spans, wm, color='#E74C3C', linestyle='--', linewidth=1.5, label='Moment Limit')
@@ -216,6 +233,3 @@ def render_analytics_section(load_pct, bolt_dia, load_case, factor):
     ax.set_xlabel("Span Length (m)", fontweight='bold')
     ax.set_ylabel("Safe Uniform Load (kg/m)", fontweight='bold')
     ax.legend(loc='upper right')
-    st.pyplot(fig)
-    
-    st.success(f"✅ Displaying Nominal Capacity for {selected_name}: {row['V_Nominal']:,.0f} kg")
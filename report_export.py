@@ -0,0 +1,446 @@
+# report_export.py
+# Export calculation note ของทั้ง project (คาน + connection) เป็นไฟล์ HTML / PDF แบบ offline
+# - ใช้ engine ชุดเดียวกับแอป: beam_context.compute_beam, connection_design.connection_trace
+#   แล้วจัดรูปแบบด้วย calculation_report (markdown เดียวกับที่แสดงบนจอ)
+# - สมการ ($$..$$ / $..$) render ล่วงหน้าด้วย matplotlib mathtext -> SVG path (ไม่ต้องใช้ KaTeX / web font)
+# - HTML ไฟล์เดียวจบ: CSS ฝังในไฟล์, ใช้ font ของระบบ (ไม่ @import Google Fonts แบบหน้าแอป)
+# - PDF: matplotlib PdfPages (หน้า A4, เขียนทีละหน้า)
+# - worker pool: worker เขียนไฟล์เองแล้วคืนแค่ record เล็กๆ; ส่งงานเป็น window จำกัด
+#   และเขียน index ทีละแถว -> memory คงที่ไม่ขึ้นกับจำนวน member
+#
+# ตัวอย่าง schedule (CSV):
+#   mark,kind,section,span,Lb,w_load,p_load,method,grade
+#   B1,beam,H-400x200x8x13,6,6,1000,0,LRFD,SS400
+#   mark,kind,type,d,rows,t,s_v,lv,leh,weld_size,V_kN,T_kN,plate_grade,bolt_grade,thread,method
+#   C1,connection,Fin Plate,20,3,9,70,35,35,6,150,0,SS400,A325,N,LRFD
+import csv
+import html
+import io
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import beam_context
+import calculation_report as cr
+import steel_db
+import strength_tables as tables
+from batch_export import CONNECTION_DEFAULTS, iter_schedule
+
+KINDS = ("beam", "connection")
+FORMATS = ("html", "pdf")
+
+# ค่า default ของคาน = ค่าเริ่มต้นใน sidebar ของแอป
+BEAM_GRADES_FY = {"SS400": 2450, "SM520": 3550, "A36": 2500}  # ksc
+BEAM_DEFAULTS = {
+    'section': "H-400x200x8x13", 'span': 6.0, 'method': "LRFD", 'grade': "SS400",
+    'defl': 360, 'w_load': 0.0, 'p_load': 0.0, 'E': 2.04e6,
+}
+CONNECTION_REPORT_DEFAULTS = {
+    'plate_grade': "SS400", 'bolt_grade': tables.BOLT_NAMES[0], 'thread': "N", 'method': "LRFD", 'T_kN': 0.0,
+}
+
+# ==========================================
+# 🧮 1. MEMBER -> MARKDOWN (engine ของแอป)
+# ==========================================
+def _is_lrfd(row):
+    return "ASD" not in str(row.get('method', "LRFD")).upper()
+
+def _bolt_name(label):
+    """'A325' / 'A325 (ASTM)' / 'F10T' -> ชื่อเต็มใน strength_tables"""
+    for name in tables.BOLT_NAMES:
+        if name == label or name.startswith(str(label)):
+            return name
+    raise ValueError(f"Unknown bolt grade '{label}' (expected one of {tables.BOLT_NAMES})")
+
+def beam_inputs(row):
+    """แถวของ schedule -> beam_inputs (รูปแบบเดียวกับ app.py)"""
+    p = {**BEAM_DEFAULTS, **row}
+    mark = row.get('mark', "-")
+    # ชื่อที่ไม่รู้จักต้อง error (ห้าม fallback เงียบๆ: report จะมีชื่อที่ผู้ใช้พิมพ์แต่ผลเป็นของอีกหน้าตัด)
+    if p['section'] not in steel_db.SYS_H_BEAMS:
+        raise ValueError(f"Unknown section '{p['section']}' for mark {mark}")
+    props = steel_db.SYS_H_BEAMS[p['section']]
+    if 'Fy' in p:
+        Fy = float(p['Fy'])
+    else:
+        grade = (str(p['grade']).split() or [""])[0]
+        if grade not in BEAM_GRADES_FY:
+            raise ValueError(f"Unknown grade '{p['grade']}' for mark {mark} (expected one of {list(BEAM_GRADES_FY)} or an Fy column)")
+        Fy = BEAM_GRADES_FY[grade]
+    is_check = str(p.get('mode', "check" if (p['w_load'] or p['p_load']) else "capacity")).lower().startswith("check")
+    return {
+        'is_check_mode': is_check, 'is_lrfd': _is_lrfd(p), 'Fy': Fy, 'E': float(p['E']),
+        'sec_name': p['section'], 'h': float(props['h']), 'b': float(props['b']),
+        'tw': float(props['tw']), 'tf': float(props['tf']), 'b_bot': None, 'tf_bot': None,
+        'r': float(props.get('r', 0.0)), 'user_span': float(p['span']), 'Lb': float(p.get('Lb', p['span'])),
+        'defl_denom': int(p['defl']), 'w_load': float(p['w_load']), 'p_load': float(p['p_load']),
+    }
+
+def member_report(row):
+    """แถวของ schedule -> (title, markdown, ratio, status)"""
+    kind = row.get('kind', "beam")
+    mark = str(row.get('mark', "-"))
+    if kind == "beam":
+        rc = beam_context.compute_beam(beam_inputs(row))
+        ratio = rc['gov_ratio'] if rc['is_check_mode'] else 1.0
+        title = f"BEAM {mark}: {rc['sec_name']} ({rc['method_str']})"
+        return title, cr.beam_report(rc), ratio, "PASS" if ratio <= 1.0 else "FAIL"
+    if kind != "connection":
+        raise ValueError(f"Unknown kind '{kind}' for mark {mark} (expected one of {KINDS})")
+
+    from connection_design import calculate_plate_geometry, connection_trace  # lazy: โมดูลนี้โหลด streamlit
+    p = {**CONNECTION_DEFAULTS, **CONNECTION_REPORT_DEFAULTS, **row}
+    if "End" in p['type']:
+        p['cols'] = 2  # End plate = 2 แนว bolt เสมอ (เหมือน UI)
+    if 'V_kN' in p:
+        V = float(p['V_kN'])
+    elif 'V_kg' in p:
+        V = float(p['V_kg']) * 9.81 / 1000.0
+    else:
+        raise ValueError(f"Connection {mark} needs V_kN or V_kg")
+    inp = {k: p[k] for k in ('d', 'rows', 'cols', 't', 's_v', 's_h', 'lv', 'leh', 'e1', 'setback', 'weld_size')}
+    bolt = _bolt_name(p['bolt_grade'])
+    if not any(name in str(p['plate_grade']) for name in tables.PLATE_NAMES):  # plate_grade_id จะ fallback เป็น A36
+        raise ValueError(f"Unknown plate grade '{p['plate_grade']}' for mark {mark} (expected one of {tables.PLATE_NAMES})")
+    trace = connection_trace(inp, calculate_plate_geometry(p['type'], inp), V, float(p['T_kN']),
+                             tables.plate_grade_id(str(p['plate_grade'])), tables.bolt_grade_id(bolt),
+                             tables.thread_id(str(p['thread'])), _is_lrfd(p))
+    ratio = max(c['ratio'] for c in trace['checks'])
+    title = f"CONNECTION {mark}: {p['type']}"
+    return title, cr.generate_report(trace, str(p['plate_grade']), bolt), ratio, "PASS" if ratio <= 1.0 else "FAIL"
+
+# ==========================================
+# ∑ 2. MATH (mathtext, ไม่ใช้ network)
+# ==========================================
+_EMOJI = re.compile("[☀-➿\U0001f000-\U0001faff️]")
+_SYMBOLS = {"✅": "OK", "❌": "FAIL"}
+
+def plain(text):
+    """ตัด emoji ที่ font ของ mathtext / PDF ไม่มี (✅ / ❌ แปลงเป็นคำ)"""
+    for k, v in _SYMBOLS.items():
+        text = text.replace(k + " ", "").replace(k, v)
+    return _EMOJI.sub("", text).strip()
+
+def to_mathtext(tex):
+    """LaTeX ที่ใช้ใน report -> subset ที่ mathtext รองรับ"""
+    tex = re.sub(r"\\le(?![a-zA-Z])", r"\\leq", tex)
+    tex = re.sub(r"(\d),(?=\d{3})", r"\1{,}", tex)  # 1,000 -> 1{,}000 (ไม่เว้นวรรคหลัง comma)
+    return plain(tex)
+
+_GLYPH = re.compile(r'<path id="([^"]+)"[^>]*/>')
+
+@lru_cache(maxsize=2048)
+def math_svg(tex, size=12):
+    """
+    สมการ -> (inline SVG, glyphs) ; glyph เป็น path (<use> อ้าง id) ไม่พึ่ง font ของเครื่องที่เปิด
+    glyph defs แยกออกมา (id, tag) ให้เอกสารรวมไว้ชุดเดียว ; cache ต่อ process (สมการซ้ำกันมากระหว่าง member)
+    """
+    from matplotlib import mathtext
+    from matplotlib.font_manager import FontProperties
+
+    buf = io.BytesIO()
+    depth = mathtext.math_to_image(f"${to_mathtext(tex)}$", buf, prop=FontProperties(size=size), format="svg")
+    svg = buf.getvalue().decode("utf-8")
+    svg = svg[svg.index("<svg"):]
+    svg = re.sub(r"<metadata>.*?</metadata>|<!--.*?-->|<g id=\"patch_1\">.*?</g>", "", svg, flags=re.S)
+    svg = re.sub(r"\n\s*", " ", svg)
+    glyphs = tuple((m.group(1), m.group(0)) for m in _GLYPH.finditer(svg))
+    svg = re.sub(r"<defs>.*?</defs>", "", svg)
+    return svg.replace("<svg ", f'<svg class="m" style="vertical-align:-{depth:.1f}pt" ', 1), glyphs
+
+def _math(tex, glyphs, size=12):
+    svg, defs = math_svg(tex, size)
+    glyphs.update(defs)
+    return svg
+
+# ==========================================
+# 🌐 3. MARKDOWN -> HTML (subset ที่ calculation_report ใช้)
+# ==========================================
+HTML_CSS = """
+body { font-family: system-ui, -apple-system, "Segoe UI", Tahoma, "Noto Sans Thai", sans-serif;
+       max-width: 820px; margin: 24px auto; color: #1f2937; line-height: 1.5; }
+h1 { font-size: 1.5em; } h2 { font-size: 1.3em; } h3 { font-size: 1.15em; color: #1e40af; } h4 { font-size: 1.05em; color: #1e40af; }
+hr { border: 0; border-top: 1px dashed #cbd5e1; margin: 14px 0; }
+blockquote { background: #f1f5f9; border-left: 4px solid #2563eb; margin: 8px 0; padding: 6px 12px; }
+.math { text-align: center; margin: 6px 0; overflow-x: auto; }
+.title { border: 2px solid #1f2937; padding: 10px 14px; display: flex; justify-content: space-between; }
+.sign { display: flex; gap: 24px; margin-top: 36px; } .sign div { flex: 1; border-top: 1px solid #1f2937; padding-top: 4px; }
+table { border-collapse: collapse; width: 100%; } td, th { border: 1px solid #cbd5e1; padding: 4px 8px; text-align: left; }
+@page { size: A4; margin: 15mm; }
+"""
+
+_INLINE = re.compile(r"\$([^$]+)\$|\*\*(.+?)\*\*|\*(.+?)\*")
+
+def _inline_html(text, glyphs):
+    out, pos = [], 0
+    for m in _INLINE.finditer(text):
+        out.append(html.escape(text[pos:m.start()]))
+        if m.group(1) is not None:
+            out.append(_math(m.group(1), glyphs))
+        elif m.group(2) is not None:
+            out.append(f"<b>{_inline_html(m.group(2), glyphs)}</b>")
+        else:
+            out.append(f"<i>{_inline_html(m.group(3), glyphs)}</i>")
+        pos = m.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out)
+
+def markdown_to_html(md, glyphs):
+    """markdown -> HTML body ; glyph ของสมการทั้งหมดสะสมใน glyphs (id -> path)"""
+    out, quote, items = [], [], []
+
+    def flush():
+        if items:
+            out.append("<ul>" + "".join(f"<li>{_inline_html(t, glyphs)}</li>" for t in items) + "</ul>")
+            items.clear()
+        if quote:
+            out.append(f"<blockquote>{markdown_to_html(chr(10).join(quote), glyphs)}</blockquote>")
+            quote.clear()
+
+    for line in md.split("\n"):
+        s = line.strip()
+        if s.startswith(">"):
+            if items:
+                flush()
+            quote.append(s[1:].lstrip())
+            continue
+        if s.startswith("- "):
+            if quote:
+                flush()
+            items.append(s[2:])
+            continue
+        flush()
+        if not s:
+            continue
+        if s == "---":
+            out.append("<hr>")
+        elif s.startswith("#"):
+            level = min(len(s) - len(s.lstrip("#")), 4)
+            out.append(f"<h{level}>{_inline_html(s[level:].strip(), glyphs)}</h{level}>")
+        elif s.startswith("$$") and s.endswith("$$") and len(s) > 4:
+            out.append(f'<div class="math">{_math(s[2:-2].strip(), glyphs, 13)}</div>')
+        else:
+            out.append(f"<p>{_inline_html(s, glyphs)}</p>")
+    flush()
+    return "\n".join(out)
+
+def _html_document(title, md, meta):
+    head = "".join(f"<div><b>{html.escape(k)}:</b> {html.escape(str(v))}</div>" for k, v in meta.items())
+    sign = "".join(f"<div>{r}</div>" for r in ("Prepared by", "Checked by", "Approved by"))
+    glyphs = {}
+    body = markdown_to_html(md, glyphs)
+    sprite = f'<svg width="0" height="0" style="position:absolute"><defs>{"".join(glyphs.values())}</defs></svg>'
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f"<style>{HTML_CSS}</style></head><body>\n{sprite}\n"
+            f'<div class="title"><div><h2 style="margin:0">{html.escape(plain(title))}</h2></div><div>{head}</div></div>\n'
+            f"{body}\n<div class=\"sign\">{sign}</div>\n</body></html>\n")
+
+# ==========================================
+# 📄 4. MARKDOWN -> PDF (matplotlib, A4)
+# ==========================================
+PAGE_W, PAGE_H, MARGIN = 8.27, 11.69, 0.7  # inch
+FONT = {1: 16, 2: 14, 3: 12.5, 4: 11.5}    # heading size (pt)
+BODY_PT = 10
+
+def _pdf_blocks(md, indent=0.0):
+    """markdown -> [(kind, text, size, indent)] ; kind = text / math / hr"""
+    blocks, quote = [], []
+    for line in md.split("\n") + [""]:
+        s = line.strip()
+        if s.startswith(">"):
+            quote.append(s[1:].lstrip())
+            continue
+        if quote:
+            blocks += _pdf_blocks("\n".join(quote), indent + 0.25)
+            quote = []
+        if not s:
+            continue
+        if s == "---":
+            blocks.append(("hr", "", 0, indent))
+        elif s.startswith("#"):
+            level = min(len(s) - len(s.lstrip("#")), 4)
+            blocks.append(("head", plain(s[level:]), FONT[level], indent))
+        elif s.startswith("$$") and s.endswith("$$") and len(s) > 4:
+            blocks.append(("math", to_mathtext(s[2:-2].strip()), BODY_PT + 1, indent))
+        else:
+            text = re.sub(r"\*\*(.+?)\*\*|\*(.+?)\*", lambda m: m.group(1) or m.group(2), s)
+            text = re.sub(r"\$([^$]+)\$", lambda m: f"${to_mathtext(m.group(1))}$", plain(text))
+            blocks.append(("text", ("•  " + text[2:]) if s.startswith("- ") else text, BODY_PT, indent))
+    return blocks
+
+def write_pdf(path, title, md, meta):
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.lines import Line2D
+    from matplotlib.mathtext import MathTextParser
+
+    parser = MathTextParser("path")
+    blocks = _pdf_blocks(md)
+    usable_w = PAGE_W - 2 * MARGIN
+    with PdfPages(path, metadata={'Title': plain(title)}) as pdf:
+        fig, y, page = None, 0.0, 0
+
+        def new_page():
+            nonlocal fig, y, page
+            if fig is not None:
+                pdf.savefig(fig)
+                fig.clear()
+            page += 1
+            fig = Figure(figsize=(PAGE_W, PAGE_H))
+            fig.text(MARGIN / PAGE_W, 1 - 0.45 / PAGE_H, plain(title), fontsize=9, color="#6b7280")
+            fig.text(1 - MARGIN / PAGE_W, 0.4 / PAGE_H, f"page {page}", fontsize=8, color="#6b7280", ha="right")
+            y = PAGE_H - MARGIN
+
+        new_page()
+        fig.text(MARGIN / PAGE_W, y / PAGE_H, plain(title), fontsize=FONT[1], fontweight="bold", va="top")
+        y -= 0.35
+        fig.text(MARGIN / PAGE_W, y / PAGE_H, "   ".join(f"{k}: {v}" for k, v in meta.items()), fontsize=8.5, va="top")
+        y -= 0.3
+
+        for kind, text, size, indent in blocks:
+            if kind == "hr":
+                h = 0.15
+            elif kind == "math":
+                w_pt, h_pt, d_pt = parser.parse(f"${text}$", 72, FontProperties(size=size))[:3]
+                size = min(size, size * (usable_w - indent) * 72 / max(w_pt, 1.0))  # ย่อสมการที่ยาวเกินหน้า
+                h = (h_pt + d_pt) / 72 * size / (BODY_PT + 1) + 0.12
+            else:
+                h = size / 72 * (2.1 if "\\frac" in text else 1.55) + (0.08 if kind == "head" else 0.0)
+            if y - h < MARGIN:
+                new_page()
+            x = (MARGIN + indent) / PAGE_W
+            if kind == "hr":
+                fig.add_artist(Line2D([x, 1 - MARGIN / PAGE_W], [(y - 0.07) / PAGE_H] * 2, lw=0.5, ls="--", color="#94a3b8"))
+            elif kind == "math":
+                fig.text(0.5 + indent / 2 / PAGE_W, (y - h / 2) / PAGE_H, f"${text}$", fontsize=size, ha="center", va="center")
+            else:
+                fig.text(x, y / PAGE_H, text, fontsize=size, va="top",
+                         fontweight="bold" if kind == "head" else "normal",
+                         color="#1e40af" if kind == "head" and size < FONT[2] else "#1f2937")
+            y -= h
+
+        # ช่องลงนาม
+        if y - 1.0 < MARGIN:
+            new_page()
+        for i, label in enumerate(("Prepared by", "Checked by", "Approved by")):
+            x0 = MARGIN + i * usable_w / 3
+            fig.text(x0 / PAGE_W, (y - 0.6) / PAGE_H, "_" * 28 + f"\n{label}", fontsize=8.5, va="top")
+        pdf.savefig(fig)
+        fig.clear()
+
+# ==========================================
+# 🚀 5. EXPORT (worker pool)
+# ==========================================
+def _safe_name(mark):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(mark)).strip("_") or "member"
+
+def render_member(row, out_dir, fmt):
+    """worker: สร้าง report ของ member เดียว เขียนไฟล์ แล้วคืน record (ไม่คืนเนื้อหา)"""
+    mark = str(row.get('mark', "-"))
+    rec = {'mark': mark, 'kind': row.get('kind', "beam"), 'file': "", 'ratio': "", 'status': "ERROR", 'error': ""}
+    try:
+        title, md, ratio, status = member_report(row)
+        meta = {'Mark': mark, 'Kind': rec['kind'], 'Status': status, 'Date': time.strftime("%Y-%m-%d")}
+        fname = f"{rec['kind']}_{_safe_name(mark)}.{fmt}"
+        path = os.path.join(out_dir, fname)
+        if fmt == "pdf":
+            write_pdf(path, title, md, meta)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_html_document(title, md, meta))
+        rec.update(file=fname, ratio=f"{ratio:.3f}", status=status)
+    except Exception as e:  # member เดียวพังไม่หยุดทั้ง batch (บันทึกใน index)
+        rec['error'] = f"{type(e).__name__}: {e}"
+    return rec
+
+def _bounded(pool, rows, out_dir, fmt, window):
+    """submit ทีละ window แล้วคืนผลตามลำดับ schedule (งานค้างไม่เกิน window)"""
+    pending = deque()
+    for row in rows:
+        pending.append(pool.submit(render_member, row, out_dir, fmt))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _unique_marks(rows):
+    """ส่งแถวต่อ (ยัง stream อยู่) แต่หยุดเมื่อ mark ซ้ำ หรือชื่อไฟล์ซ้ำหลัง _safe_name (เช่น B/1 กับ B_1)"""
+    marks, files = set(), {}
+    for i, row in enumerate(rows):
+        mark = str(row.get('mark', "-"))
+        fname = f"{row.get('kind', 'beam')}_{_safe_name(mark)}"
+        if mark in marks:  # index ชี้ mark -> ไฟล์: mark ซ้ำจะทับไฟล์เดิมเงียบๆ
+            raise ValueError(f"Duplicate mark '{mark}' in schedule (row {i + 1})")
+        if fname in files:
+            raise ValueError(f"Marks '{files[fname]}' and '{mark}' map to the same report file '{fname}' (row {i + 1})")
+        marks.add(mark)
+        files[fname] = mark
+        yield row
+
+INDEX_FIELDS = ('mark', 'kind', 'status', 'ratio', 'file', 'error')
+
+def export_reports(rows, out_dir, fmt="html", workers=None, progress=None):
+    """
+    rows = iterable ของแถว schedule (stream ได้) -> out_dir/<kind>_<mark>.<fmt> + index.csv + index.html
+    คืนสรุป {'n', 'pass', 'fail', 'error'}; mark ซ้ำ / ชื่อไฟล์ซ้ำ -> ValueError
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (expected one of {FORMATS})")
+    rows = _unique_marks(rows)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    counts = {'n': 0, 'pass': 0, 'fail': 0, 'error': 0}
+
+    with open(os.path.join(out_dir, "index.csv"), "w", newline="", encoding="utf-8") as f_csv, \
+         open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f_html:
+        writer = csv.DictWriter(f_csv, fieldnames=INDEX_FIELDS)
+        writer.writeheader()
+        f_html.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Calculation package</title>'
+                     f"<style>{HTML_CSS}</style></head><body>\n<h1>Calculation package</h1>\n"
+                     "<table><tr>" + "".join(f"<th>{c.title()}</th>" for c in INDEX_FIELDS[:4]) + "</tr>\n")
+
+        if workers == 1:
+            results = (render_member(r, out_dir, fmt) for r in rows)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = _bounded(pool, rows, out_dir, fmt, workers * 2)
+        try:
+            for rec in results:
+                counts['n'] += 1
+                counts[rec['status'].lower()] += 1
+                writer.writerow(rec)
+                link = f'<a href="{html.escape(rec["file"])}">{html.escape(rec["mark"])}</a>' if rec['file'] else html.escape(rec['mark'])
+                status = html.escape(rec['status'] + (f" ({rec['error']})" if rec['error'] else ""))
+                f_html.write(f"<tr><td>{link}</td><td>{rec['kind']}</td><td>{status}</td><td>{rec['ratio']}</td></tr>\n")
+                if progress:
+                    progress(counts['n'])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        f_html.write(f"</table>\n<p>{counts['n']} members: {counts['pass']} pass, {counts['fail']} fail, "
+                     f"{counts['error']} error</p>\n</body></html>\n")
+    return counts
+
+# ==========================================
+# 🖥️ 6. COMMAND LINE
+# ==========================================
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Export calculation reports for a beam / connection schedule.")
+    ap.add_argument("schedule", help="CSV or JSON schedule (one row per member)")
+    ap.add_argument("out_dir")
+    ap.add_argument("--format", choices=FORMATS, default="html")
+    ap.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    summary = export_reports(iter_schedule(args.schedule), args.out_dir, args.format, args.workers,
+                             progress=lambda n: print(f"\r{n} reports", end="", flush=True))
+    print(f"\n{summary['n']} members ({summary['pass']} pass, {summary['fail']} fail, {summary['error']} error) "
+          f"-> {args.out_dir} ({time.time() - t0:.1f} s)")
@@ -1,10 +1,10 @@
 # report_generator.py
 # Version: 52.1 (Cleaned Indentation)
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import math
+import table_view
+import shared_cache
+import figure_cache
 
 # =========================================================
 # 🏗️ 1. DATABASE & PROPERTIES
@@ -53,7 +53,9 @@ def calculate_full_properties(props):
         "Area (cm2)": round(A, 2), "Ix (cm4)": round(Ix, 0), "Zx (cm3)": round(Zx, 0)
     }
 
+@shared_cache.memoize("report_generator.database")
 def get_full_database_df():
+    import pandas as pd  # lazy: โหลดเมื่อเปิดตารางเท่านั้น
     sections = get_standard_sections()
     data = [calculate_full_properties(s) for s in sections]
     return pd.DataFrame(data)
@@ -119,8 +121,15 @@ def calculate_connection(props, load_percent, bolt_dia, span_factor, case_name):
 # =========================================================
 # 🎨 3. DRAWING LOGIC (Single Beam)
 # =========================================================
-def draw_professional_shop_drawing(res):
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(9, 7), gridspec_kw={'width_ratios': [2, 1]})
+def draw_professional_shop_drawing(res, fmt="png"):
+    """Shop drawing เป็น PNG/SVG bytes (cache ด้วยค่าใน res: input เดิมไม่วาดซ้ำ)"""
+    return figure_cache.render(lambda fig: _draw_shop_drawing(fig, res), ("shop_drawing", res),
+                               figsize=(9, 7), fmt=fmt)
+
+def _draw_shop_drawing(fig, res):
+    # lazy: report_analytics import โมดูลนี้ได้โดยไม่ต้องโหลด matplotlib
+    import matplotlib.patches as patches
+    ax1, ax2 = fig.subplots(1, 2, gridspec_kw={'width_ratios': [2, 1]})
     
     # Styles
     COLOR_OBJ = '#2C3E50'; COLOR_DIM = '#E74C3C'; COLOR_CENTER = '#95A5A6'
@@ -186,20 +195,21 @@ def draw_professional_shop_drawing(res):
     ax2.set_xlim(0, 200); ax2.set_ylim(0, h_draw_area); ax2.axis('off')
     ax2.set_title("SECTION", fontweight='bold', color=COLOR_OBJ)
 
-    plt.suptitle(f"SHOP DRAWING: {res['Section']} (PL-100x{int(L_plate_mm)}x10mm)", fontsize=12, fontweight='bold', color=COLOR_OBJ)
-    return fig
+    fig.suptitle(f"SHOP DRAWING: {res['Section']} (PL-100x{int(L_plate_mm)}x10mm)", fontsize=12, fontweight='bold', color=COLOR_OBJ)
 
 # =========================================================
 # 🖥️ 4. APP RENDERER
 # =========================================================
+@st.fragment
 def render_report_tab(beam_data=None, conn_data=None):
     """
     ฟังก์ชันหลักที่ App.py เรียกใช้
+    (Fragment: แก้ Load % / Bolt / Case แล้ว rerun เฉพาะ workbench นี้)
     """
     st.markdown("### 🏗️ Structural Calculation Workbench (Split Modules)")
     
     with st.expander("📂 ดูตารางเหล็กทั้งหมด", expanded=False):
-        st.dataframe(get_full_database_df(), use_container_width=True, hide_index=True)
+        table_view.render_paged_table(get_full_database_df(), key="db_table", page_size=10)
 
     with st.container(border=True):
         c1, c2, c3, c4 = st.columns([2, 1, 1, 1.5])
@@ -222,7 +232,7 @@ def render_report_tab(beam_data=None, conn_data=None):
         st.markdown(f"- Shear Load: `{res['V_target']:,.0f} kg`")
         st.markdown(f"- Bolts Req: `{res['Bolt Qty']} pcs` (M{int(res['DB'])})")
     with c_right:
-        st.pyplot(draw_professional_shop_drawing(res))
+        st.image(draw_professional_shop_drawing(res), width="stretch")
     
     # 🔗 AUTO LINK: เรียก Analytics ให้ทำงานต่อเลย
     st.divider()
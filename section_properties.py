@@ -0,0 +1,155 @@
+# section_properties.py
+# Cross-section property engine สำหรับหน้าตัดประกอบจากแผ่นเหล็ก (plate assembly)
+# รองรับ I-shape สมมาตรคู่ / สมมาตรเดี่ยว (plate girder) และ fillet (root radius r)
+#
+# หน่วย input: mm | หน่วย output: cm, cm², cm³, cm⁴, cm⁶ (ตรงกับ app.py)
+# ทุกฟังก์ชันคำนวณแบบ vectorized: ส่ง numpy array ของมิติได้ทีละหลายพันหน้าตัด
+import hashlib
+
+import numpy as np
+
+import shared_cache
+
+FILLET_STRIPS = 8        # จำนวนแถบที่ใช้แทน fillet หนึ่งมุม
+STEEL_DENSITY = 7850.0   # kg/m³
+PNA_ITERATIONS = 60      # bisection steps สำหรับหา plastic neutral axis
+
+# ==========================================
+# 🧱 1. GENERIC PLATE ASSEMBLY
+# ==========================================
+def assembly_properties(rects):
+    """
+    คุณสมบัติของหน้าตัดประกอบจากสี่เหลี่ยม rects[..., n, 4] = (x0, y0, x1, y1) [mm]
+    สี่เหลี่ยมพื้นที่ศูนย์ใช้เป็น padding ได้ (สำหรับ batch ที่จำนวนแผ่นไม่เท่ากัน)
+    คืนค่า: A, y_bar, Ix, Iy, Sx_top, Sx_bot, Zx, y_pna (หน่วย cm)
+    """
+    R = np.asarray(rects, dtype=float) / 10.0  # mm -> cm
+    x0, y0, x1, y1 = R[..., 0], R[..., 1], R[..., 2], R[..., 3]
+    w = np.maximum(x1 - x0, 0.0)
+    t = np.maximum(y1 - y0, 0.0)
+    a = w * t
+    xc, yc = (x0 + x1) / 2, (y0 + y1) / 2
+
+    A = a.sum(-1)
+    y_bar = (a * yc).sum(-1) / A
+    x_bar = (a * xc).sum(-1) / A
+    Ix = (w * t**3 / 12 + a * (yc - y_bar[..., None])**2).sum(-1)
+    Iy = (t * w**3 / 12 + a * (xc - x_bar[..., None])**2).sum(-1)
+
+    y_top = np.where(a > 0, y1, -np.inf).max(-1)
+    y_bot = np.where(a > 0, y0, np.inf).min(-1)
+    Sx_top = Ix / (y_top - y_bar)
+    Sx_bot = Ix / (y_bar - y_bot)
+
+    # --- Plastic neutral axis: area above = area below (bisection, vectorized) ---
+    lo, hi = y_bot.copy(), y_top.copy()
+    for _ in range(PNA_ITERATIONS):
+        mid = (lo + hi) / 2
+        below = (w * np.clip(mid[..., None] - y0, 0.0, t)).sum(-1)
+        lo = np.where(below < A / 2, mid, lo)
+        hi = np.where(below < A / 2, hi, mid)
+    y_pna = (lo + hi) / 2
+
+    # Zx = Σ |first moment| about the PNA (แบ่งสี่เหลี่ยมที่ถูกตัดเป็นสองส่วน)
+    yp = y_pna[..., None]
+    t_bel = np.clip(yp - y0, 0.0, t)
+    t_abv = t - t_bel
+    Zx = (w * (t_bel * (yp - (y0 + t_bel / 2)) + t_abv * ((y1 - t_abv / 2) - yp))).sum(-1)
+
+    return {
+        'A': A, 'y_bar': y_bar - y_bot, 'Ix': Ix, 'Iy': Iy,
+        'Sx_top': Sx_top, 'Sx_bot': Sx_bot, 'Zx': Zx, 'y_pna': y_pna - y_bot,
+    }
+
+def _fillet_strips(x_face, y_face, r, sx, sy, n=FILLET_STRIPS):
+    """
+    แทน fillet (spandrel ของวงกลมรัศมี r) ด้วยแถบสี่เหลี่ยม n แถบ
+    x_face = ผิวเอว, y_face = ผิวปีก, sx/sy = ทิศที่ fillet ยื่นออก (+1/-1)
+    คืนค่า array [..., n, 4]
+    """
+    r = np.asarray(r, dtype=float)[..., None]
+    j = np.arange(n)
+    s_mid = (j + 0.5) / n * r
+    width = r - np.sqrt(np.maximum(r**2 - (r - s_mid)**2, 0.0))
+    xa = np.asarray(x_face, dtype=float)[..., None]
+    ya = np.asarray(y_face, dtype=float)[..., None]
+    xb = xa + sx * width
+    ys0 = ya + sy * (j / n) * r
+    ys1 = ya + sy * ((j + 1) / n) * r
+    return np.stack([np.minimum(xa, xb), np.minimum(ys0, ys1),
+                     np.maximum(xa, xb), np.maximum(ys0, ys1)], axis=-1)
+
+# ==========================================
+# 🏗️ 2. I-SHAPES / PLATE GIRDERS (VECTORIZED)
+# ==========================================
+def i_section_rects(bf_top, tf_top, hw, tw, bf_bot, tf_bot, r=0.0):
+    """สี่เหลี่ยมประกอบ I-shape (origin ที่ใต้ปีกล่าง, แกนสมมาตรที่ x = 0) [..., n, 4]"""
+    bt, tt, hw, tw, bb, tb, r = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (bf_top, tf_top, hw, tw, bf_bot, tf_bot, r)])
+    y_wt = tb + hw  # ใต้ปีกบน
+    plates = np.stack([
+        np.stack([-bb / 2, 0 * tb, bb / 2, tb], -1),            # bottom flange
+        np.stack([-tw / 2, tb, tw / 2, y_wt], -1),               # web
+        np.stack([-bt / 2, y_wt, bt / 2, y_wt + tt], -1),        # top flange
+    ], axis=-2)
+    fillets = [
+        _fillet_strips(-tw / 2, tb, r, -1, +1), _fillet_strips(tw / 2, tb, r, +1, +1),
+        _fillet_strips(-tw / 2, y_wt, r, -1, -1), _fillet_strips(tw / 2, y_wt, r, +1, -1),
+    ]
+    return np.concatenate([plates] + fillets, axis=-2)
+
+def i_section_properties(bf_top, tf_top, hw, tw, bf_bot=None, tf_bot=None, r=0.0):
+    """
+    คุณสมบัติ I-shape / plate girder (mm -> cm units), รองรับ numpy array ทุกมิติ
+    - Zx จากการค้นหา PNA จริง (ใช้ได้กับหน้าตัดสมมาตรเดี่ยว)
+    - J  = Σ b t³ / 3 (open thin-walled)
+    - Cw = h0² Iyc Iyt / (Iyc + Iyt)
+    - r_ts = sqrt( sqrt(Iy Cw) / Sxc )   (AISC F2-7, Sxc = ปีกรับแรงอัด/ปีกบน)
+    """
+    bf_bot = bf_top if bf_bot is None else bf_bot
+    tf_bot = tf_top if tf_bot is None else tf_bot
+    bt, tt, hw, tw, bb, tb, r = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (bf_top, tf_top, hw, tw, bf_bot, tf_bot, r)])
+
+    p = assembly_properties(i_section_rects(bt, tt, hw, tw, bb, tb, r))
+
+    c = 0.1  # mm -> cm
+    bt_c, tt_c, hw_c, tw_c, bb_c, tb_c = bt * c, tt * c, hw * c, tw * c, bb * c, tb * c
+    h_c = hw_c + tt_c + tb_c
+    h0 = h_c - (tt_c + tb_c) / 2
+    J = (bt_c * tt_c**3 + bb_c * tb_c**3 + h0 * tw_c**3) / 3
+    Iyc = tt_c * bt_c**3 / 12
+    Iyt = tb_c * bb_c**3 / 12
+    Cw = h0**2 * Iyc * Iyt / (Iyc + Iyt)
+    Sx = np.minimum(p['Sx_top'], p['Sx_bot'])
+    r_ts = np.sqrt(np.sqrt(p['Iy'] * Cw) / p['Sx_top'])
+
+    p.update({
+        'Sx': Sx, 'rx': np.sqrt(p['Ix'] / p['A']), 'ry': np.sqrt(p['Iy'] / p['A']),
+        'J': J, 'Cw': Cw, 'h0': h0, 'r_ts': r_ts,
+        'weight': p['A'] * 1e-4 * STEEL_DENSITY,  # kg/m
+    })
+    return p
+
+# ==========================================
+# 🗂️ 3. CACHED SCALAR API (keyed by geometry hash)
+# ==========================================
+def geometry_hash(*dims, ndigits=3):
+    """hash ของ geometry (ปัดเศษก่อนเพื่อให้ค่าที่เท่ากันได้ key เดียวกัน)"""
+    canon = ",".join(f"{float(v):.{ndigits}f}" for v in dims)
+    return hashlib.sha1(canon.encode()).hexdigest()
+
+def _i_section_dims(h, b, tw, tf, r=0.0, b_bot=None, tf_bot=None):
+    b_bot = b if b_bot is None else b_bot
+    tf_bot = tf if tf_bot is None else tf_bot
+    return (b, tf, h - tf - tf_bot, tw, b_bot, tf_bot, r)
+
+@shared_cache.memoize("section_properties.i_section",
+                      key_fn=lambda *a, **k: geometry_hash(*_i_section_dims(*a, **k)))
+def get_i_section(h, b, tw, tf, r=0.0, b_bot=None, tf_bot=None):
+    """
+    Scalar API สำหรับ UI: h = ความลึกรวม (mm), b/tf = ปีกบน, b_bot/tf_bot = ปีกล่าง
+    ผลลัพธ์ถูก cache ข้าม session ด้วย geometry hash (dict ของ float; ห้ามแก้ไขค่าที่คืน)
+    """
+    dims = _i_section_dims(h, b, tw, tf, r, b_bot, tf_bot)
+    return {k: float(v) for k, v in i_section_properties(*dims).items()}
@@ -0,0 +1,172 @@
+# section_search.py
+# ดัชนีค้นหาหน้าตัดเหล็ก (prefix / token / typo-tolerant)
+# สร้างครั้งเดียวตอนโหลด catalog แล้วค้นหาได้ในระดับ sub-millisecond
+import re
+from bisect import bisect_left
+
+import streamlit as st
+import steel_db
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+
+# คะแนนการจับคู่ต่อ token ของคำค้น
+SCORE_EXACT = 3.0
+SCORE_NOMINAL = 2.5
+SCORE_PREFIX = 2.0
+SCORE_TYPO = 1.0
+BONUS_POSITION = 0.5  # ตัวเลขตรงตำแหน่งมิติ (h, b, tw, tf)
+
+
+def tokenize(text):
+    """แยกข้อความเป็น token: 'H400 13' -> ['h', '400', '13'], '400x200' -> ['400', '200']"""
+    return [t for t in _TOKEN_RE.findall(str(text).lower()) if t != "x"]
+
+
+def _fmt_dim(v):
+    v = float(v)
+    return str(int(v)) if v.is_integer() else f"{v:g}"
+
+
+def _nominal(v, step=25, tol=0.05):
+    """ขนาดระบุ (nominal) เช่น 396 -> 400, 199 -> 200 (เฉพาะที่ต่างจริงไม่เกิน 5%)"""
+    nom = round(v / step) * step
+    if nom != v and nom > 0 and abs(nom - v) / v <= tol:
+        return _fmt_dim(nom)
+    return None
+
+
+def _deletes(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a, b):
+    """Damerau distance <= 1 (แทนที่ / เพิ่ม / ลบ / สลับตัวอักษรติดกัน 1 ครั้ง)"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diff) <= 1:
+            return True
+        i, j = diff[0], diff[-1]
+        return len(diff) == 2 and j == i + 1 and a[i] == b[j] and a[j] == b[i]
+    if len(a) > len(b):
+        a, b = b, a
+    return any(b[:i] + b[i + 1:] == a for i in range(len(b)))
+
+
+class SectionIndex:
+    """Inverted index ของชื่อหน้าตัดและขนาดระบุ"""
+
+    def __init__(self, catalog):
+        self.names = list(catalog.keys())
+        self._postings = {}   # token -> {entry_id: dim_pos}
+        self._nominal = {}    # nominal token -> {entry_id: dim_pos}
+        self._deletions = {}  # deletion variant -> {token}
+
+        for eid, name in enumerate(self.names):
+            props = catalog[name]
+            dims = [props.get(k) for k in ("h", "b", "tw", "tf")]
+            for tok in tokenize(name):
+                self._postings.setdefault(tok, {}).setdefault(eid, -1)
+            for pos, v in enumerate(dims):
+                if v is None:
+                    continue
+                self._postings.setdefault(_fmt_dim(v), {})[eid] = pos
+                if pos < 2:
+                    nom = _nominal(float(v))
+                    if nom:
+                        self._nominal.setdefault(nom, {})[eid] = pos
+
+        self._vocab = sorted(self._postings)
+        for tok in self._vocab:
+            if len(tok) >= 3:
+                for d in _deletes(tok):
+                    self._deletions.setdefault(d, set()).add(tok)
+
+    def _prefix_tokens(self, q):
+        i = bisect_left(self._vocab, q)
+        while i < len(self._vocab) and self._vocab[i].startswith(q):
+            yield self._vocab[i]
+            i += 1
+
+    def _typo_tokens(self, q):
+        if len(q) < 3:
+            return set()
+        found = set(self._deletions.get(q, ()))
+        for d in _deletes(q):
+            if d in self._postings:
+                found.add(d)
+            found |= self._deletions.get(d, set())
+        found.discard(q)
+        return {t for t in found if _within_one_edit(q, t)}
+
+    def _match_token(self, q, q_pos):
+        """คืนค่า {entry_id: score} ของ token เดียว (เลือกคะแนนสูงสุดต่อ entry)"""
+        scores = {}
+
+        def add(postings, base):
+            for eid, pos in postings.items():
+                s = base + (BONUS_POSITION if q_pos is not None and pos == q_pos else 0.0)
+                if s > scores.get(eid, 0.0):
+                    scores[eid] = s
+
+        add(self._postings.get(q, {}), SCORE_EXACT)
+        add(self._nominal.get(q, {}), SCORE_NOMINAL)
+        for tok in self._prefix_tokens(q):
+            if tok != q:
+                add(self._postings[tok], SCORE_PREFIX)
+        for tok in self._typo_tokens(q):
+            add(self._postings[tok], SCORE_TYPO)
+        return scores
+
+    def search(self, query, limit=10):
+        """ค้นหาและเรียงลำดับตามคะแนน (ต้องตรงครบทุก token ก่อน แล้วจึงตามด้วยที่ตรงบางส่วน)"""
+        tokens = tokenize(query)
+        if not tokens:
+            return self.names[:limit]
+
+        totals, hits = {}, {}
+        num_pos = 0
+        for q in tokens:
+            q_pos = None
+            if q[0].isdigit():
+                q_pos, num_pos = num_pos, num_pos + 1
+            for eid, s in self._match_token(q, q_pos).items():
+                totals[eid] = totals.get(eid, 0.0) + s
+                hits[eid] = hits.get(eid, 0) + 1
+
+        ranked = sorted(totals, key=lambda e: (-hits[e], -totals[e], e))
+        return [self.names[e] for e in ranked[:limit]]
+
+
+# --- Build once at catalog load ---
+_INDEX = SectionIndex(steel_db.SYS_H_BEAMS)
+
+
+def search(query, limit=10):
+    return _INDEX.search(query, limit)
+
+
+def section_picker(label, default=None, key="section", limit=12):
+    """
+    Search box + selectbox ที่ส่งเฉพาะผลลัพธ์อันดับต้นๆ ไปยัง browser
+    (แทน st.selectbox ที่ส่งรายการ catalog ทั้งหมดทุกครั้งที่ rerun)
+    """
+    names = _INDEX.names
+    state_key = f"{key}_selected"
+    current = st.session_state.get(state_key, default if default in names else names[0])
+
+    query = st.text_input(f"🔎 Search {label}", key=f"{key}_query", placeholder="e.g. 400x200, H400 13")
+    if query.strip():
+        options = search(query, limit)
+    else:
+        # ไม่มีคำค้น: แสดงเฉพาะหน้าตัดรอบๆ ตัวที่เลือกอยู่
+        i = names.index(current)
+        lo = max(0, min(i - limit // 2, len(names) - limit))
+        options = names[lo:lo + limit]
+    if current not in options:
+        options = [current] + options[:limit - 1]
+
+    choice = st.selectbox(label, options, index=options.index(current), key=f"{key}_choice")
+    st.session_state[state_key] = choice
+    return choice
@@ -0,0 +1,156 @@
+# session_budget.py
+# งบหน่วยความจำต่อ session สำหรับผลลัพธ์ขนาดใหญ่
+# - ผลลัพธ์ที่ไล่ออกได้ (evictable) เก็บผ่าน put()/get() ใน store ระดับ process (key = session id)
+#   ไม่ได้อยู่ใน st.session_state -> session อื่นไล่ออกแทนได้ แม้ tab ที่เปิดค้างไว้จะไม่ rerun อีกเลย
+# - enforce() (ทุก run ของทุก session) กวาดทั้ง store: session ที่ปิดไปแล้ว, session ที่เกินงบ
+#   (idle เกิน STALE_AFTER_S ใหญ่สุดก่อน แล้ว LRU) และ store ทั้ง process ที่เกิน SESSION_STORE_MB
+# - render_usage() แสดงบัญชีหน่วยความจำของ session
+# widget state ไม่ถูกไล่ออก (ลบแล้วค่าที่ผู้ใช้กรอกจะหาย)
+import os
+import threading
+import time
+
+import streamlit as st
+
+import shared_cache
+
+BUDGET_BYTES = int(float(os.environ.get("SESSION_BUDGET_MB", 4)) * 1024 * 1024)
+STORE_BYTES = int(float(os.environ.get("SESSION_STORE_MB", 64)) * 1024 * 1024)
+STALE_AFTER_S = float(os.environ.get("SESSION_STALE_S", 600))
+
+SHARED_KEYS = ("results_context",)    # object ของ shared_cache (ไม่นับเป็นของ session)
+
+_LOCK = threading.RLock()
+_STORE = {}        # session id -> {key: [value, nbytes, last access (time.time())]}
+_STATE_BYTES = {}  # session id -> bytes ของ widget/state ล่าสุดที่ session นั้นรายงาน (ตอน enforce)
+_SWEPT = {'sessions': 0, 'entries': 0}  # สถิติการไล่ออกข้าม session
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "_local"
+
+
+def _is_closed(sid):
+    """session ที่ runtime ไม่รู้จักแล้ว (ปิด tab / หลุดการเชื่อมต่อจนหมดอายุ)"""
+    from streamlit import runtime
+    return runtime.exists() and not runtime.get_instance().is_active_session(sid)
+
+
+def put(key, value):
+    """เก็บผลลัพธ์ที่ไล่ออกได้ (evictable) ของ session นี้"""
+    nbytes = shared_cache.estimate_bytes(value)
+    with _LOCK:
+        _STORE.setdefault(_session_id(), {})[key] = [value, nbytes, time.time()]
+
+
+def get(key, default=None):
+    with _LOCK:
+        entry = _STORE.get(_session_id(), {}).get(key)
+        if entry is None:
+            return default
+        entry[2] = time.time()
+        return entry[0]
+
+
+def pop(key):
+    with _LOCK:
+        entry = _STORE.get(_session_id(), {}).pop(key, None)
+    return None if entry is None else entry[0]
+
+
+def usage():
+    """[(key, bytes, kind, idle_s)] ของ session นี้ kind = evictable / shared / state"""
+    now = time.time()
+    rows = []
+    for key in list(st.session_state.keys()):
+        kind = "shared" if key in SHARED_KEYS else "state"
+        rows.append((key, shared_cache.estimate_bytes(st.session_state[key]), kind, None))
+    with _LOCK:
+        for key, (_, nbytes, last) in _STORE.get(_session_id(), {}).items():
+            rows.append((key, nbytes, "evictable", now - last))
+    return sorted(rows, key=lambda r: -r[1])
+
+
+def session_bytes(rows=None):
+    rows = usage() if rows is None else rows
+    return sum(b for _, b, kind, _ in rows if kind != "shared")
+
+
+def _evict(candidates, total, budget):
+    """candidates = [(sid, key, nbytes)] ตามลำดับที่จะไล่ -> (ที่ไล่ไป, total ที่เหลือ)"""
+    evicted = []
+    for sid, key, nbytes in candidates:
+        if total <= budget:
+            break
+        _STORE[sid].pop(key, None)
+        total -= nbytes
+        evicted.append((sid, key))
+    return evicted, total
+
+
+def _order(entries, now, stale_after):
+    """idle เกิน stale_after (ใหญ่สุดก่อน) แล้วตามด้วยที่เหลือแบบ LRU"""
+    stale = sorted((e for e in entries if now - e[3] >= stale_after), key=lambda e: -e[2])
+    rest = sorted((e for e in entries if now - e[3] < stale_after), key=lambda e: e[3])
+    return [e[:3] for e in stale + rest]
+
+
+def enforce(budget=BUDGET_BYTES, stale_after=STALE_AFTER_S, store_budget=STORE_BYTES):
+    """
+    กวาด store ของทุก session (เรียกจาก run ใดก็ได้):
+    1) ทิ้งผลลัพธ์ของ session ที่ปิดไปแล้ว
+    2) session ที่เกินงบ: ไล่ idle เกิน stale_after (ใหญ่สุดก่อน) แล้ว LRU
+    3) store ทั้ง process เกิน store_budget: ไล่แบบเดียวกันข้ามทุก session
+    คืนค่า list ของ key ที่ถูกไล่ออกจาก session นี้
+    """
+    own, now = _session_id(), time.time()
+    state = session_bytes([r for r in usage() if r[2] != "evictable"])
+    evicted = []
+    with _LOCK:
+        _STATE_BYTES[own] = state
+        for sid in [s for s in _STORE if s != own and _is_closed(s)]:
+            _SWEPT['sessions'] += 1
+            _SWEPT['entries'] += len(_STORE.pop(sid))
+            _STATE_BYTES.pop(sid, None)
+
+        for sid, entries in _STORE.items():
+            rows = [(sid, key, nbytes, last) for key, (_, nbytes, last) in entries.items()]
+            total = _STATE_BYTES.get(sid, 0) + sum(r[2] for r in rows)
+            if total > budget:
+                evicted += _evict(_order(rows, now, stale_after), total, budget)[0]
+
+        rows = [(sid, key, nbytes, last) for sid, entries in _STORE.items()
+                for key, (_, nbytes, last) in entries.items()]
+        total = sum(r[2] for r in rows)
+        if total > store_budget:
+            evicted += _evict(_order(rows, now, stale_after), total, store_budget)[0]
+
+        for sid in [s for s, entries in _STORE.items() if not entries]:
+            del _STORE[sid]
+        _SWEPT['entries'] += sum(sid != own for sid, _ in evicted)
+    return [key for sid, key in evicted if sid == own]
+
+
+def store_stats():
+    """{'sessions', 'entries', 'bytes', 'swept_sessions', 'swept_entries'} ของ store ทั้ง process"""
+    with _LOCK:
+        return {'sessions': len(_STORE),
+                'entries': sum(len(e) for e in _STORE.values()),
+                'bytes': sum(v[1] for e in _STORE.values() for v in e.values()),
+                'swept_sessions': _SWEPT['sessions'], 'swept_entries': _SWEPT['entries']}
+
+
+def render_usage():
+    rows = usage()
+    total = session_bytes(rows)
+    s = store_stats()
+    st.caption(f"This session: {total / 1024:,.1f} KB of {BUDGET_BYTES / 1024:,.0f} KB budget "
+               f"(stale after {STALE_AFTER_S:,.0f} s) · All sessions: {s['entries']:,} results in "
+               f"{s['sessions']:,} sessions, {s['bytes'] / 1024:,.1f} KB of {STORE_BYTES / 1024:,.0f} KB · "
+               f"swept from other sessions: {s['swept_entries']:,}")
+    lines = ["| Key | KB | Kind | Idle (s) |", "|---|---:|---|---:|"]
+    for key, nbytes, kind, idle in rows[:25]:
+        lines.append(f"| `{key}` | {nbytes / 1024:,.1f} | {kind} | {'' if idle is None else f'{idle:,.0f}'} |")
+    st.markdown("\n".join(lines))
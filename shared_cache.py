@@ -0,0 +1,174 @@
+# shared_cache.py
+# Cache กลางของ process (ใช้ร่วมกันทุก session) สำหรับผลลัพธ์ของ engine ที่เป็น pure function
+# - key = hash ของ input ที่ canonicalize แล้ว (float ปัดเศษ, dict เรียง key, numpy -> bytes)
+# - จำกัดหน่วยความจำรวม (SHARED_CACHE_MB), ไล่ออกแบบ LRU, หมดอายุตาม TTL
+# - เก็บสถิติ hit / miss / eviction ต่อ namespace
+#
+# ค่าที่ cache ถูกแชร์ข้าม session: ห้ามแก้ไขค่าที่ได้คืน (ใช้ copy=True ถ้าผู้เรียกอาจแก้)
+import copy as _copy
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_BYTES = int(float(os.environ.get("SHARED_CACHE_MB", 256)) * 1024 * 1024)
+DEFAULT_TTL = float(os.environ.get("SHARED_CACHE_TTL_S", 0)) or None  # None = ไม่หมดอายุ
+FLOAT_DIGITS = 9  # significant digits ของ float ใน key
+
+_LOCK = threading.RLock()
+_ENTRIES = OrderedDict()  # key -> (value, nbytes, expires_at, namespace)
+_STATS = {}               # namespace -> {hits, misses, evictions, expired, entries, bytes}
+_TOTAL = {'bytes': 0}
+
+# ==========================================
+# 🔑 1. CANONICAL KEYS
+# ==========================================
+def _canon(obj):
+    if isinstance(obj, bool) or obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        v = float(obj)
+        return float(f"{v:.{FLOAT_DIGITS}g}") if np.isfinite(v) else repr(v)
+    if isinstance(obj, dict):
+        return tuple(sorted((str(k), _canon(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_canon(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        return ("nd", obj.dtype.str, obj.shape, hashlib.sha1(np.ascontiguousarray(obj).tobytes()).hexdigest())
+    return repr(obj)
+
+def make_key(namespace, *args, **kwargs):
+    canon = (namespace, _canon(args), _canon(kwargs))
+    return hashlib.sha1(pickle.dumps(canon, protocol=4)).hexdigest()
+
+# ==========================================
+# 📏 2. SIZE ESTIMATE
+# ==========================================
+def estimate_bytes(obj, _depth=0):
+    """ขนาดโดยประมาณ (numpy = nbytes, DataFrame = memory_usage(deep), container = รวมลูก)"""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + 112
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):  # pandas DataFrame
+        return int(obj.memory_usage(deep=True).sum())
+    if _depth > 4:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_bytes(k, _depth + 1) + estimate_bytes(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_bytes(v, _depth + 1) for v in obj)
+    if hasattr(obj, "to_plotly_json"):  # plotly figure
+        return len(pickle.dumps(obj, protocol=4))
+    return sys.getsizeof(obj)
+
+# ==========================================
+# 🗄️ 3. STORE (LRU + TTL + MEMORY CEILING)
+# ==========================================
+def _ns_stats(namespace):
+    return _STATS.setdefault(namespace, {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'entries': 0, 'bytes': 0})
+
+def _drop(key, reason=None):
+    value, nbytes, _, ns = _ENTRIES.pop(key)
+    st_ = _ns_stats(ns)
+    st_['entries'] -= 1
+    st_['bytes'] -= nbytes
+    if reason:
+        st_[reason] += 1
+    _TOTAL['bytes'] -= nbytes
+
+def get(namespace, key):
+    """คืนค่า (found, value)"""
+    with _LOCK:
+        entry = _ENTRIES.get(key)
+        stats = _ns_stats(namespace)
+        if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+            _drop(key, 'expired')
+            entry = None
+        if entry is None:
+            stats['misses'] += 1
+            return False, None
+        _ENTRIES.move_to_end(key)
+        stats['hits'] += 1
+        return True, entry[0]
+
+def put(namespace, key, value, ttl=None):
+    nbytes = estimate_bytes(value)
+    if nbytes > MAX_BYTES:
+        return  # ใหญ่เกิน budget ทั้งก้อน: ไม่ cache
+    with _LOCK:
+        if key in _ENTRIES:
+            _drop(key)
+        expires = time.monotonic() + ttl if ttl else None
+        _ENTRIES[key] = (value, nbytes, expires, namespace)
+        stats = _ns_stats(namespace)
+        stats['entries'] += 1
+        stats['bytes'] += nbytes
+        _TOTAL['bytes'] += nbytes
+        while _TOTAL['bytes'] > MAX_BYTES and _ENTRIES:
+            _drop(next(iter(_ENTRIES)), 'evictions')
+
+def clear(namespace=None):
+    with _LOCK:
+        for key in [k for k, e in _ENTRIES.items() if namespace is None or e[3] == namespace]:
+            _drop(key, 'evictions')
+
+def stats():
+    """{namespace: {...}} + '_total' (entries, bytes, max_bytes)"""
+    with _LOCK:
+        out = {ns: dict(s) for ns, s in _STATS.items()}
+        out['_total'] = {'entries': len(_ENTRIES), 'bytes': _TOTAL['bytes'], 'max_bytes': MAX_BYTES}
+    return out
+
+# ==========================================
+# 🎯 4. DECORATOR
+# ==========================================
+def memoize(namespace=None, ttl=DEFAULT_TTL, copy=False, key_fn=None):
+    """
+    @memoize("beam") -> cache ผลลัพธ์ของ pure function ข้าม session
+    key_fn(*args, **kwargs) -> ใช้แทน canonical key ของ argument ทั้งหมด (เช่น geometry hash)
+    copy=True -> คืน deepcopy (ใช้เมื่อผู้เรียกอาจแก้ไขผลลัพธ์)
+    """
+    def decorator(func):
+        ns = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(ns, key_fn(*args, **kwargs)) if key_fn else make_key(ns, *args, **kwargs)
+            found, value = get(ns, key)
+            if not found:
+                value = func(*args, **kwargs)
+                put(ns, key, value, ttl)
+            return _copy.deepcopy(value) if copy else value
+
+        wrapper.cache_namespace = ns
+        wrapper.cache_clear = lambda: clear(ns)
+        return wrapper
+    return decorator
+
+# ==========================================
+# 📊 5. UI
+# ==========================================
+def render_stats():
+    import streamlit as st
+
+    s = stats()
+    total = s.pop('_total')
+    st.caption(f"Shared cache: {total['entries']:,} entries · {total['bytes'] / 2**20:,.1f} / "
+               f"{total['max_bytes'] / 2**20:,.0f} MB (all sessions)")
+    if not s:
+        return
+    lines = ["| Namespace | Hits | Misses | Hit % | Evicted | Expired | Entries | MB |",
+             "|---|---:|---:|---:|---:|---:|---:|---:|"]
+    for ns, v in sorted(s.items()):
+        calls = v['hits'] + v['misses']
+        rate = 100 * v['hits'] / calls if calls else 0
+        lines.append(f"| `{ns}` | {v['hits']:,} | {v['misses']:,} | {rate:.0f} | {v['evictions']:,} | "
+                     f"{v['expired']:,} | {v['entries']:,} | {v['bytes'] / 2**20:,.2f} |")
+    st.markdown("\n".join(lines))
@@ -0,0 +1,90 @@
+# strength_tables.py
+# ตารางกำลังสลักเกลียวและแผ่นเหล็ก (สร้างครั้งเดียวตอน import)
+# หน่วย: MPa, mm, kN
+#
+# ทุกโมดูล connection ใช้ตารางนี้ร่วมกัน: แปลงชื่อเกรด (string) เป็น id ครั้งเดียว
+# แล้ว index array แทนการเทียบ string ซ้ำๆ ต่อ candidate
+import math
+import numpy as np
+
+# ==========================================
+# 🗄️ 0. SOURCE DATA
+# ==========================================
+# FnvX = Threads Excluded (AISC Table J3.2); F10T ใช้ 1.25 x Fnv
+BOLT_DB = {
+    "Grade 8.8 (ISO)":   {"Fnv": 372, "FnvX": 457,    "Fnt": 620, "Fu": 800,  "Desc": "High Tensile Bolt (Common in TH)"},
+    "A325 (ASTM)":       {"Fnv": 372, "FnvX": 457,    "Fnt": 620, "Fu": 825,  "Desc": "Structural Bolt (US Standard)"},
+    "F10T (JIS)":        {"Fnv": 469, "FnvX": 586.25, "Fnt": 780, "Fu": 1000, "Desc": "T.C. Bolt (JIS Standard)"},
+    "Grade 10.9 (ISO)":  {"Fnv": 469, "FnvX": 579,    "Fnt": 780, "Fu": 1000, "Desc": "Very High Tensile (Eq. A490)"},
+    "A490 (ASTM)":       {"Fnv": 469, "FnvX": 579,    "Fnt": 780, "Fu": 1035, "Desc": "Extra High Strength Bolt"},
+}
+
+PLATE_DB = {
+    "SS400": {"Fy": 245, "Fu": 400},
+    "SM520": {"Fy": 355, "Fu": 520},
+    "A36":   {"Fy": 250, "Fu": 400},
+}
+DEFAULT_PLATE = "A36"
+
+BOLT_DIAMETERS = np.array([12, 16, 20, 22, 24, 27, 30])
+THREAD_CONDITIONS = ("N", "X")
+METHODS = ("LRFD", "ASD")
+
+# Resistance factors per method (ASD: 1/Omega for display consistency)
+PHI_Y = np.array([0.90, 1 / 1.67])  # yielding
+PHI_R = np.array([0.75, 1 / 2.00])  # rupture / bearing / block shear
+PHI_W = np.array([0.75, 1 / 2.00])  # weld
+PHI_B = np.array([0.75, 1 / 2.00])  # bolt shear / tension
+
+# ==========================================
+# 🧮 1. PRECOMPUTED ARRAYS
+# ==========================================
+BOLT_NAMES = list(BOLT_DB.keys())
+PLATE_NAMES = list(PLATE_DB.keys())
+
+FNV = np.array([[BOLT_DB[g]["Fnv"], BOLT_DB[g]["FnvX"]] for g in BOLT_NAMES], dtype=float)  # [grade, thread]
+FNT = np.array([BOLT_DB[g]["Fnt"] for g in BOLT_NAMES], dtype=float)                        # [grade]
+FU_BOLT = np.array([BOLT_DB[g]["Fu"] for g in BOLT_NAMES], dtype=float)                     # [grade]
+
+PLATE_FY = np.array([PLATE_DB[p]["Fy"] for p in PLATE_NAMES], dtype=float)  # [plate]
+PLATE_FU = np.array([PLATE_DB[p]["Fu"] for p in PLATE_NAMES], dtype=float)  # [plate]
+
+AB = math.pi * BOLT_DIAMETERS.astype(float) ** 2 / 4  # [diameter] mm²
+
+# φ-factored per-bolt strengths (kN): [method, grade, diameter(, thread)]
+BOLT_SHEAR_KN = PHI_B[:, None, None, None] * FNV[None, :, None, :] * AB[None, None, :, None] / 1000.0
+BOLT_TENSION_KN = PHI_B[:, None, None] * FNT[None, :, None] * AB[None, None, :] / 1000.0
+
+# φ-factored bearing coefficients (kN per mm of plate thickness)
+#   tearout : 1.2 lc t Fu  ->  TEAROUT_KN[method, plate] * lc * t
+#   bearing : 2.4 d  t Fu  ->  BEARING_MAX_KN[method, plate, diameter] * t
+TEAROUT_KN = PHI_R[:, None] * 1.2 * PLATE_FU[None, :] / 1000.0
+BEARING_MAX_KN = PHI_R[:, None, None] * 2.4 * BOLT_DIAMETERS[None, None, :] * PLATE_FU[None, :, None] / 1000.0
+
+# ==========================================
+# 🔎 2. ID LOOKUPS (string -> index, ทำครั้งเดียวต่อการเรียก)
+# ==========================================
+def method_id(is_lrfd):
+    return 0 if is_lrfd else 1
+
+def bolt_grade_id(name):
+    return BOLT_NAMES.index(name)
+
+def thread_id(label):
+    return 1 if "Excluded" in label or label == "X" else 0
+
+def plate_grade_id(label):
+    """'SS400 (Fy 245)', 'SS400 (Fy 2450)', 'SM520 ...' -> id; อื่นๆ ใช้ A36"""
+    for i, name in enumerate(PLATE_NAMES):
+        if name in label:
+            return i
+    return PLATE_NAMES.index(DEFAULT_PLATE)
+
+def diameter_index(d):
+    """index ของ bolt diameter (รองรับ array); raise ValueError ถ้าไม่มีในตาราง"""
+    d_arr = np.asarray(d)
+    idx = np.searchsorted(BOLT_DIAMETERS, d_arr)
+    idx_c = np.clip(idx, 0, len(BOLT_DIAMETERS) - 1)
+    if np.any(BOLT_DIAMETERS[idx_c] != d_arr):
+        raise ValueError(f"Bolt diameter not in strength table: {d}")
+    return idx_c
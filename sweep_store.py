@@ -0,0 +1,211 @@
+# sweep_store.py
+# เก็บผล parameter sweep ขนาดใหญ่ (ถึง ~10⁸ แถว) ลงดิสก์แบบ chunked columnar
+# - writer รับ chunk (dict ของ column array) ทีละก้อนแล้วเขียนเป็น shard
+# - manifest.json เล็กๆ บอก column / dtype / จำนวนแถวของแต่ละ shard
+# - reader เปิด shard ทีละก้อน (npy = memory-map) หน่วยความจำจึงขึ้นกับขนาด chunk
+#
+# รูปแบบ shard:
+#   "npy"     : 1 ไฟล์ .npy ต่อ column ต่อ shard (ไม่บีบอัด, memory-map ได้)
+#   "npz"     : 1 ไฟล์ .npz ต่อ shard (บีบอัด, โหลดทีละ shard)
+#   "parquet" : 1 ไฟล์ .parquet ต่อ shard (ต้องมี pyarrow)
+import json
+import os
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+FORMATS = ("npy", "npz", "parquet")
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# ==========================================
+# ✍️ 1. WRITER
+# ==========================================
+class SweepWriter:
+    """เขียน chunk ต่อเนื่องเป็น shard (ใช้กับ with-statement เพื่อให้ manifest ถูกเขียนเสมอ)"""
+
+    def __init__(self, out_dir, fmt="npy", meta=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown shard format: {fmt}")
+        if fmt == "parquet" and not HAS_PARQUET:
+            raise ImportError("Parquet shards require pyarrow (use fmt='npy' or 'npz').")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.meta = meta or {}
+        self.columns = None
+        self.shards = []
+
+    def write(self, chunk):
+        n = len(next(iter(chunk.values())))
+        if self.columns is None:
+            self.columns = {k: np.asarray(v).dtype.str for k, v in chunk.items()}
+        elif list(chunk) != list(self.columns):
+            raise ValueError("Chunk columns differ from the first chunk.")
+
+        sid = len(self.shards)
+        if self.fmt == "npy":
+            files = {}
+            for col, arr in chunk.items():
+                files[col] = f"shard_{sid:05d}.{col}.npy"
+                np.save(os.path.join(self.out_dir, files[col]), np.ascontiguousarray(arr))
+        elif self.fmt == "npz":
+            files = f"shard_{sid:05d}.npz"
+            np.savez_compressed(os.path.join(self.out_dir, files), **chunk)
+        else:
+            files = f"shard_{sid:05d}.parquet"
+            table = pa.table({k: np.asarray(v) for k, v in chunk.items()})
+            pq.write_table(table, os.path.join(self.out_dir, files), compression="zstd")
+        self.shards.append({'rows': int(n), 'files': files})
+
+    def close(self):
+        manifest = {
+            'format': self.fmt,
+            'columns': self.columns or {},
+            'n_rows': sum(s['rows'] for s in self.shards),
+            'shards': self.shards,
+            'meta': self.meta,
+        }
+        with open(os.path.join(self.out_dir, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=1)
+        self.manifest = manifest
+        return manifest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def write_sweep(chunks, out_dir, fmt="npy", meta=None, progress=None):
+    """stream chunks จาก generator (เช่น beam_engine.iter_sweep) ลง out_dir คืนค่า manifest"""
+    with SweepWriter(out_dir, fmt, meta) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            if progress:
+                progress(sum(s['rows'] for s in writer.shards))
+    return writer.manifest
+
+# ==========================================
+# 📖 2. READER (ทีละ shard)
+# ==========================================
+class SweepReader:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.fmt = self.manifest['format']
+        self.columns = list(self.manifest['columns'])
+        self.n_rows = self.manifest['n_rows']
+        self.meta = self.manifest.get('meta', {})
+
+    def _load_shard(self, shard, columns):
+        path = lambda name: os.path.join(self.out_dir, name)
+        if self.fmt == "npy":
+            return {c: np.load(path(shard['files'][c]), mmap_mode="r") for c in columns}
+        if self.fmt == "npz":
+            with np.load(path(shard['files'])) as z:
+                return {c: z[c] for c in columns}
+        table = pq.read_table(path(shard['files']), columns=columns)
+        return {c: table.column(c).to_numpy() for c in columns}
+
+    def iter_chunks(self, columns=None):
+        """yield dict ของ column array ทีละ shard (npy เป็น memmap ไม่โหลดทั้งไฟล์)"""
+        columns = self.columns if columns is None else list(columns)
+        for shard in self.manifest['shards']:
+            yield self._load_shard(shard, columns)
+
+    def reduce(self, column, op="sum", where=None):
+        """sum / min / max / mean / count ของ column (where = ฟังก์ชัน chunk -> mask)"""
+        cols = [column] + ([c for c in self.columns if c != column] if where else [])
+        total, count = None, 0
+        for chunk in self.iter_chunks(cols):
+            x = np.asarray(chunk[column], dtype=float)
+            if where is not None:
+                x = x[where(chunk)]
+            if x.size == 0:
+                continue
+            count += x.size
+            if op in ("sum", "mean"):
+                v = x.sum()
+                total = v if total is None else total + v
+            elif op == "min":
+                v = x.min()
+                total = v if total is None else min(total, v)
+            elif op == "max":
+                v = x.max()
+                total = v if total is None else max(total, v)
+            elif op != "count":
+                raise ValueError(f"Unknown reduction: {op}")
+        if op == "count":
+            return count
+        if op == "mean":
+            return total / count if count else float("nan")
+        return total
+
+    def group_reduce(self, by, column, n_groups, op="max"):
+        """reduce column ต่อกลุ่ม (by = column ของ id จำนวนเต็ม 0..n_groups-1)"""
+        if op in ("sum", "mean"):
+            acc = np.zeros(n_groups)
+        elif op == "max":
+            acc = np.full(n_groups, -np.inf)
+        elif op == "min":
+            acc = np.full(n_groups, np.inf)
+        else:
+            raise ValueError(f"Unknown reduction: {op}")
+        counts = np.zeros(n_groups, dtype=np.int64)
+        for chunk in self.iter_chunks([by, column]):
+            g = np.asarray(chunk[by], dtype=np.int64)
+            x = np.asarray(chunk[column], dtype=float)
+            counts += np.bincount(g, minlength=n_groups)
+            if op in ("sum", "mean"):
+                acc += np.bincount(g, weights=x, minlength=n_groups)
+            elif op == "max":
+                np.maximum.at(acc, g, x)
+            else:
+                np.minimum.at(acc, g, x)
+        if op == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                acc = acc / counts
+        return acc, counts
+
+# ==========================================
+# 🖥️ 3. COMMAND LINE (full catalog calibration sweep)
+# ==========================================
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import beam_engine
+
+    ap = argparse.ArgumentParser(description="Stream a beam design sweep to chunked columnar shards.")
+    ap.add_argument("out_dir")
+    ap.add_argument("--format", default="npy", choices=FORMATS)
+    ap.add_argument("--chunk-rows", type=int, default=beam_engine.DEFAULT_CHUNK_ROWS)
+    ap.add_argument("--spans", type=int, default=120, help="number of spans between 1 and 30 m")
+    ap.add_argument("--lb-steps", type=int, default=11, help="number of Lb/L ratios between 0 and 1")
+    ap.add_argument("--load-steps", type=int, default=20, help="number of load %% steps between 5 and 100")
+    args = ap.parse_args()
+
+    grades = [2450, 2500, 3550]
+    spans = np.linspace(1.0, 30.0, args.spans)
+    lb_ratios = np.linspace(0.0, 1.0, args.lb_steps)
+    load_pcts = np.linspace(5.0, 100.0, args.load_steps)
+    names, _ = beam_engine.catalog_arrays()
+    n = beam_engine.sweep_size(grades, spans, lb_ratios, load_pcts)
+
+    t0 = time.time()
+    manifest = write_sweep(
+        beam_engine.iter_sweep(grades, spans, lb_ratios, load_pcts, chunk_rows=args.chunk_rows),
+        args.out_dir, args.format,
+        meta={'sections': names, 'grades': grades, 'axes': beam_engine.SWEEP_AXES,
+              'gov': beam_engine.CHECK_CAUSES, 'ltb_zone': beam_engine.LTB_ZONES},
+        progress=lambda done: print(f"\r{done:,}/{n:,} rows", end="", flush=True),
+    )
+    print(f"\nWrote {manifest['n_rows']:,} rows in {len(manifest['shards'])} shards ({time.time() - t0:.1f} s)")
@@ -2,6 +2,9 @@ import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 import math
+import calculation_report
+import design_atlas
+import plot_utils
 
 def render(data):
     """
@@ -30,12 +33,10 @@ def render(data):
     user_span = data['user_span']
     Lb = data['Lb']
     sec_name = data['sec_name']
-    Aw = data['Aw']
     Fy = data['Fy']
     E = data['E']
     Ix = data['Ix']
     Sx = data['Sx']
-    Zx = data.get('Zx', Sx)
     
     # Capacities & Results
     V_cap = data['V_cap']
@@ -43,15 +44,12 @@ def render(data):
     d_allow = data['d_allow']
     
     # LTB Parameters
-    Mn = data['Mn']
     Mp = data['Mp']
     Lp_cm = data['Lp_cm']
     Lr_cm = data['Lr_cm']
-    ltb_zone = data['ltb_zone']
     Cb = data.get('Cb', 1.0)
     
     # Constants
-    factor_txt = "1.4" if is_lrfd else "1.0"
     factor_val = 1.4 if is_lrfd else 1.0
     defl_denom = data['defl_denom']
 
@@ -152,158 +150,12 @@ def render(data):
     st.write("---")
     st.subheader("📝 Calculation Sheet")
     
-    with st.expander("Show Detailed Calculations", expanded=True):
-        st.markdown("""<style>.calc-head { font-weight: bold; font-size: 1.1em; color: #1e40af; margin-bottom: 10px; display:block; } .calc-step { border-bottom: 1px dashed #cbd5e1; padding-bottom: 15px; margin-bottom: 20px; }</style>""", unsafe_allow_html=True)
-
-        # ----------------------------------------
-        # SECTION 1: PROPERTIES (Shared)
-        # ----------------------------------------
-        st.markdown('<span class="calc-head">1. Design Parameters</span>', unsafe_allow_html=True)
-        col_p1, col_p2, col_p3 = st.columns(3)
-        with col_p1: 
-            st.latex(rf"F_y = {Fy} \; ksc")
-            st.latex(rf"S_x = {Sx} \; cm^3")
-        with col_p2: 
-            st.latex(rf"E = {E:,.0f} \; ksc")
-            st.latex(rf"Z_x = {Zx:.1f} \; cm^3")
-        with col_p3: 
-            st.latex(rf"L = {user_span} \; m")
-            st.latex(rf"I_x = {Ix:,.0f} \; cm^4")
-        st.markdown('<div class="calc-step"></div>', unsafe_allow_html=True)
-
-        if is_check_mode:
-            # ========================================
-            # MODE A: CHECK DESIGN (Forward)
-            # ========================================
-            st.info("📌 **Mode: Check Design** (Verify section capacity against input loads)")
-            
-            # 2. Load
-            st.markdown('<span class="calc-head">2. Load Analysis</span>', unsafe_allow_html=True)
-            st.latex(rf"w_u = {factor_txt} \times {w_input:,.0f} = {fact_w_plot:,.0f} \; kg/m")
-            st.latex(rf"P_u = {factor_txt} \times {p_input:,.0f} = {fact_p_plot:,.0f} \; kg")
-            st.latex(rf"M_u = \frac{{w_u L^2}}{{8}} + \frac{{P_u L}}{{4}} = {m_act_sim:,.0f} \; kg \cdot m")
-            st.markdown('<div class="calc-step"></div>', unsafe_allow_html=True)
-            
-            # 3. Capacity Check
-            st.markdown('<span class="calc-head">3. Capacity Check</span>', unsafe_allow_html=True)
-            
-            # 3.1 Shear
-            st.write("**3.1 Shear Capacity**")
-            st.latex(rf"V_n = 0.6 F_y A_w = 0.6({Fy})({Aw}) = {0.6*Fy*Aw:,.0f} \; kg")
-            st.latex(rf"\text{{Capacity }} V_{{cap}} = {V_cap:,.0f} \; kg \quad \text{{(Ratio = {ratio_v_show:.2f})}}")
-            
-            # 3.2 Moment (LTB)
-            st.write("**3.2 Moment Capacity (LTB)**")
-            st.latex(rf"L_b = {Lb} m, \quad L_p = {Lp_cm/100:.2f} m, \quad L_r = {Lr_cm/100:.2f} m")
-            st.write(f"Condition: **{ltb_zone}**")
-            
-            # Show LTB Formula based on zone
-            if "Zone 1" in ltb_zone: st.latex(r"M_n = M_p = F_y Z_x")
-            elif "Zone 2" in ltb_zone: st.latex(r"M_n = C_b [M_p - (M_p - 0.7 F_y S_x)(\frac{L_b - L_p}{L_r - L_p})]")
-            else: st.latex(r"M_n = F_{cr} S_x")
-            
-            st.latex(rf"M_n = {Mn/100:,.0f} \; kg \cdot m")
-            st.latex(rf"\text{{Capacity }} M_{{cap}} = {M_cap:,.0f} \; kg \cdot m \quad \text{{(Ratio = {ratio_m_show:.2f})}}")
-            st.markdown('<div class="calc-step"></div>', unsafe_allow_html=True)
-            
-            # 4. Deflection
-            st.markdown('<span class="calc-head">4. Deflection Check</span>', unsafe_allow_html=True)
-            st.latex(rf"\Delta_{{act}} = {d_act_sim:.2f} \; cm")
-            st.latex(rf"\Delta_{{limit}} = L/{defl_denom} = {d_allow:.2f} \; cm \quad \text{{(Ratio = {ratio_d_show:.2f})}}")
-
-        else:
-            # ========================================
-            # MODE B: FIND CAPACITY (Reverse)
-            # ========================================
-            st.info("📌 **Mode: Find Capacity** (Determine maximum safe load)")
-            
-            # 2. Section Capacity (Detailed)
-            st.markdown('<span class="calc-head">2. Determine Section Capacity</span>', unsafe_allow_html=True)
-            
-            # 2.1 Shear Capacity
-            st.write("**2.1 Shear Capacity ($V_n$)**")
-            st.latex(r"V_n = 0.6 F_y A_w")
-            vn_val = 0.6 * Fy * Aw
-            st.latex(rf"V_n = 0.6 ({Fy}) ({Aw:.2f}) = {vn_val:,.0f} \; kg")
-            if is_lrfd:
-                st.latex(rf"V_{{design}} = \phi V_n = 1.0 \times {vn_val:,.0f} = \mathbf{{{V_cap:,.0f}}} \; kg")
-            else:
-                st.latex(rf"V_{{design}} = V_n / \Omega = {vn_val:,.0f} / 1.5 = \mathbf{{{V_cap:,.0f}}} \; kg")
-            
-            # 2.2 Moment Capacity (Full Steps)
-            st.write("**2.2 Moment Capacity ($M_n$)**")
-            st.write("Check Lateral-Torsional Buckling (LTB):")
-            col_z1, col_z2 = st.columns(2)
-            with col_z1:
-                st.latex(rf"L_b = {Lb} \; m")
-            with col_z2:
-                st.latex(rf"L_p = {Lp_cm/100:.2f} m, \; L_r = {Lr_cm/100:.2f} m")
-            
-            st.write(f"$\therefore$ Condition falls in **{ltb_zone}**")
-            
-            # Show LTB Formula based on zone
-            if "Zone 1" in ltb_zone:
-                st.latex(r"M_n = M_p = F_y Z_x")
-                st.latex(rf"M_n = {Fy} \times {Zx:.1f} = {Mn:,.0f} \; kg \cdot cm")
-            elif "Zone 2" in ltb_zone:
-                st.latex(r"M_n = C_b [M_p - (M_p - 0.7 F_y S_x)(\frac{L_b - L_p}{L_r - L_p})]")
-                st.write("Substituting:")
-                term_mp = Mp
-                term_mr = 0.7 * Fy * Sx
-                frac = (Lb*100 - Lp_cm)/(Lr_cm - Lp_cm)
-                st.latex(rf"M_n = {Cb} [{term_mp:,.0f} - ({term_mp:,.0f} - {term_mr:,.0f})({frac:.3f})]")
-                st.latex(rf"M_n = {Mn:,.0f} \; kg \cdot cm")
-            else:
-                st.latex(r"M_n = F_{cr} S_x")
-                st.latex(rf"F_{{cr}} = \frac{{C_b \pi^2 E}}{{(L_b/r_{{ts}})^2}} \sqrt{{1 + 0.078 \frac{{J c}}{{S_x h_o}} (L_b/r_{{ts}})^2}}")
-                st.latex(rf"M_n = {Mn:,.0f} \; kg \cdot cm")
-
-            # Convert to Design Moment
-            mn_kgm = Mn/100
-            if is_lrfd:
-                st.latex(rf"M_{{design}} = \phi M_n = 0.90 \times {mn_kgm:,.0f} = \mathbf{{{M_cap:,.0f}}} \; kg \cdot m")
-            else:
-                st.latex(rf"M_{{design}} = M_n / \Omega = {mn_kgm:,.0f} / 1.67 = \mathbf{{{M_cap:,.0f}}} \; kg \cdot m")
-            
-            # 2.3 Deflection Limit
-            st.write("**2.3 Allowable Deflection ($\Delta_{allow}$)**")
-            st.latex(rf"\Delta_{{allow}} = L / {defl_denom} = {user_span*100:.0f} / {defl_denom} = \mathbf{{{d_allow:.2f}}} \; cm")
-            st.markdown('<div class="calc-step"></div>', unsafe_allow_html=True)
-            
-            # 3. Reverse Calculation
-            st.markdown('<span class="calc-head">3. Calculate Safe Load</span>', unsafe_allow_html=True)
-            st.write("Reverse calculate $w$ (Uniform Load) from capacities:")
-            
-            col_rev1, col_rev2 = st.columns(2)
-            with col_rev1:
-                st.markdown("**Case A: Moment Control**")
-                st.latex(r"M_{des} = \frac{w L^2}{8} \Rightarrow w = \frac{8 M_{des}}{L^2}")
-                w_m_val = (8 * M_cap) / (user_span**2)
-                st.latex(rf"w_1 = \frac{{8 ({M_cap:,.0f})}}{{ {user_span}^2 }} = {w_m_val:,.0f} \; kg/m")
-                
-            with col_rev2:
-                st.markdown("**Case B: Shear Control**")
-                st.latex(r"V_{des} = \frac{w L}{2} \Rightarrow w = \frac{2 V_{des}}{L}")
-                w_v_val = (2 * V_cap) / user_span
-                st.latex(rf"w_2 = \frac{{2 ({V_cap:,.0f})}}{{ {user_span} }} = {w_v_val:,.0f} \; kg/m")
-            
-            st.markdown("**Case C: Deflection Control (Service Limit)**")
-            st.latex(r"\Delta_{all} = \frac{5 w_{serv} L^4}{384 E I} \Rightarrow w_{serv} = \frac{384 E I \Delta_{all}}{5 L^4}")
-            
-            l_cm = user_span * 100
-            w_d_serv = (384 * E * Ix * d_allow) / (5 * l_cm**4) * 100
-            w_d_ult = w_d_serv * factor_val
-            
-            st.latex(rf"w_{{serv}} = \frac{{384 ({E:.0f}) ({Ix:.0f}) ({d_allow:.2f})}}{{5 ({l_cm:.0f})^4}} \times 100 = {w_d_serv:,.0f} \; kg/m")
-            st.write(f"Convert to Strength Level for comparison (x {factor_txt}):")
-            st.latex(rf"w_3 = {w_d_serv:,.0f} \times {factor_txt} = {w_d_ult:,.0f} \; kg/m")
-            
-            st.markdown('<div class="calc-step"></div>', unsafe_allow_html=True)
-            st.markdown('<span class="calc-head">4. Conclusion</span>', unsafe_allow_html=True)
-            min_w = min(w_m_val, w_v_val, w_d_ult)
-            st.latex(rf"w_{{safe(u)}} = \min({w_m_val:,.0f}, {w_v_val:,.0f}, {w_d_ult:,.0f}) = \mathbf{{{min_w:,.0f}}} \; kg/m")
-            st.write(f"Convert back to Service Load (divide by {factor_txt}):")
-            st.markdown(f"### ✅ Max Safe Load = {min_w/factor_val:,.0f} kg/m")
+    # ทั้ง sheet = markdown ก้อนเดียว (1 element ต่อ rerun แทน st.latex / st.write หลายสิบตัว)
+    # สร้างรอบเดียวจาก results_context และ cache ด้วยผลคาน (calculation_report.beam_report)
+    calc_exp = st.expander("Show Detailed Calculations", expanded=True, key="tab1_calc_sheet", on_change="rerun")
+    with calc_exp:
+        if calc_exp.open:
+            st.markdown(calculation_report.beam_report(data))
 
 
     # ==========================================
@@ -314,48 +166,42 @@ def render(data):
     if not is_check_mode:
         st.caption(f"💡 Visualizing behavior under **Safe Load: {w_plot_service:,.0f} kg/m**")
 
-    # Data Gen
-    x_plot = np.linspace(0, user_span, 100)
+    # Data Gen (vectorized: โหมด high-density sample ถี่ขึ้นแล้ว decimate ก่อนส่ง)
+    x_plot = np.linspace(0, user_span, plot_utils.samples())
     ra = (fact_w_plot * user_span / 2) + (fact_p_plot / 2)
-    v_y, m_y, d_y = [], [], []
+    beyond_mid = x_plot > user_span/2
     
     # Const for Deflection
     w_line_kcm = (w_plot_service / 100)
     p_point_k = p_plot_service
     L_cm = user_span * 100
     
-    for x_m in x_plot:
-        # V, M
-        shear = ra - (fact_w_plot * x_m)
-        if x_m > user_span/2: shear -= fact_p_plot
-        v_y.append(shear)
-        moment = (ra * x_m) - (fact_w_plot * x_m**2 / 2)
-        if x_m > user_span/2: moment -= fact_p_plot * (x_m - user_span/2)
-        m_y.append(moment)
-        # Deflection (Simplified Center Point Load + UDL)
-        x_cm = x_m * 100
-        y_udl = (w_line_kcm * x_cm) / (24 * E * Ix) * (L_cm**3 - 2*L_cm*x_cm**2 + x_cm**3)
-        if x_cm <= L_cm/2:
-            y_pl = (p_point_k * x_cm) / (48 * E * Ix) * (3*L_cm**2 - 4*x_cm**2)
-        else:
-            y_pl = (p_point_k * (L_cm - x_cm)) / (48 * E * Ix) * (3*L_cm**2 - 4*(L_cm-x_cm)**2)
-        d_y.append(y_udl + y_pl)
+    # V, M
+    v_y = ra - (fact_w_plot * x_plot) - np.where(beyond_mid, fact_p_plot, 0.0)
+    m_y = (ra * x_plot) - (fact_w_plot * x_plot**2 / 2) - np.where(beyond_mid, fact_p_plot * (x_plot - user_span/2), 0.0)
+    # Deflection (Simplified Center Point Load + UDL) ; จุดโหลดสมมาตร -> ใช้ระยะจากปลายที่ใกล้กว่า
+    x_cm = x_plot * 100
+    y_udl = (w_line_kcm * x_cm) / (24 * E * Ix) * (L_cm**3 - 2*L_cm*x_cm**2 + x_cm**3)
+    x_near = np.where(x_cm <= L_cm/2, x_cm, L_cm - x_cm)
+    y_pl = (p_point_k * x_near) / (48 * E * Ix) * (3*L_cm**2 - 4*x_near**2)
+    d_y = y_udl + y_pl
+    mid = (user_span/2,)  # จุดที่ V กระโดด / M และ Δ สูงสุด
 
     # Plot
     c_g1, c_g2, c_g3 = st.columns(3)
     with c_g1:
-        fig_v = go.Figure(go.Scatter(x=x_plot, y=v_y, fill='tozeroy', line_color='#3b82f6', name='Shear'))
+        fig_v = go.Figure(plot_utils.line(x_plot, v_y, keep_x=mid, fill='tozeroy', line_color='#3b82f6', name='Shear'))
         fig_v.add_hline(y=V_cap, line_dash="dot", line_color="gray")
         fig_v.add_hline(y=-V_cap, line_dash="dot", line_color="gray")
         fig_v.update_layout(title="Shear Force (SFD)", height=250, margin=dict(l=10,r=10,t=30,b=10))
         st.plotly_chart(fig_v, use_container_width=True)
     with c_g2:
-        fig_m = go.Figure(go.Scatter(x=x_plot, y=m_y, fill='tozeroy', line_color='#ef4444', name='Moment'))
+        fig_m = go.Figure(plot_utils.line(x_plot, m_y, keep_x=mid, fill='tozeroy', line_color='#ef4444', name='Moment'))
         fig_m.add_hline(y=M_cap, line_dash="dot", line_color="gray")
         fig_m.update_layout(title="Bending Moment (BMD)", height=250, margin=dict(l=10,r=10,t=30,b=10))
         st.plotly_chart(fig_m, use_container_width=True)
     with c_g3:
-        fig_d = go.Figure(go.Scatter(x=x_plot, y=d_y, line_color='#10b981', name='Deflection'))
+        fig_d = go.Figure(plot_utils.line(x_plot, d_y, keep_x=mid, line_color='#10b981', name='Deflection'))
         fig_d.add_hline(y=d_allow, line_dash="dash", line_color="red")
         fig_d.update_yaxes(autorange="reversed")
         fig_d.update_layout(title="Deflection Profile", height=250, margin=dict(l=10,r=10,t=30,b=10))
@@ -365,37 +211,30 @@ def render(data):
     # PART 4: SPAN CURVE (Original Logic)
     # ==========================================
     st.subheader("📉 Safe Load vs Span")
-    spans = np.linspace(1.0, 12.0, 50)
-    w_c_m, w_c_v, w_c_d = [], [], []
+    spans = np.linspace(1.0, 12.0, plot_utils.samples(50))
     r_ts_g = data.get('r_ts', 1.0)
     
-    for s in spans:
-        l_g = s * 100
-        # Shear
-        wv = (2 * V_cap) / s 
-        # Moment
-        if l_g <= Lp_cm: mn_g = Mp
-        elif l_g <= Lr_cm:
-            t = (Mp - 0.7*Fy*Sx) * ((l_g - Lp_cm)/(Lr_cm - Lp_cm))
-            mn_g = min(Mp, Cb*(Mp - t))
-        else:
-            sl = l_g / r_ts_g
-            fcr = (Cb * math.pi**2 * E) / (sl**2) 
-            mn_g = min(fcr * Sx, Mp)
-        m_d = (0.9*mn_g)/100 if is_lrfd else (mn_g/1.67)/100
-        wm = (8 * m_d) / (s**2)
-        # Defl
-        da = l_g / defl_denom
-        wd = ((da * 384 * E * Ix)/(5 * l_g**4) * 100) * factor_val
-        
-        w_c_m.append(wm/factor_val)
-        w_c_v.append(wv/factor_val)
-        w_c_d.append(wd/factor_val)
+    l_g = spans * 100
+    # Shear
+    wv = (2 * V_cap) / spans
+    # Moment
+    t = (Mp - 0.7*Fy*Sx) * ((l_g - Lp_cm)/(Lr_cm - Lp_cm))
+    sl = l_g / r_ts_g
+    fcr = (Cb * math.pi**2 * E) / (sl**2)
+    mn_g = np.where(l_g <= Lp_cm, Mp, np.where(l_g <= Lr_cm, np.minimum(Mp, Cb*(Mp - t)), np.minimum(fcr * Sx, Mp)))
+    m_d = (0.9*mn_g)/100 if is_lrfd else (mn_g/1.67)/100
+    wm = (8 * m_d) / (spans**2)
+    # Defl
+    da = l_g / defl_denom
+    wd = ((da * 384 * E * Ix)/(5 * l_g**4) * 100) * factor_val
+    
+    w_c_m, w_c_v, w_c_d = wm/factor_val, wv/factor_val, wd/factor_val
+    zones = (Lp_cm / 100, Lr_cm / 100)  # ขอบ zone LTB บนเส้น Moment Limit
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=spans, y=w_c_m, name='Moment Limit', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=spans, y=w_c_d, name='Deflection Limit', line=dict(color='green', dash='dash')))
-    fig.add_trace(go.Scatter(x=spans, y=w_c_v, name='Shear Limit', line=dict(color='orange', dash='dot')))
+    fig.add_trace(plot_utils.line(spans, w_c_m, keep_x=zones, name='Moment Limit', line=dict(color='blue')))
+    fig.add_trace(plot_utils.line(spans, w_c_d, name='Deflection Limit', line=dict(color='green', dash='dash')))
+    fig.add_trace(plot_utils.line(spans, w_c_v, name='Shear Limit', line=dict(color='orange', dash='dot')))
     
     # Marker
     if is_check_mode:
@@ -408,6 +247,12 @@ def render(data):
     fig.update_layout(height=400, xaxis_title="Span (m)", yaxis_title="Safe Service Load (kg/m)")
     st.plotly_chart(fig, use_container_width=True)
 
+    # Atlas ทั้ง catalog (คำนวณครั้งเดียวต่อ process) -> เทียบหน้าตัดข้างเคียงได้โดยไม่ต้องเปลี่ยน sidebar
+    atlas_exp = st.expander("🗺️ Catalog Atlas: Safe Load vs Span (all sections)", expanded=False, key="tab1_atlas", on_change="rerun")
+    with atlas_exp:
+        if atlas_exp.open:
+            design_atlas.render_safe_load(data)
+
     # ==========================================
     # PART 5: ENGINEERING SUMMARY & NOTES
     # ==========================================
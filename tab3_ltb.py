@@ -2,7 +2,9 @@
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
-import math
+import beam_engine
+import plot_utils
+import shared_cache
 
 def render(data):
     """
@@ -27,6 +29,81 @@ def render(data):
     J = data.get('J', 0)
     h0 = data.get('h0', 1)
 
+    render_ltb_panel(Lb_real, Lp_cm, Lr_cm, Mp, Fy, Sx, E, Cb, r_ts, val_A, user_span, is_lrfd, ry, J, h0)
+
+SIM_ZONES = [("Zone 1: Plastic", "#10b981"), ("Zone 2: Inelastic", "#f59e0b"), ("Zone 3: Elastic", "#ef4444")]
+SIM_STEP_M = 0.1
+
+def _sim_annotations(lb, mn_kgm, zone, is_lrfd):
+    """Zone badge + φMn readout (อยู่ใน layout ของกราฟ, slider เปลี่ยนฝั่ง browser)"""
+    name, color = SIM_ZONES[zone]
+    design = 0.90 * mn_kgm if is_lrfd else mn_kgm / 1.67
+    design_lbl = "φMn" if is_lrfd else "Mn/Ω"
+    return [
+        dict(xref="paper", yref="paper", x=0.99, y=0.98, xanchor="right", yanchor="top", showarrow=False,
+             text=f"<b>{name}</b>", font=dict(size=13, color=color),
+             bgcolor="white", bordercolor=color, borderwidth=2, borderpad=5),
+        dict(xref="paper", yref="paper", x=0.99, y=0.80, xanchor="right", yanchor="top", showarrow=False, align="right",
+             text=f"Lb = {lb:.1f} m<br><b>Mn = {mn_kgm:,.0f}</b> kg-m<br>{design_lbl} = {design:,.0f} kg-m",
+             font=dict(size=13, color="#1e293b"), bgcolor="rgba(255,255,255,0.85)"),
+    ]
+
+@shared_cache.memoize("tab3_ltb.simulator_figure")
+def build_simulator_figure(Lb_real, Lp_cm, Lr_cm, Fy, Sx, Zx, E, Cb, r_ts, val_A, ry, J, h0, user_span, is_lrfd, dense=False):
+    """
+    Mn(Lb) curve + zone + ทุก step ของ slider คำนวณครั้งเดียวแล้วส่งไปกับกราฟ
+    (Plotly layout.sliders: ขยับ slider แล้วอัปเดต marker / badge / readout ใน browser ไม่มี rerun)
+    dense=True: sample Mn ถี่ + WebGL trace (decimate โดยเก็บจุดที่ Lp / Lr ไว้)
+    """
+    Lp_m, Lr_m = Lp_cm / 100, Lr_cm / 100
+    max_len = max(Lr_m * 1.5, user_span)
+
+    x_vals = np.linspace(0.0, max_len, plot_utils.DENSE_SAMPLES if dense else plot_utils.DEFAULT_SAMPLES)
+    curve = beam_engine.ltb_capacity(Fy, Zx, Sx, ry, J, h0, r_ts, x_vals * 100, E, Cb)
+
+    # เริ่มที่ Lb = 0 (fully braced): Lb จริง = 0 ต้องได้ marker ที่ 0 ไม่ใช่ step แรกที่ 0.5
+    lb_steps = np.round(np.arange(0.0, max(float(user_span), SIM_STEP_M) + 1e-9, SIM_STEP_M), 2)
+    sim = beam_engine.ltb_capacity(Fy, Zx, Sx, ry, J, h0, r_ts, lb_steps * 100, E, Cb)
+    mn_steps = sim['Mn'] / 100
+    active = int(np.abs(lb_steps - Lb_real).argmin())
+
+    fig = go.Figure()
+    fig.add_trace(plot_utils.line(x_vals, curve['Mn'] / 100, keep_x=(Lp_m, Lr_m), webgl=dense, mode='lines', name='Mn Curve', line=dict(color='#334155', width=3)))
+    fig.add_trace(go.Scatter(x=[lb_steps[active]], y=[mn_steps[active]], mode='markers', name='Sim Point',
+                             marker=dict(size=14, color=SIM_ZONES[sim['zone'][active]][1], symbol='diamond', line=dict(width=2, color='white'))))
+    fig.add_vline(x=Lb_real, line_dash="dot", line_color="gray", annotation_text="Actual")
+
+    # Add background zones
+    fig.add_vrect(x0=0, x1=Lp_m, fillcolor="green", opacity=0.1, layer="below")
+    fig.add_vrect(x0=Lp_m, x1=Lr_m, fillcolor="orange", opacity=0.1, layer="below")
+    fig.add_vrect(x0=Lr_m, x1=max_len, fillcolor="red", opacity=0.1, layer="below")
+
+    # annotation ของ vline ("Actual") ต้องคงอยู่ทุก step
+    fixed = [a.to_plotly_json() for a in fig.layout.annotations]
+    steps = []
+    for lb, mn, zone in zip(lb_steps, mn_steps, sim['zone']):
+        steps.append(dict(
+            method="update", label=f"{lb:.1f}",
+            args=[{"x": [[lb]], "y": [[mn]], "marker.color": [SIM_ZONES[zone][1]]},
+                  {"annotations": fixed + _sim_annotations(lb, mn, zone, is_lrfd)},
+                  [1]],
+        ))
+    fig.update_layout(
+        annotations=fixed + _sim_annotations(lb_steps[active], mn_steps[active], sim['zone'][active], is_lrfd),
+        sliders=[dict(active=active, steps=steps, pad=dict(t=45), len=1.0,
+                      currentvalue=dict(prefix="Simulate Lb (m): ", font=dict(size=13, color="#1e293b")),
+                      font=dict(color="rgba(0,0,0,0)"), ticklen=3,  # ซ่อน label ราย step (มีได้หลายร้อย)
+                      transition=dict(duration=0))],
+        margin=dict(l=20, r=20, t=10, b=20), height=420,
+        xaxis_title="Lb (m)", yaxis_title="Mn (kg-m)", showlegend=False,
+    )
+    return fig
+
+@st.fragment
+def render_ltb_panel(Lb_real, Lp_cm, Lr_cm, Mp, Fy, Sx, E, Cb, r_ts, val_A, user_span, is_lrfd, ry, J, h0):
+    """
+    Fragment: simulator ทำงานฝั่ง browser; เปิด/ปิด expander อ้างอิง rerun เฉพาะ panel นี้
+    """
     # Unit Conversion
     Lp_m = Lp_cm / 100
     Lr_m = Lr_cm / 100
@@ -37,118 +114,63 @@ def render(data):
     st.markdown("")
 
     # --- PART 2: SIMULATION & GRAPH ---
-    col_sim, col_graph = st.columns([1, 2])
-    
-    with col_sim:
-        st.markdown("#### 🎮 Simulator")
-        st.caption("Adjust unbraced length ($L_b$) to observe changes in capacity.")
-        
-        lb_sim = st.slider("Simulate Lb (m)", 
-                           min_value=0.5, 
-                           max_value=float(user_span), 
-                           value=float(Lb_real),
-                           step=0.1)
-        
-        # Calculate State
-        lb_sim_cm = lb_sim * 100
-        if lb_sim_cm <= Lp_cm:
-            mn_sim = Mp
-            zone_sim = "Zone 1: Plastic"
-            zone_color = "#10b981"
-        elif lb_sim_cm <= Lr_cm:
-            term = (Mp - 0.7 * Fy * Sx) * ((lb_sim_cm - Lp_cm) / (Lr_cm - Lp_cm))
-            mn_sim = min(Cb * (Mp - term), Mp)
-            zone_sim = "Zone 2: Inelastic"
-            zone_color = "#f59e0b"
-        else:
-            slend = (lb_sim_cm / r_ts)
-            fcr = (Cb * math.pi**2 * E) / (slend**2) * math.sqrt(1 + 0.078 * val_A * slend**2)
-            mn_sim = min(fcr * Sx, Mp)
-            zone_sim = "Zone 3: Elastic"
-            zone_color = "#ef4444"
-            
-        mn_sim_kgm = mn_sim / 100
-        
-        st.markdown(f"""
-        <div style="text-align:center; padding:15px; background:{zone_color}15; border-radius:10px; border:2px solid {zone_color}; margin-top:10px;">
-            <div style="font-size:14px; color:{zone_color}; font-weight:bold;">{zone_sim}</div>
-            <div style="font-size:32px; font-weight:800; color:#1e293b;">{mn_sim_kgm:,.0f}</div>
-            <div style="font-size:14px; color:#64748b;">kg-m (Nominal)</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col_graph:
-        # Plot Logic
-        max_len = max(Lr_m * 1.5, user_span)
-        x_vals = np.linspace(0.1, max_len, 100)
-        y_vals = []
-        for l in x_vals:
-            l_cm = l * 100
-            if l_cm <= Lp_cm: m = Mp
-            elif l_cm <= Lr_cm:
-                term = (Mp - 0.7 * Fy * Sx) * ((l_cm - Lp_cm) / (Lr_cm - Lp_cm))
-                m = min(Cb * (Mp - term), Mp)
-            else:
-                slend = (l_cm / r_ts)
-                fcr = (Cb * math.pi**2 * E) / (slend**2) * math.sqrt(1 + 0.078 * val_A * slend**2)
-                m = min(fcr * Sx, Mp)
-            y_vals.append(m/100)
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=x_vals, y=y_vals, mode='lines', name='Mn Curve', line=dict(color='#334155', width=3)))
-        fig.add_trace(go.Scatter(x=[lb_sim], y=[mn_sim_kgm], mode='markers', name='Sim Point', marker=dict(size=14, color=zone_color, symbol='diamond', line=dict(width=2, color='white'))))
-        if abs(lb_sim - Lb_real) > 0.1:
-             fig.add_vline(x=Lb_real, line_dash="dot", line_color="gray", annotation_text="Actual")
-        
-        # Add background zones
-        fig.add_vrect(x0=0, x1=Lp_m, fillcolor="green", opacity=0.1, layer="below")
-        fig.add_vrect(x0=Lp_m, x1=Lr_m, fillcolor="orange", opacity=0.1, layer="below")
-        fig.add_vrect(x0=Lr_m, x1=max_len, fillcolor="red", opacity=0.1, layer="below")
-        
-        fig.update_layout(margin=dict(l=20, r=20, t=10, b=20), height=300, xaxis_title="Lb (m)", yaxis_title="Mn (kg-m)", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+    st.markdown("#### 🎮 Simulator")
+    st.caption("Drag the slider under the graph to change the unbraced length ($L_b$); the marker, zone and capacity update instantly.")
+    fig = build_simulator_figure(Lb_real, Lp_cm, Lr_cm, Fy, Sx, Mp / Fy, E, Cb, r_ts, val_A, ry, J, h0, user_span, is_lrfd,
+                                 dense=plot_utils.high_density())
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Live calculation แสดงที่ Lb ของการออกแบบจริง
+    lb_sim = float(Lb_real)
+    lb_sim_cm = lb_sim * 100
+    state = beam_engine.ltb_capacity(Fy, Mp / Fy, Sx, ry, J, h0, r_ts, lb_sim_cm, E, Cb)
+    mn_sim_kgm = float(state['Mn']) / 100
+    zone_sim = SIM_ZONES[int(state['zone'])][0]
 
     # --- PART 3: DEFINITIONS ---
     st.divider()
     
-    with st.expander("📘 Reference: Derivation of Lp and Lr", expanded=False):
-        c_def1, c_def2 = st.columns(2)
+    # ปิดอยู่เป็นค่าเริ่มต้น: render เนื้อหา (latex) เฉพาะเมื่อผู้ใช้เปิด
+    ref_exp = st.expander("📘 Reference: Derivation of Lp and Lr", expanded=False, key="ltb_reference", on_change="rerun")
+    with ref_exp:
+        if ref_exp.open:
+            c_def1, c_def2 = st.columns(2)
         
-        # --- Lp Derivation ---
-        with c_def1:
-            st.markdown("#### 1. Limit $L_p$ (Plastic Limit)")
-            st.caption("End of Zone 1: Beam can reach full plastic moment without buckling.")
+            # --- Lp Derivation ---
+            with c_def1:
+                st.markdown("#### 1. Limit $L_p$ (Plastic Limit)")
+                st.caption("End of Zone 1: Beam can reach full plastic moment without buckling.")
             
-            st.latex(r"L_p = 1.76 r_y \sqrt{\frac{E}{F_y}}")
+                st.latex(r"L_p = 1.76 r_y \sqrt{\frac{E}{F_y}}")
             
-            st.markdown("**Substituting values:**")
-            st.markdown(f"""
-            - $r_y = {ry:.2f}$ cm
-            - $E = {E:,.0f}$ ksc
-            - $F_y = {Fy:,.0f}$ ksc
-            """)
-            st.info(f"👉 **Calculated:** {Lp_cm:.2f} cm ({Lp_m:.2f} m)")
+                st.markdown("**Substituting values:**")
+                st.markdown(f"""
+                - $r_y = {ry:.2f}$ cm
+                - $E = {E:,.0f}$ ksc
+                - $F_y = {Fy:,.0f}$ ksc
+                """)
+                st.info(f"👉 **Calculated:** {Lp_cm:.2f} cm ({Lp_m:.2f} m)")
 
-        # --- Lr Derivation ---
-        with c_def2:
-            st.markdown("#### 2. Limit $L_r$ (Elastic Limit)")
-            st.caption("End of Zone 2: Beam transitions into elastic buckling behavior.")
+            # --- Lr Derivation ---
+            with c_def2:
+                st.markdown("#### 2. Limit $L_r$ (Elastic Limit)")
+                st.caption("End of Zone 2: Beam transitions into elastic buckling behavior.")
             
-            st.latex(r"L_r = 1.95 r_{ts} \frac{E}{0.7F_y} \sqrt{\frac{J c}{S_x h_0} + \sqrt{\left(\frac{J c}{S_x h_0}\right)^2 + 6.76\left(\frac{0.7F_y}{E}\right)^2}}")
+                st.latex(r"L_r = 1.95 r_{ts} \frac{E}{0.7F_y} \sqrt{\frac{J c}{S_x h_0} + \sqrt{\left(\frac{J c}{S_x h_0}\right)^2 + 6.76\left(\frac{0.7F_y}{E}\right)^2}}")
             
-            st.markdown("**Key Parameters:**")
-            col_p1, col_p2 = st.columns(2)
-            with col_p1:
-                st.write(f"- $r_{{ts}} = {r_ts:.2f}$ cm")
-                st.write(f"- $J = {J:.2f}$ cm⁴")
-            with col_p2:
-                st.write(f"- $S_x = {Sx:,.0f}$ cm³")
-                st.write(f"- $h_0 = {h0:.1f}$ cm")
+                st.markdown("**Key Parameters:**")
+                col_p1, col_p2 = st.columns(2)
+                with col_p1:
+                    st.write(f"- $r_{{ts}} = {r_ts:.2f}$ cm")
+                    st.write(f"- $J = {J:.2f}$ cm⁴")
+                with col_p2:
+                    st.write(f"- $S_x = {Sx:,.0f}$ cm³")
+                    st.write(f"- $h_0 = {h0:.1f}$ cm")
             
-            st.info(f"👉 **Calculated:** {Lr_cm:.2f} cm ({Lr_m:.2f} m)")
+                st.info(f"👉 **Calculated:** {Lr_cm:.2f} cm ({Lr_m:.2f} m)")
 
     # --- PART 4: LIVE CALCULATION ---
-    st.subheader(f"🧮 Live Calculation: {zone_sim}")
+    st.subheader(f"🧮 Live Calculation (Design Lb): {zone_sim}")
     with st.expander("Mn Calculation Steps", expanded=True):
         
         st.markdown(f"**Current State:** $L_b = {lb_sim:.2f}$ m")
@@ -1,18 +1,25 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import steel_db
+import section_search
 import baseplate_drawer  # Import ไฟล์วาดรูปที่เราสร้างขึ้น
 
 def render(res_ctx, v_design):
+    default_col = res_ctx['sec_name'] if res_ctx['sec_name'] in steel_db.SYS_H_BEAMS else "H-400x200x8x13"
+    render_drawing_panel(default_col)
+
+@st.fragment
+def render_drawing_panel(default_col):
+    """
+    Fragment: แก้ input ของแบบแล้ว rerun เฉพาะ panel นี้ (ไม่ส่ง sidebar / หน้าอื่นซ้ำ)
+    หมายเหตุ: components.html ยังส่ง SVG ทั้งไฟล์ทุกครั้งที่ panel rerun (iframe srcdoc ไม่มี diff ฝั่ง browser)
+    """
     # --- 1. CONFIGURATION & INPUTS ---
     with st.container(border=True):
         st.markdown("##### 📐 Ultimate Shop Drawing Control")
         c_m1, c_m2, c_m3 = st.columns([1, 1, 1])
         with c_m1:
-            sec_list = steel_db.get_section_list()
-            col_name = st.selectbox("Column Size", sec_list, index=sec_list.index(res_ctx['sec_name']) if res_ctx['sec_name'] in sec_list else 13)
-            p = steel_db.get_properties(col_name)
-            ch, cb, ctw, ctf = float(p['h']), float(p['b']), float(p['tw']), float(p['tf'])
+            col_name = section_search.section_picker("Column Size", default=default_col, key="bp_column")
         with c_m2:
             clr_x = st.number_input("Clearance X (mm)", value=50.0)
             clr_y = st.number_input("Clearance Y (mm)", value=60.0)
@@ -22,19 +29,9 @@ def render(res_ctx, v_design):
             edge_y = st.number_input("Edge Y (mm)", value=50.0)
             bolt_d = st.selectbox("Bolt Dia.", [20, 24, 30], index=0)
 
-    # --- 2. GEOMETRY CALC ---
-    sx, sy = cb + (2 * clr_x), ch - (2 * ctf) + (2 * clr_y)
-    B, N = sx + (2 * edge_x), sy + (2 * edge_y)
-    grout_h = 50.0
-    
-    # --- 3. PREPARE PARAMETERS & DRAW ---
-    # รวบรวมข้อมูลทั้งหมดใส่ Dictionary เพื่อส่งให้ Drawer
-    drawing_params = {
-        'B': B, 'N': N, 'cb': cb, 'ch': ch, 'ctw': ctw, 'ctf': ctf,
-        'sx': sx, 'sy': sy, 'tp': tp, 'grout_h': grout_h,
-        'edge_x': edge_x, 'edge_y': edge_y, 'clr_x': clr_x, 'clr_y': clr_y,
-        'col_name': col_name, 'bolt_d': bolt_d
-    }
+    # --- 2. GEOMETRY CALC & PARAMETERS ---
+    # ขนาด plate / ระยะ bolt คำนวณใน baseplate_drawer (ใช้ร่วมกับ batch_export)
+    drawing_params = baseplate_drawer.drawing_params(col_name, clr_x, clr_y, tp, edge_x, edge_y, bolt_d)
     
     # เรียกฟังก์ชันจากไฟล์ baseplate_drawer
     svg_code = baseplate_drawer.get_svg_drawing(drawing_params)
@@ -0,0 +1,116 @@
+# tab_compare.py
+# เปรียบเทียบหลายหน้าตัดเคียงข้างกัน ภายใต้ span / Lb / โหลด / method ปัจจุบันใน sidebar
+# - เลือกหน้าตัดเอง หรือกรองตามช่วงคุณสมบัติ (ความลึก / น้ำหนัก / Ix)
+# - ทุกหน้าตัดประเมินใน beam_engine.evaluate ครั้งเดียว (props เป็น array): 50 หน้าตัด ≈ เวลา 1 หน้าตัด
+# - ผลลัพธ์ cache ใน shared_cache แล้วแสดงด้วยตารางแบ่งหน้า (table_view)
+import streamlit as st
+import numpy as np
+import beam_engine
+import design_atlas
+import shared_cache
+import table_view
+
+# ช่วงคุณสมบัติที่กรองได้: label -> key ใน catalog_arrays()
+RANGE_FILTERS = {"Depth h (mm)": "h", "Weight (kg/m)": "weight", "Ix (cm⁴)": "Ix"}
+
+# ==========================================
+# 🧮 1. BATCH EVALUATION
+# ==========================================
+@shared_cache.memoize("tab_compare.compare_sections")
+def compare_sections(names, Fy, span_m, Lb_m, is_lrfd, defl_denom, w_load, p_load, check_mode, E=beam_engine.E_STEEL):
+    """
+    หน้าตัด (ชื่อใน catalog) -> DataFrame ผลเทียบ 1 แถวต่อหน้าตัด
+    เรียก beam_engine.evaluate ครั้งเดียวด้วย props ของทุกหน้าตัดเป็น array
+    """
+    import pandas as pd  # lazy
+
+    all_names, cat = beam_engine.catalog_arrays()
+    idx = np.array([all_names.index(n) for n in names], dtype=int)
+    props = {k: v[idx] for k, v in cat.items()}
+    res = beam_engine.evaluate(props, Fy, span_m, Lb_m, is_lrfd, defl_denom, w_load, p_load, check_mode, E)
+    col = lambda k: np.broadcast_to(res[k], idx.shape)
+
+    causes = np.array(beam_engine.CHECK_CAUSES if check_mode else beam_engine.CAPACITY_CAUSES)
+    df = pd.DataFrame({
+        'Section': list(names),
+        'Weight (kg/m)': props['weight'],
+        'Ratio V': col('ratio_v'),
+        'Ratio M': col('ratio_m'),
+        'Ratio Δ': col('ratio_d'),
+        'Gov Ratio': col('gov_ratio'),
+        'Governing': causes[col('gov')],
+        'LTB Zone': np.array(beam_engine.LTB_ZONES)[col('zone')],
+        'Δ (cm)': col('d_act'),
+        'Δ allow (cm)': col('d_allow'),
+    })
+    if check_mode:
+        df['Status'] = np.where(df['Gov Ratio'] <= 1.0, "✅ PASS", "❌ FAIL")
+    else:
+        # Safe load แบบ service (เหมือนกราฟ Safe Load vs Span)
+        w_safe = col('w_safe')
+        df.insert(2, 'Safe Load (kg/m)', w_safe / beam_engine.LRFD_DEFL_FACTOR if is_lrfd else w_safe)
+        df = df.drop(columns=['Gov Ratio'])
+    return df
+
+def range_filter(ranges):
+    """ranges = {key: (lo, hi)} -> ชื่อหน้าตัดใน catalog ที่อยู่ในทุกช่วง"""
+    names, cat = beam_engine.catalog_arrays()
+    mask = np.ones(len(names), dtype=bool)
+    for k, (lo, hi) in ranges.items():
+        mask &= (cat[k] >= lo) & (cat[k] <= hi)
+    return [n for n, m in zip(names, mask) if m]
+
+# ==========================================
+# 🖥️ 2. UI
+# ==========================================
+def _pick_sections(data):
+    names, cat = beam_engine.catalog_arrays()
+    source = st.radio("Sections", ["✋ Pick list", "📐 Property range"], horizontal=True, key="cmp_source")
+    if "Pick" in source:
+        return st.multiselect("Sections to compare", names, default=design_atlas.default_sections(data['sec_name']),
+                              key="cmp_sections")
+
+    ranges = {}
+    cols = st.columns(len(RANGE_FILTERS))
+    for c, (label, k) in zip(cols, RANGE_FILTERS.items()):
+        lo, hi = float(cat[k].min()), float(cat[k].max())
+        ranges[k] = c.slider(label, lo, hi, (lo, hi), key=f"cmp_range_{k}")
+    return range_filter(ranges)
+
+def render(data):
+    """Compare page: หน้าตัดหลายตัวภายใต้ input เดียวกับ sidebar"""
+    st.markdown("### ⚖️ Section Comparison")
+    is_check_mode = data['is_check_mode']
+    st.caption(f"Span {data['user_span']:.2f} m · Lb {data['Lb']:.2f} m · Fy {data['Fy']:,.0f} ksc · "
+               f"{data['method_str']} · L/{data['defl_denom']}"
+               + (f" · w {data['w_load']:,.0f} kg/m · P {data['p_load']:,.0f} kg" if is_check_mode else " · Find Capacity"))
+
+    names = _pick_sections(data)
+    if not names:
+        st.info("Select at least one section (or widen the property ranges).")
+        return
+
+    df = compare_sections(tuple(names), data['Fy'], data['user_span'], data['Lb'], data['is_lrfd'],
+                          data['defl_denom'], data['w_load'], data['p_load'], is_check_mode, data['E'])
+
+    if is_check_mode:
+        passing = df[df['Status'] == "✅ PASS"]
+        c1, c2 = st.columns(2)
+        c1.metric("Sections passing", f"{len(passing)} / {len(df)}")
+        if len(passing):
+            best = passing.loc[passing['Weight (kg/m)'].idxmin()]
+            c2.metric("Lightest passing", best['Section'], f"{best['Weight (kg/m)']:.1f} kg/m · ratio {best['Gov Ratio']:.2f}",
+                      delta_color="off")
+
+    ratio_col = lambda label: st.column_config.ProgressColumn(label, format="%.2f", min_value=0, max_value=1.5)
+    table_view.render_paged_table(
+        df, key="cmp_table",
+        column_config={
+            'Weight (kg/m)': st.column_config.NumberColumn(format="%.1f"),
+            'Safe Load (kg/m)': st.column_config.NumberColumn(format="%.0f"),
+            'Ratio V': ratio_col("V/φVn"), 'Ratio M': ratio_col("M/φMn"), 'Ratio Δ': ratio_col("Δ/Δallow"),
+            'Gov Ratio': ratio_col("Gov Ratio"),
+            'Δ (cm)': st.column_config.NumberColumn(format="%.2f"),
+            'Δ allow (cm)': st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
@@ -1,7 +1,9 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 import numpy as np
-import pandas as pd
+import design_atlas
+import figure_cache
+import plot_utils
 
 def render(data):
     st.title("📄 รายการคำนวณและตรวจสอบ (Analysis Verification)")
@@ -93,7 +95,7 @@ def render(data):
     tab_chart, tab_verify = st.tabs(["📉 กราฟ Deflection vs Span", "hk ตารางพิสูจน์ค่า (Verification)"])
     
     # --- CALCULATE GRAPH DATA ---
-    x_vals = np.linspace(0.5, 12.0, 100) # ระยะจาก 0.5 ถึง 12 เมตร
+    x_vals = np.linspace(0.5, 12.0, plot_utils.samples()) # ระยะจาก 0.5 ถึง 12 เมตร
     
     # 1. Allowable Line (L/denom)
     y_allow = (x_vals * 100) / defl_denom # cm
@@ -103,41 +105,30 @@ def render(data):
     w_fixed_kgcm = w_plot_defl / 100.0
     y_actual = (5 * w_fixed_kgcm * ((x_vals*100)**4)) / (384 * E_ksc * Ix) # cm
 
+    # 3. User Point (จุดสีแดงบนกราฟ)
+    curr_L_cm = L_m * 100
+    curr_act = (5 * w_fixed_kgcm * (curr_L_cm**4)) / (384 * E_ksc * Ix)
+    curr_all = curr_L_cm / defl_denom
+
     # --- TAB 1: CHART ---
     with tab_chart:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Plot Lines
-        ax.plot(x_vals, y_allow, '--', color='green', label=f'Allowable Limit (L/{defl_denom:.0f})')
-        ax.plot(x_vals, y_actual, '-', color='blue', linewidth=2, label=f'Actual Deflection (Load {w_plot_defl:.0f} kg/m)')
-        
-        # Fail Zone
-        ax.fill_between(x_vals, y_allow, y_actual, where=(y_actual > y_allow), color='red', alpha=0.2)
-        
-        # User Point
-        curr_L_cm = L_m * 100
-        curr_act = (5 * w_fixed_kgcm * (curr_L_cm**4)) / (384 * E_ksc * Ix)
-        curr_all = curr_L_cm / defl_denom
-        
-        ax.scatter([L_m], [curr_act], color='red', s=100, zorder=5)
-        ax.annotate(f"  Act: {curr_act:.2f} cm\n  Limit: {curr_all:.2f} cm", 
-                    (L_m, curr_act), color='red', fontweight='bold')
-        
-        # Settings
-        ax.set_title(f"Deflection vs Span Length (Load = {w_plot_defl:.0f} kg/m)")
-        ax.set_xlabel("Span (m)")
-        ax.set_ylabel("Deflection (cm)")
-        ax.grid(True, linestyle='--', alpha=0.5)
-        ax.legend()
-        
-        # Limit Y Axis (ป้องกันกราฟพุ่งเกินไป)
-        max_y = max(curr_all * 2.0, curr_act * 1.5)
-        ax.set_ylim(0, max_y)
-        ax.set_xlim(0, 12)
-        
-        st.pyplot(fig)
+        if plot_utils.high_density():
+            # WebGL (plotly) แทน PNG: เส้น sample ถี่แล้ว decimate, จุดตัด Allowable/Actual ถูกเก็บไว้
+            st.plotly_chart(deflection_figure(x_vals, y_allow, y_actual, L_m, curr_act, curr_all, defl_denom, w_plot_defl),
+                            use_container_width=True)
+        else:
+            # PNG cache ตาม input ของกราฟ (rerun ที่ค่าเดิมไม่ต้องวาดใหม่)
+            figure_cache.show(
+                lambda fig: draw_deflection_chart(fig, x_vals, y_allow, y_actual, L_m, curr_act, curr_all, defl_denom, w_plot_defl),
+                ("deflection_chart", L_m, E_ksc, Ix, defl_denom, w_plot_defl), figsize=(10, 6))
         st.caption("เส้นสีน้ำเงินคือพฤติกรรมจริงของคาน ถ้ารับน้ำหนักเท่าเดิมแต่เพิ่มความยาว")
 
+        # Atlas: ทุกหน้าตัดที่โหลดเดียวกัน (Δ ต่อ 1 kg/m คำนวณครั้งเดียวต่อ process)
+        atlas_exp = st.expander("🗺️ Catalog Atlas: Deflection vs Span (all sections)", expanded=False, key="summary_atlas", on_change="rerun")
+        with atlas_exp:
+            if atlas_exp.open:
+                design_atlas.render_deflection(data, w_plot_defl)
+
     # --- TAB 2: VERIFICATION (พิสูจน์ตัวเลข) ---
     with tab_verify:
         st.markdown("### 🕵️‍♀️ ตรวจสอบความถูกต้องของตัวเลข")
@@ -180,3 +171,58 @@ def render(data):
             st.success(f"✅ กราฟถูกต้อง: จุดสีแดงบนกราฟตรงกับผลคำนวณ ({result:.4f} cm)")
         else:
             st.error("❌ พบความผิดปกติของข้อมูล")
+
+
+def draw_deflection_chart(fig, x_vals, y_allow, y_actual, L_m, curr_act, curr_all, defl_denom, w_plot_defl):
+    """กราฟ Deflection vs Span ลงบน Figure ที่ส่งเข้ามา"""
+    ax = fig.subplots()
+    
+    # Plot Lines
+    ax.plot(x_vals, y_allow, '--', color='green', label=f'Allowable Limit (L/{defl_denom:.0f})')
+    ax.plot(x_vals, y_actual, '-', color='blue', linewidth=2, label=f'Actual Deflection (Load {w_plot_defl:.0f} kg/m)')
+    
+    # Fail Zone
+    ax.fill_between(x_vals, y_allow, y_actual, where=(y_actual > y_allow), color='red', alpha=0.2)
+    
+    # User Point
+    ax.scatter([L_m], [curr_act], color='red', s=100, zorder=5)
+    ax.annotate(f"  Act: {curr_act:.2f} cm\n  Limit: {curr_all:.2f} cm", 
+                (L_m, curr_act), color='red', fontweight='bold')
+    
+    # Settings
+    ax.set_title(f"Deflection vs Span Length (Load = {w_plot_defl:.0f} kg/m)")
+    ax.set_xlabel("Span (m)")
+    ax.set_ylabel("Deflection (cm)")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    
+    # Limit Y Axis (ป้องกันกราฟพุ่งเกินไป)
+    max_y = max(curr_all * 2.0, curr_act * 1.5)
+    ax.set_ylim(0, max_y)
+    ax.set_xlim(0, 12)
+
+
+def deflection_figure(x_vals, y_allow, y_actual, L_m, curr_act, curr_all, defl_denom, w_plot_defl):
+    """กราฟ Deflection vs Span แบบ WebGL (โหมด high-density) หน้าตาเดียวกับ draw_deflection_chart"""
+    # span ที่ Actual = Allowable (ขอบ Fail Zone) -> ต้องไม่หายตอน decimate
+    cross = x_vals[1:][np.diff(np.sign(y_actual - y_allow)) != 0]
+
+    fig = go.Figure()
+    fig.add_trace(plot_utils.line(x_vals, y_allow, keep_x=cross, name=f'Allowable Limit (L/{defl_denom:.0f})',
+                                  line=dict(color='green', dash='dash')))
+    # Fail Zone: เติมสีระหว่าง Allowable กับ max(Actual, Allowable)
+    fig.add_trace(plot_utils.line(x_vals, np.maximum(y_actual, y_allow), keep_x=cross, fill='tonexty',
+                                  fillcolor='rgba(255,0,0,0.2)', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(plot_utils.line(x_vals, y_actual, keep_x=cross, name=f'Actual Deflection (Load {w_plot_defl:.0f} kg/m)',
+                                  line=dict(color='blue', width=2)))
+
+    # User Point
+    fig.add_trace(go.Scatter(x=[L_m], y=[curr_act], mode='markers+text', showlegend=False,
+                             marker=dict(color='red', size=12), textposition='middle right',
+                             text=[f"Act: {curr_act:.2f} cm<br>Limit: {curr_all:.2f} cm"], textfont=dict(color='red')))
+
+    max_y = max(curr_all * 2.0, curr_act * 1.5)
+    fig.update_layout(title=f"Deflection vs Span Length (Load = {w_plot_defl:.0f} kg/m)", height=500,
+                      xaxis=dict(title="Span (m)", range=[0, 12]), yaxis=dict(title="Deflection (cm)", range=[0, max_y]),
+                      legend=dict(x=0.01, y=0.99))
+    return fig
@@ -0,0 +1,86 @@
+# table_view.py
+# ตารางแบบแบ่งหน้า (server-side paging / sorting / filtering)
+# ข้อมูลทั้งหมดอยู่ฝั่ง server ส่งไปยัง browser เฉพาะหน้าที่แสดงอยู่
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def _filter_mask(df, text):
+    """กรองแถวที่มีข้อความ (ไม่สนตัวพิมพ์) ในคอลัมน์ข้อความใดๆ"""
+    text = text.strip().lower()
+    if not text:
+        return np.ones(len(df), dtype=bool)
+    hit = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind in "OUS":
+            hit |= np.char.find(np.char.lower(values.astype(str)), text) >= 0
+    return hit
+
+
+def ordered_index(df, sort_col=None, ascending=True, filter_text=""):
+    """
+    ตำแหน่งแถวหลัง filter + sort (numpy บนข้อมูลแบบ columnar, ไม่ copy ทั้งตาราง)
+    แถวที่เป็น NaN อยู่ท้ายเสมอ ทั้ง ▲ และ ▼ (เหมือน na_position="last" ของ pandas)
+    """
+    idx = np.flatnonzero(_filter_mask(df, filter_text))
+    if sort_col is not None and sort_col in df.columns and len(idx):
+        values = df[sort_col].to_numpy()[idx]
+        if values.dtype.kind in "OUS":
+            values, nan = values.astype(str), np.zeros(len(idx), dtype=bool)
+        else:
+            values = values.astype(float)
+            nan = np.isnan(values)
+        valid = np.flatnonzero(~nan)
+        order = valid[np.argsort(values[valid], kind="stable")]
+        idx = np.concatenate([idx[order if ascending else order[::-1]], idx[nan]])
+    return idx
+
+
+def _set_page(key, page):
+    st.session_state[f"{key}_page"] = page
+
+
+def render_paged_table(df, key, column_config=None, page_size=25, height="auto"):
+    """
+    แสดงตารางขนาดใหญ่แบบแบ่งหน้า (เหมาะกับผลลัพธ์ระดับ catalog)
+    คืนค่า DataFrame ของหน้าที่แสดงอยู่ (ใช้ต่อ เช่น ให้ผู้ใช้เลือกแถว)
+    """
+    c_f, c_s, c_o, c_n = st.columns([2, 1.5, 1, 1])
+    with c_f:
+        filter_text = st.text_input("🔎 Filter", key=f"{key}_filter", placeholder="Type to filter rows")
+    with c_s:
+        sort_col = st.selectbox("Sort by", ["(none)"] + list(df.columns), key=f"{key}_sort")
+    with c_o:
+        ascending = st.radio("Order", ["▲", "▼"], horizontal=True, key=f"{key}_order") == "▲"
+    with c_n:
+        page_size = st.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1, key=f"{key}_size")
+
+    # รีเซ็ตหน้าเมื่อเงื่อนไข filter/sort เปลี่ยน
+    view_sig = (filter_text, sort_col, ascending, page_size, len(df))
+    if st.session_state.get(f"{key}_sig") != view_sig:
+        st.session_state[f"{key}_sig"] = view_sig
+        st.session_state[f"{key}_page"] = 1
+
+    idx = ordered_index(df, None if sort_col == "(none)" else sort_col, ascending, filter_text)
+    n_rows = len(idx)
+    n_pages = max(1, -(-n_rows // page_size))
+    page = min(max(1, st.session_state.get(f"{key}_page", 1)), n_pages)
+    start = (page - 1) * page_size
+    page_df = df.iloc[idx[start:start + page_size]]
+
+    st.dataframe(page_df, use_container_width=True, column_config=column_config, hide_index=True, height=height)
+
+    c_prev, c_info, c_next = st.columns([1, 3, 1])
+    with c_prev:
+        st.button("◀ Prev", key=f"{key}_prev", disabled=page <= 1, use_container_width=True,
+                  on_click=_set_page, args=(key, page - 1))
+    with c_info:
+        first = start + 1 if n_rows else 0
+        st.caption(f"Rows {first:,}–{min(page * page_size, n_rows):,} of {n_rows:,} (page {page}/{n_pages})")
+    with c_next:
+        st.button("Next ▶", key=f"{key}_next", disabled=page >= n_pages, use_container_width=True,
+                  on_click=_set_page, args=(key, page + 1))
+    return page_df
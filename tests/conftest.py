@@ -0,0 +1,6 @@
+# tests/conftest.py
+# โมดูลของแอปอยู่ที่ root ของ repo (flat layout) -> ให้ import ได้จาก tests/
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,63 @@
+# tests/test_batch_export.py
+import json
+
+import pytest
+
+import batch_export
+
+CONN = "mark,kind,section,type,d,rows,cols,t,s_v,s_h,lv,leh,e1,setback,weld_size\n"
+BASE = "mark,kind,column,clr_x,clr_y,tp,edge_x,edge_y,bolt_d\n"
+
+
+def _schedule(tmp_path, text, name="sched.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_iter_schedule_keeps_identifiers_as_text(tmp_path):
+    path = _schedule(tmp_path, CONN + "001,connection,H-400x200x8x13,Fin Plate,20,3,1,9.5,70,0,35,35,40,10,6\n")
+    (row,) = batch_export.iter_schedule(path)
+    assert row['mark'] == "001" and row['section'] == "H-400x200x8x13"
+    assert row['d'] == 20 and row['t'] == 9.5
+
+
+def test_iter_schedule_json_marks_are_text(tmp_path):
+    path = _schedule(tmp_path, json.dumps([{'mark': 1, 'kind': "baseplate", 'column': "H-300x150x6.5x9"}]), "s.json")
+    assert next(batch_export.iter_schedule(path))['mark'] == "1"
+
+
+@pytest.mark.parametrize("row, field", [
+    ({'mark': "C9", 'kind': "connection", 'section': "H-300x151"}, "section"),
+    ({'mark': "C9", 'kind': "connection"}, "section"),
+    ({'mark': "BP9", 'kind': "baseplate", 'column': "H-300x151"}, "column"),
+])
+def test_build_job_rejects_unknown_sections(row, field):
+    with pytest.raises(ValueError, match=f"{row['mark']}.*{field}"):
+        batch_export.build_job(row)
+
+
+def test_tile_sheets_fills_grid_then_starts_new_sheet():
+    svg = '<svg width="10" height="10" viewBox="0 0 10 10"></svg>'
+    sheets = batch_export.tile_sheets([(svg, f"M{i}") for i in range(5)], 10, 10, cols=2, rows=1)
+    assert [placed for _, placed in sheets] == [[(0, 0), (1, 1)], [(2, 0), (3, 1)], [(4, 0)]]
+
+
+def test_export_schedule_groups_identical_geometry(tmp_path):
+    rows = list(batch_export.iter_schedule(_schedule(tmp_path, BASE
+        + "BP1,baseplate,H-300x150x6.5x9,50,60,25,50,50,20\n"
+        + "BP2,baseplate,H-300x150x6.5x9,50,60,25,50,50,20\n"
+        + "001,baseplate,H-400x200x8x13,50,60,25,50,50,20\n"
+        + "1,baseplate,H-400x200x8x13,50,60,30,50,50,20\n")))
+    index = batch_export.export_schedule(rows, str(tmp_path / "out"), workers=1)
+
+    assert index['n_marks'] == 4 and index['n_drawings'] == 3
+    assert index['marks']["BP1"] == index['marks']["BP2"]
+    assert set(index['marks']) == {"BP1", "BP2", "001", "1"}
+    assert all((tmp_path / "out" / f).exists() for f in index['sheets'])
+
+
+def test_export_schedule_rejects_duplicate_marks(tmp_path):
+    row = {'mark': "BP1", 'kind': "baseplate", 'column': "H-300x150x6.5x9"}
+    with pytest.raises(ValueError, match="Duplicate mark 'BP1'"):
+        batch_export.export_schedule([row, dict(row)], str(tmp_path), workers=1)
@@ -0,0 +1,29 @@
+# tests/test_plot_utils.py
+import numpy as np
+
+import plot_utils
+
+X = np.linspace(0.0, 10.0, 4000)
+
+
+def test_decimate_keeps_short_nan_gap():
+    y = np.sin(7 * X)
+    y[1001] = np.nan
+    xd, yd = plot_utils.decimate(X, y)
+    assert np.isnan(yd).sum() == 1
+    gap = np.flatnonzero(np.isnan(yd))[0]
+    assert xd[gap - 1] == X[1000] and xd[gap + 1] == X[1002]
+
+
+def test_decimate_respects_max_points_with_many_keep_x():
+    y = np.sin(7 * X)
+    xd, _ = plot_utils.decimate(X, y, max_points=400, keep_x=np.linspace(0.1, 9.9, 50))
+    assert len(xd) <= 400
+
+
+def test_decimate_keeps_peaks_and_jump():
+    y = np.where(X > 5.0, -1.0, 1.0) * (10.0 - X)
+    xd, yd = plot_utils.decimate(X, y, keep_x=(5.0,))
+    assert yd.max() == y.max() and yd.min() == y.min()
+    j = np.searchsorted(X, 5.0)
+    assert X[j - 1] in xd and X[j] in xd
@@ -0,0 +1,36 @@
+# tests/test_report_export.py
+import csv
+
+import pytest
+
+import report_export
+
+GOOD = {'mark': "B1", 'kind': "beam", 'section': "H-400x200x8x13", 'span': 6, 'w_load': 1000, 'grade': "SS400"}
+
+
+@pytest.mark.parametrize("bad", [{'section': "H-300x151"}, {'grade': "SM490"}])
+def test_beam_inputs_rejects_unknown_names(bad):
+    with pytest.raises(ValueError, match="Unknown"):
+        report_export.beam_inputs({**GOOD, **bad})
+
+
+def test_beam_inputs_explicit_fy_skips_grade_lookup():
+    assert report_export.beam_inputs({**GOOD, 'grade': "SM490", 'Fy': 3300})['Fy'] == 3300
+
+
+def test_bad_row_is_recorded_as_error(tmp_path):
+    rows = [GOOD, {**GOOD, 'mark': "B2", 'section': "H-300x151"}]
+    report_export.export_reports(rows, str(tmp_path), fmt="html", workers=1)
+
+    with open(tmp_path / "index.csv", newline="") as f:
+        index = {r['mark']: r for r in csv.DictReader(f)}
+    assert index["B1"]['status'] == "PASS"
+    assert index["B2"]['status'] == "ERROR" and "H-300x151" in index["B2"]['error']
+    assert not (tmp_path / "beam_B2.html").exists()
+
+
+@pytest.mark.parametrize("marks, match", [(("B1", "B1"), "Duplicate mark"), (("B_1", "B/1"), "same report file")])
+def test_export_reports_rejects_colliding_marks(tmp_path, marks, match):
+    rows = [{**GOOD, 'mark': m} for m in marks]
+    with pytest.raises(ValueError, match=match):
+        report_export.export_reports(rows, str(tmp_path), fmt="html", workers=1)
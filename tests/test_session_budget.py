@@ -0,0 +1,54 @@
+# tests/test_session_budget.py
+import numpy as np
+import pytest
+
+import session_budget
+
+KB = 1024
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """สลับ session id ด้วย sessions.current; sessions.closed = session ที่ปิดไปแล้ว"""
+    class Sessions:
+        current, closed = "a", set()
+
+    monkeypatch.setattr(session_budget, "_STORE", {})
+    monkeypatch.setattr(session_budget, "_STATE_BYTES", {})
+    monkeypatch.setattr(session_budget, "_session_id", lambda: Sessions.current)
+    monkeypatch.setattr(session_budget, "_is_closed", lambda sid: sid in Sessions.closed)
+    monkeypatch.setattr(session_budget, "usage", lambda: [])
+    return Sessions
+
+
+def _put(sessions, sid, key, kb, idle=0.0):
+    sessions.current = sid
+    session_budget.put(key, np.zeros(kb * KB // 8))
+    session_budget._STORE[sid][key][2] -= idle
+
+
+def test_idle_session_is_swept_by_another_session(sessions):
+    _put(sessions, "idle", "opt_results", 40, idle=3600)
+    _put(sessions, "idle", "v_design", 1, idle=3600)
+    sessions.current = "active"
+    assert session_budget.enforce(budget=16 * KB) == []  # ไม่มี key ของ session นี้ถูกไล่
+    sessions.current = "idle"
+    assert session_budget.get('opt_results') is None
+    assert session_budget.get('v_design') is not None
+
+
+def test_closed_session_is_dropped(sessions):
+    _put(sessions, "gone", "opt_results", 1)
+    sessions.closed.add("gone")
+    sessions.current = "active"
+    session_budget.enforce()
+    assert "gone" not in session_budget._STORE
+
+
+def test_store_budget_evicts_across_sessions_lru(sessions):
+    _put(sessions, "a", "old", 8, idle=60)
+    _put(sessions, "b", "new", 8)
+    sessions.current = "a"
+    assert session_budget.enforce(budget=64 * KB, store_budget=12 * KB) == ["old"]
+    sessions.current = "b"
+    assert session_budget.get('new') is not None
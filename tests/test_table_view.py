@@ -0,0 +1,18 @@
+# tests/test_table_view.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import table_view
+
+DF = pd.DataFrame({'Section': ["H-200", "H-300", "H-150", "H-400"], 'Ratio': [0.8, np.nan, 0.3, 1.2]})
+
+
+@pytest.mark.parametrize("ascending, expected", [(True, [2, 0, 3, 1]), (False, [3, 0, 2, 1])])
+def test_ordered_index_puts_nan_last(ascending, expected):
+    assert table_view.ordered_index(DF, "Ratio", ascending).tolist() == expected
+
+
+def test_ordered_index_filters_then_sorts_text():
+    assert table_view.ordered_index(DF, "Section", False, filter_text="h-").tolist() == [3, 1, 0, 2]
+    assert table_view.ordered_index(DF, "Section", filter_text="300").tolist() == [1]